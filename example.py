@@ -7,30 +7,56 @@ Based on Gabagool V21.9 logic + Strike Momentum WS Architecture
 Strategy:
 - Calculates Dynamic Threshold based on recent volatility
 - Threshold = (Prev_15m_High - Prev_15m_Low) * K
+  (or Parkinson / EWMA / ATR estimators via VOLATILITY_MODEL)
 - Enters when |Price - Strike| > Dynamic_Threshold
 - Uses WebSockets for real-time execution (FOK orders)
 
 Parameters:
 - VOLATILITY_K: Sensitivity multiplier
 - MIN_DIFF_LIMIT: Safety floor for threshold
+- VOLATILITY_MODEL: range | parkinson | ewma | atr (default: range)
+- VOLATILITY_INTERVAL: Bar size fed to the estimator (default: 15m)
+- RECORD_DIR: If set, records Binance trades and Polymarket books there
+- JOURNAL_DIR: If set, journals the wallet there and restores it on restart
+- STARTUP_<STEP>_TIMEOUT: Deadline per cold start step (market, books, strike, candles)
+- SHADOW_GRID: If set, evaluates that grid of parameter variants alongside (see volbot.shadow)
 """
 
+from time import perf_counter
+IMPORT_STARTED = perf_counter()
+
 import os
 import sys
 import asyncio
 import json
 import logging
-import time
 import math
 import uuid
 from datetime import datetime
 from collections import defaultdict
 import websockets
-import aiohttp
 
-# Platform libraries (structure kept for potential real trading)
-from py_clob_client.clob_types import OrderType
-from py_clob_client.order_builder.constants import BUY, SELL
+from volbot.net import HttpClient
+from volbot.orderbook import OrderBook
+from volbot.candles import CandleAggregator, interval_seconds
+from volbot.volatility import make_estimator
+from volbot.reporter import TradeReporter
+from volbot.recorder import TickRecorder
+from volbot.journal import Journal, FILL, SETTLE, ADJUST
+from volbot.clock import clock_from_env
+from volbot.decode import get_decoder
+from volbot.metrics import BotMetrics, metrics_from_env
+from volbot.liveness import Backoff, FeedHealth, watchdog, retry_delay
+from volbot.eventlog import event_log_from_env, DumpOnError, PRICE, SIGNAL, ORDER, KILLED, FILL as EV_FILL
+
+# Order constants, same values as py_clob_client's. The client itself (kept for potential
+# real trading) pulls in the whole eth signing stack, so it is only imported where it is used.
+BUY, SELL = "BUY", "SELL"
+
+class OrderType:
+    GTC, FOK, GTD, FAK = "GTC", "FOK", "GTD", "FAK"
+
+IMPORT_SECONDS = perf_counter() - IMPORT_STARTED
 
 # Setup logging
 logging.basicConfig(
@@ -45,6 +71,11 @@ logger = logging.getLogger("VolatilityHunterSim")
 HOST = "https://clob.polymarket.com"
 POLY_WS_HOST = "wss://ws-subscriptions-clob.polymarket.com/ws"
 BINANCE_API = "https://api.binance.com/api/v3"
+BINANCE_WS_HOST = "wss://stream.binance.com:9443"
+GAMMA_API = "https://gamma-api.polymarket.com"
+PING_SECONDS = 5  # market channel heartbeat (PONGs keep a quiet book live)
+CANDLE_GAP_SECONDS = 5  # Trade stream silence treated as a gap in candle history
+STARTUP_DEADLINES = {"market": 10.0, "books": 3.0, "strike": 3.0, "candles": 5.0}  # seconds per cold start step
 
 def parse_iso_date(date_str):
     if not date_str: return None
@@ -54,15 +85,37 @@ def parse_iso_date(date_str):
 
 
 class VolatilityBot:
-    def __init__(self):
+    def __init__(self, clock=None, config=None, http=None, feeds=None, metrics=None, events=None):
+        """
+        config: optional {ENV_NAME: value} overrides, so several bots can share one process.
+        http / feeds: shared HttpClient and volbot.feeds.MarketFeeds when hosted by volbot.multi
+        (volbot.bus.BusFeeds in a volbot.shard worker). metrics / events: the process's shared
+        registry and event log there.
+        """
         self.running = True
+        self.feeds = feeds
         
-        # Load Config from Env
-        self.initial_market_url = os.getenv("INITIAL_MARKET_URL") or os.getenv("MARKET_SLUG")
+        # Load Config from Env (per-instance overrides first)
+        config = config or {}
+        def env(name):
+            val = config.get(name)
+            return str(val) if val is not None else os.getenv(name)
+        
+        self.clock = clock or clock_from_env(env)  # CLOCK_SPEED: accelerated time against volbot.exchange
+        
+        # Endpoints (overridable to point the bot at a local stand-in such as volbot.exchange)
+        self.clob_host = env("CLOB_HOST") or HOST
+        self.gamma_api = env("GAMMA_API") or GAMMA_API
+        self.binance_api = env("BINANCE_API") or BINANCE_API
+        self.binance_ws_host = env("BINANCE_WS_HOST") or BINANCE_WS_HOST
+        self.poly_ws_host = env("POLY_WS_HOST") or POLY_WS_HOST
+        
+        self.initial_market_url = env("INITIAL_MARKET_URL") or env("MARKET_SLUG")
+        self.decoder = get_decoder(env("DECODER"))
         
         # Simulation Config
-        self.simulation_id = os.getenv("SIMULATION_ID")
-        self.api_url = os.getenv("API_URL")
+        self.simulation_id = env("SIMULATION_ID")
+        self.api_url = env("API_URL")
         self.inventory = defaultdict(float)      # {asset_id: shares}
         self.inventory_cost = defaultdict(float) # {asset_id: total_cost_usdc}
         self.realized_pnl = 0.0
@@ -70,8 +123,57 @@ class VolatilityBot:
         
         # Identify Slug
         self.slug = self._extract_slug(self.initial_market_url)
-        self.ws = None
+        self.ws = None           # market channel socket (own connection)
+        self.market_subs = []    # asset ids subscribed on the market channel
         self.lock = asyncio.Lock()
+        self.owns_http = http is None
+        self.http = http or HttpClient()
+        
+        # Sim API reporting runs in the background, off the trading path
+        self.reporter = None
+        if self.api_url and self.simulation_id:
+            self.reporter = TradeReporter(
+                self.http,
+                f"{self.api_url}/simulations/{self.simulation_id}/trade",
+                spill_path=env("TRADE_SPILL_FILE") or f"sim_trades_{self.simulation_id}.spill.jsonl",
+                flush_interval=float(env("TRADE_FLUSH_INTERVAL") or "0.5"),
+                max_queue=int(env("TRADE_QUEUE_SIZE") or "1000"),
+            )
+        
+        # Opt-in latency instrumentation (shared registry when hosted by volbot.multi)
+        self.owns_metrics = metrics is None
+        self.metrics = metrics or metrics_from_env(env)
+        self.lat = BotMetrics(self.metrics) if self.metrics else None
+        self.tick_decoded_at = 0.0  # perf_counter() of the tick the next decision evaluates
+        self.decision_at = 0.0
+        
+        # Feed liveness: no decisions while a feed is stale (0 = off); a socket silent for twice as long is reconnected
+        self.binance_stale = float(env("BINANCE_STALE_SECONDS") or "5")
+        self.poly_stale = float(env("POLY_STALE_SECONDS") or "12")
+        self.check_feeds = bool(self.binance_stale or self.poly_stale)
+        self.binance_limit = self.binance_stale or float("inf")
+        self.poly_limit = self.poly_stale or float("inf")
+        self.binance_health = feeds.binance.health if feeds else FeedHealth("binance", self.metrics)
+        self.poly_health = feeds.poly.health if feeds else FeedHealth("polymarket", self.metrics)
+        self.stale_since = 0.0
+        self.stale_decisions = 0
+        self.stale_total = self.metrics.counter("stale_decisions_total") if self.metrics else None
+        self.resync = None        # {asset_id: [(ts, side, price, size)]} deltas buffered while books resync
+        self.resync_task = None
+        self.market_connects = 0
+        
+        # Opt-in structured event log: hot path lines go to a ring buffer, written by a background thread
+        # (one per process when hosted by volbot.multi)
+        self.owns_events = events is None
+        self.events = events or event_log_from_env(env)
+        self.dump_handler = None
+        if self.events and self.owns_events:
+            self.dump_handler = DumpOnError(self.events)
+            logger.addHandler(self.dump_handler)
+        
+        # Opt-in tick recording (columnar files, background writer)
+        record_dir = env("RECORD_DIR")
+        self.recorder = TickRecorder(record_dir) if record_dir else None
         
         # Market State
         self.active_market_id = None
@@ -80,6 +182,8 @@ class VolatilityBot:
         self.asset_ids = []
         self.asset_map = {} 
         self.ws_tasks = []
+        self.prefetch_task = None
+        self.strike_task = None
         self.bull_id = None
         self.bear_id = None
         
@@ -93,33 +197,136 @@ class VolatilityBot:
         # Binance Data
         self.current_binance_price = 0.0
         self.dynamic_threshold = 2.0  # Will be updated
+        self.vol_wait_logged = False  # decisions wait for the estimator's first value
         self.last_vol_range = 0.0
         self.last_vol_check = 0
+        self.last_price_log = 0
         
         # Parameters
-        self.initial_capital = float(os.getenv("INITIAL_CAPITAL") or "2000.0")
+        self.initial_capital = float(env("INITIAL_CAPITAL") or "2000.0")
         self.balance = self.initial_capital
         
-        self.binance_pair = (os.getenv("BINANCE_PAIR") or "BTCUSDT").upper()
+        self.binance_pair = (env("BINANCE_PAIR") or "BTCUSDT").upper()
         self.binance_symbol = self.binance_pair
+        self.binance_stream = env("BINANCE_STREAM") or "trade"  # trade | aggTrade | bookTicker (mid)
+        
+        # Tick conflation: the reader keeps only the latest price, a decision task evaluates it
+        self.conflate = (env("CONFLATE_TICKS") or "false").lower() in ("1", "true", "yes")
+        self.decision_interval = float(env("DECISION_INTERVAL_MS") or "0") / 1000
+        self.decision_task = None
+        self.tick_pending = asyncio.Event()
+        self.last_tick_ts = 0.0
+        self.tick_stats = {"ticks": 0, "decisions": 0, "conflated": 0, "dropped": 0}
         
         # Volatility Params
-        self.volatility_k = float(os.getenv("VOLATILITY_K") or "0.6")
-        self.min_diff_limit = float(os.getenv("MIN_DIFF_LIMIT") or "2.0")
+        self.volatility_k = float(env("VOLATILITY_K") or "0.6")
+        self.min_diff_limit = float(env("MIN_DIFF_LIMIT") or "2.0")
+        self.vol_model = (env("VOLATILITY_MODEL") or "range").lower()
+        self.vol_interval = env("VOLATILITY_INTERVAL") or "15m"
+        self.vol_params = {
+            "window": int(env("VOLATILITY_WINDOW") or "14"),
+            "ewma_lambda": float(env("VOLATILITY_EWMA_LAMBDA") or "0.94"),
+        }
+        self.vol_estimator = make_estimator(self.vol_model, **self.vol_params)
+        
+        # Streaming candles (strike + volatility come from these, REST only backfills)
+        intervals = sorted({"1m", "5m", "15m", self.vol_interval}, key=interval_seconds)
+        self.candles = CandleAggregator(intervals)
+        self.backfill_task = None
         
         # Trading Params
-        self.base_qty = int(os.getenv("BASE_QTY") or "10")
-        self.max_risk_per_round = float(os.getenv("MAX_RISK_PER_ROUND") or "50.0")
-        self.max_chase_price = float(os.getenv("MAX_CHASE_PRICE") or "0.95")
-        self.closing_buffer_seconds = int(os.getenv("CLOSING_BUFFER_SECONDS") or "30")
+        self.base_qty = int(env("BASE_QTY") or "10")
+        self.max_risk_per_round = float(env("MAX_RISK_PER_ROUND") or "50.0")
+        self.max_chase_price = float(env("MAX_CHASE_PRICE") or "0.95")
+        self.closing_buffer_seconds = int(env("CLOSING_BUFFER_SECONDS") or "30")
+        self.prefetch_lead = float(env("PREFETCH_LEAD_SECONDS") or "60")
+        self.settle_poll = float(env("SETTLE_POLL_SECONDS") or "10")
+        self.settle_timeout = float(env("SETTLE_TIMEOUT_SECONDS") or "1800")
+        self.settlements = set()  # background resolution jobs, one per finished round
+        self.startup_deadlines = {step: float(env(f"STARTUP_{step.upper()}_TIMEOUT") or default)
+                                  for step, default in STARTUP_DEADLINES.items()}
+        self.startup_timings = {}  # {step: seconds}
+        self.run_started = 0.0
+        self.awaiting_first_decision = False
         self.cooldown_seconds = 2.0
 
-        self.latest_prices = {}  # {asset_id: {ask, bid}}
+        self.books = {}  # {asset_id: OrderBook}
+
+        # Opt-in shadow variants, evaluated on the live ticks after each live decision
+        self.shadow_grid = env("SHADOW_GRID")
+        self.shadow_report = env("SHADOW_REPORT")  # CSV of the final ranking, written at shutdown
+        self.shadow = self._make_shadow() if self.shadow_grid else None
+
+        # Opt-in wallet journal: restores positions and pending settlements after a restart
+        journal_dir = env("JOURNAL_DIR")
+        self.journal = None
+        self.recovered_rounds = []  # journaled settlements still waiting for the official result
+        self.round_of = {}          # {asset_id: slug} journaled rounds of the restored positions
+        self.pending_slugs = set()  # rounds whose settlement is journaled
+        if journal_dir:
+            self.journal = Journal(journal_dir, snapshot_every=int(env("JOURNAL_SNAPSHOT_EVERY") or "1000"),
+                                   commit_interval=float(env("JOURNAL_COMMIT_MS") or "2") / 1000)
+            self._restore_wallet(self.journal.recovered)
 
         logger.info("🌊 VOLATILITY HUNTER SIMULATION INITIALIZED")
         logger.info(f"💰 Capital: ${self.initial_capital} | 📦 Qty: {self.base_qty}")
-        logger.info(f"🌊 Volatility K: {self.volatility_k} | Min Limit: {self.min_diff_limit}")
-        logger.info(f"📊 Asset: {self.binance_pair}")
+        logger.info(f"🌊 Volatility K: {self.volatility_k} | Min Limit: {self.min_diff_limit} | Model: {self.vol_model} ({self.vol_interval})")
+        logger.info(f"📊 Asset: {self.binance_pair} ({self.binance_stream})"
+                    + (f" | Conflated decisions every {self.decision_interval * 1000:.0f}ms" if self.conflate else ""))
+
+    def _make_shadow(self):
+        from volbot.shadow import ShadowVariants, parse_grid  # NumPy only when shadowing
+        live = {"volatility_k": self.volatility_k, "min_diff_limit": self.min_diff_limit,
+                "max_chase_price": self.max_chase_price, "cooldown_seconds": self.cooldown_seconds,
+                "max_risk_per_round": self.max_risk_per_round}
+        shadow = ShadowVariants([live] + parse_grid(self.shadow_grid, live), self.base_qty, self.initial_capital,
+                                self.dynamic_threshold, self._sanitize)
+        logger.info(f"🧪 Shadowing {len(shadow.variants)} parameter variants (variant 0 = live)")
+        return shadow
+
+    def _restore_wallet(self, state):
+        """Loads the journaled wallet (if any) and journals parameter changes since the last run."""
+        params = {"volatility_k": self.volatility_k, "min_diff_limit": self.min_diff_limit,
+                  "vol_model": self.vol_model, "vol_interval": self.vol_interval, "base_qty": self.base_qty,
+                  "max_risk_per_round": self.max_risk_per_round, "max_chase_price": self.max_chase_price,
+                  "closing_buffer_seconds": self.closing_buffer_seconds}
+        changed = [k for k, v in params.items() if k in state["params"] and state["params"][k] != v]
+        if changed: logger.info(f"📓 Parameters changed since last run: {', '.join(changed)}")
+        self.journal.params(self.clock.time(), params)
+        if state["balance"] is None: return
+        self.balance = state["balance"]
+        self.realized_pnl = state["realized_pnl"]
+        self.cumulative_cost = state["cumulative_cost"]
+        self.inventory.update(state["inventory"])
+        self.inventory_cost.update(state["inventory_cost"])
+        self.recovered_rounds = list(state["pending"].values())
+        self.round_of = dict(state["round_of"])
+        self.pending_slugs = set(state["pending"])
+        # After a rollover MARKET_SLUG names an old round: resume the journaled one (same
+        # market, later start), so a mid-round restart keeps its positions and risk spend
+        journaled = state["round"]
+        ours, theirs = self._round_key(self.slug), self._round_key(journaled)
+        if ours and theirs and theirs[0] == ours[0] and theirs[1] > ours[1]:
+            logger.info(f"📓 Resuming journaled round {journaled} (MARKET_SLUG is {self.slug})")
+            self.slug = journaled
+        logger.info(f"📓 Wallet restored: Bal ${self.balance:.2f} | {len(self.inventory)} position(s) | "
+                    f"{len(self.recovered_rounds)} pending settlement(s)")
+
+    def _recover_rounds(self):
+        """
+        Resumes journaled settlements and, once the live round is loaded, settles positions
+        left over from rounds that ended before their settlement was journaled.
+        """
+        for rnd in self.recovered_rounds: self._spawn_resolution(rnd)
+        self.recovered_rounds = []
+        orphans = defaultdict(list)
+        for asset_id, slug in self.round_of.items():
+            if slug == self.slug or slug in self.pending_slugs or asset_id in self.asset_ids: continue
+            if self.inventory.get(asset_id, 0) > 0: orphans[slug].append(asset_id)
+        for slug, asset_ids in orphans.items():
+            self._start_settlement({"slug": slug, "asset_ids": asset_ids, "asset_map": {}, "bull_id": None,
+                                    "bear_id": None, "strike": 0.0, "final_price": 0.0, "recovered": True})
+        self.round_of = {}
 
     def _extract_slug(self, url):
         if not url: return None
@@ -129,142 +336,208 @@ class VolatilityBot:
 
     def _sanitize(self, val, decimals=2):
         factor = 10 ** decimals
-        return math.floor(float(val) * factor) / factor
+        # Floor, but not below a value that is exact in decimal (0.58 * 100 is 57.99999...)
+        return math.floor(float(val) * factor + 1e-9) / factor
 
-    async def _update_volatility_threshold(self):
-        """Calculates dynamic threshold based on previous 15m candle range."""
-        try:
-            url = f"{BINANCE_API}/klines"
-            params = {
-                "symbol": self.binance_symbol,
-                "interval": "15m",
-                "limit": 2 
-            }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=5) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data and len(data) >= 2:
-                            # Use the previously COMPLETED candle (index 0)
-                            # Data format: [OpenTime, Open, High, Low, Close, ...]
-                            prev_candle = data[0]
-                            high = float(prev_candle[2])
-                            low = float(prev_candle[3])
-                            
-                            vol_range = high - low
-                            calculated_thresh = vol_range * self.volatility_k
-                            
-                            # Safety floor
-                            self.dynamic_threshold = max(calculated_thresh, self.min_diff_limit)
-                            self.last_vol_range = vol_range
-                            self.last_vol_check = time.time()
-                            
-                            logger.info(f"🌊 Volatility Update: Range ${vol_range:.2f} -> Threshold ${self.dynamic_threshold:.2f}")
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to update volatility: {e}")
+    def _update_volatility_threshold(self):
+        """Calculates dynamic threshold from the volatility estimator (fed by closed candles)."""
+        est = self.vol_estimator
+        if not est.ready: return
+        
+        # Safety floor
+        self.dynamic_threshold = max(est.value * self.volatility_k, self.min_diff_limit)
+        self.last_vol_range = est.value
+        self.last_vol_check = self.clock.time()
+        if self.shadow: self.shadow.set_volatility(est.value)
+        
+        logger.info(f"🌊 Volatility Update ({est.name}): ${est.value:.2f} -> Threshold ${self.dynamic_threshold:.2f}")
+
+    def _prime_volatility(self):
+        """Rebuilds the estimator from the closed bars currently held in the candle buffer."""
+        self.vol_estimator = make_estimator(self.vol_model, **self.vol_params)
+        for bar in self.candles[self.vol_interval].closed_bars():
+            self.vol_estimator.update(bar.open, bar.high, bar.low, bar.close)
+        self._update_volatility_threshold()
+
+    def _check_candle_gap(self):
+        last = self.candles.last_ts
+        if last and self.clock.time() - last > CANDLE_GAP_SECONDS: self.candles.mark_gap()
+        return self.candles.gap
+
+    async def _backfill_candles(self):
+        """Seeds candle history from REST /klines. Only needed at startup or after a feed gap."""
+        url = f"{self.binance_api}/klines"
+        
+        async def backfill(series):
+            params = {"symbol": self.binance_symbol, "interval": series.name, "limit": series.capacity}
+            try:
+                status, data = await self.http.get_json(url, "klines", params=params)
+                if status == 200 and data: series.seed(data)
+            except Exception as e:
+                logger.warning(f"⚠️ Candle backfill failed ({series.name}): {e}")
+        
+        pending = [s for s in self.candles.series.values() if s.gap]
+        if not pending: return
+        await asyncio.gather(*(backfill(s) for s in pending))
+        logger.info(f"🕯️ Candles backfilled: {', '.join(s.name for s in pending)}")
+        self._prime_volatility()
+
+    def _on_bars_closed(self, closed):
+        for name, n in closed:
+            if name == self.vol_interval:
+                series = self.candles[name]
+                for off in range(n, 0, -1):
+                    bar = series.bar(off)
+                    if bar: self.vol_estimator.update(bar.open, bar.high, bar.low, bar.close)
+                self._update_volatility_threshold()
+            if name == "15m" and not self.strike_price and self.market_start:
+                bar = self.candles["15m"].bar(0)
+                if bar and bar.complete and bar.start == int(self.market_start):
+                    self.strike_price = bar.open
+                    logger.info(f"🎯 Strike Price (15m OPEN, stream): ${self.strike_price:.2f}")
 
     async def fetch_market(self):
+        market = await self._fetch_gamma_market(self.slug)
+        if not market: return False
+        return await self._load_market(market)
+
+    async def _fetch_gamma_market(self, slug):
+        """Gamma market record for a slug, or None. Touches no bot state."""
         try:
-            logger.info(f"Fetching market for slug: {self.slug}")
-            url = f"https://gamma-api.polymarket.com/events?slug={self.slug}"
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(url) as response:
-                    if response.status != 200: return False
-                    data = await response.json()
+            logger.info(f"Fetching market for slug: {slug}")
+            url = f"{self.gamma_api}/events"
+            status, data = await self.http.get_json(url, "gamma", params={"slug": slug})
+            if status != 200: return None
             
-            if not data or not isinstance(data, list) or len(data) == 0: return False
+            if not data or not isinstance(data, list) or len(data) == 0: return None
             event = data[0]
-            if not event.get('markets'): return False
+            if not event.get('markets'): return None
+            return event['markets'][0]
+        except Exception as e:
+            logger.error(f"Error fetching market: {e}")
+            return None
 
-            market = event['markets'][0]
-            self.market_details = market
-            self.active_market_id = market['conditionId']
-            
-            clob_tokens = market.get('clobTokenIds')
-            if isinstance(clob_tokens, str): self.asset_ids = json.loads(clob_tokens)
-            elif isinstance(clob_tokens, list): self.asset_ids = clob_tokens
-            else:
-                self.asset_ids = []
-            
-            outcomes = json.loads(market.get('outcomes', '[]'))
-            for idx, tid in enumerate(self.asset_ids):
-                if idx < len(outcomes): self.asset_map[tid] = outcomes[idx]
-            
-            self.bull_id = None
-            self.bear_id = None
-            for tid, name in self.asset_map.items():
-                n = name.lower()
-                if self.bull_id is None and (n == "yes" or n == "up"):
-                    self.bull_id = tid
-                elif self.bear_id is None and (n == "no" or n == "down"):
-                    self.bear_id = tid
-            
-            if self.bull_id and self.bear_id:
-                logger.info(f"✅ Sides Identified: UP={self.bull_id} | DOWN={self.bear_id}")
-                await self._warmup_prices()
-            else:
-                logger.warning(f"⚠️ Could not identify YES/UP vs NO/DOWN in: {self.asset_map}")
+    def _parse_market(self, market):
+        """Token ids, sides and timing of a Gamma market record, without applying them."""
+        clob_tokens = market.get('clobTokenIds')
+        if isinstance(clob_tokens, str): asset_ids = json.loads(clob_tokens)
+        elif isinstance(clob_tokens, list): asset_ids = clob_tokens
+        else:
+            asset_ids = []
+        
+        asset_map = {}
+        outcomes = json.loads(market.get('outcomes', '[]'))
+        for idx, tid in enumerate(asset_ids):
+            if idx < len(outcomes): asset_map[tid] = outcomes[idx]
+        
+        bull_id = bear_id = None
+        for tid, name in asset_map.items():
+            n = name.lower()
+            if bull_id is None and (n == "yes" or n == "up"):
+                bull_id = tid
+            elif bear_id is None and (n == "no" or n == "down"):
+                bear_id = tid
+        
+        market_start = market_end = 0
+        end_date_str = market.get('endDate')
+        if end_date_str:
+            dt_end = parse_iso_date(end_date_str)
+            if dt_end:
+                market_end = dt_end.timestamp()
+                market_start = market_end - 900  # 15 minutes before
+        
+        return {"market": market, "asset_ids": asset_ids, "asset_map": asset_map, "bull_id": bull_id,
+                "bear_id": bear_id, "market_start": market_start, "market_end": market_end}
 
-            end_date_str = market.get('endDate')
-            if end_date_str:
-                dt_end = parse_iso_date(end_date_str)
-                if dt_end: 
-                    self.market_end = dt_end.timestamp()
-                    self.market_start = self.market_end - 900  # 15 minutes before
+    def _apply_market(self, parsed):
+        market = parsed["market"]
+        self.market_details = market
+        self.active_market_id = market['conditionId']
+        self.asset_ids = parsed["asset_ids"]
+        self.asset_map.update(parsed["asset_map"])
+        self.bull_id = parsed["bull_id"]
+        self.bear_id = parsed["bear_id"]
+        if parsed["market_end"]:
+            self.market_end = parsed["market_end"]
+            self.market_start = parsed["market_start"]
+        
+        if self.bull_id and self.bear_id:
+            logger.info(f"✅ Sides Identified: UP={self.bull_id} | DOWN={self.bear_id}")
+        else:
+            logger.warning(f"⚠️ Could not identify YES/UP vs NO/DOWN in: {self.asset_map}")
+        
+        logger.info(f"Found Market: {market['question']}")
+        if self.journal and self.journal.start_round(self.clock.time(), self.slug, self.balance):
+            self.cumulative_cost = 0.0  # restored spend belonged to an earlier round
+        if self.recorder:
+            self.recorder.set_segment(self.slug, symbol=self.binance_symbol, market_id=self.active_market_id,
+                                      outcomes=self.asset_map, market_start=self.market_start, market_end=self.market_end)
 
-            logger.info(f"Found Market: {market['question']}")
+    async def _load_market(self, market):
+        """Applies a Gamma market record: sides, timing, books, strike and volatility."""
+        try:
+            parsed = self._parse_market(market)
+            self._apply_market(parsed)
+            steps = [self._warmup_prices()] if self.bull_id and self.bear_id else []
+            
+            # 1. Candle history (REST backfill only at startup or after a gap), alongside the books
+            if self._check_candle_gap(): steps.append(self._backfill_candles())
+            await asyncio.gather(*steps)
             
-            # 1. Fetch Strike Price (15m OPEN)
+            # 2. Fetch Strike Price (15m OPEN)
             await self._fetch_strike_price()
             
-            # 2. Initial Volatility Calculation
-            await self._update_volatility_threshold()
+            # 3. Initial Volatility Calculation
+            self._update_volatility_threshold()
             
             return True
         except Exception as e:
             logger.error(f"Error fetching market: {e}")
             return False
 
+    def _strike_from_candles(self):
+        bar = self.candles["15m"].find(int(self.market_start))
+        if bar and bar.complete:
+            self.strike_price = bar.open
+            logger.info(f"🎯 Strike Price (15m OPEN): ${self.strike_price:.2f}")
+            return True
+        return False
+
     async def _fetch_strike_price(self):
+        if self._strike_from_candles(): return
         try:
             start_time_ms = int(self.market_start * 1000)
-            url = f"{BINANCE_API}/klines"
+            url = f"{self.binance_api}/klines"
             params = {
                 "symbol": self.binance_symbol,
                 "interval": "15m",
                 "startTime": start_time_ms,
                 "limit": 1
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=5) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data and len(data) > 0:
-                            candle = data[0]
-                            self.strike_price = float(candle[1])  # OPEN price
-                            logger.info(f"🎯 Strike Price (15m OPEN): ${self.strike_price:.2f}")
-                            return
+            status, data = await self.http.get_json(url, "klines", params=params)
+            if status == 200 and data and len(data) > 0:
+                candle = data[0]
+                self.strike_price = float(candle[1])  # OPEN price
+                logger.info(f"🎯 Strike Price (15m OPEN): ${self.strike_price:.2f}")
+                return
             logger.warning("⚠️ Could not fetch strike price from Binance")
         except Exception as e:
             logger.error(f"Strike price fetch error: {e}")
 
-    async def _warmup_prices(self):
-        """Fetches initial orderbook snapshot via REST (Sorted)."""
-        logger.info(f"🔥 Warming up order books... Assets: {self.asset_ids}")
-        async with aiohttp.ClientSession() as session:
-            for tid in self.asset_ids:
-                try:
-                    url = f"{HOST}/book?token_id={tid}"
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            asks = data.get("asks", [])
-                            bids = data.get("bids", [])
-                            if asks and bids:
-                                asks.sort(key=lambda x: float(x["price"]))
-                                bids.sort(key=lambda x: float(x["price"]), reverse=True)
-                                await self._update_prices({"asset_id": tid, "asks": asks, "bids": bids})
-                except Exception: pass
+    async def _warmup_prices(self, asset_ids=None):
+        """Fetches initial orderbook snapshots via REST, all tokens at once."""
+        asset_ids = asset_ids or self.asset_ids
+        logger.info(f"🔥 Warming up order books... Assets: {asset_ids}")
+        
+        async def warmup(tid):
+            try:
+                status, data = await self.http.get_json(f"{self.clob_host}/book", "book", params={"token_id": tid})
+                # The market channel may already have delivered a newer book
+                if status == 200 and data and tid not in self.books:
+                    await self._update_prices({"asset_id": tid, "asks": data.get("asks", []), "bids": data.get("bids", [])})
+            except Exception: pass
+        
+        await asyncio.gather(*(warmup(tid) for tid in asset_ids))
 
     async def _place_order(self, token_id, price, size, side, order_type=OrderType.FOK):
         order_id = str(uuid.uuid4())
@@ -272,35 +545,30 @@ class VolatilityBot:
         safe_qty = self._sanitize(size, 2)
         
         asset_name = self.asset_map.get(token_id, token_id[:8])
-        logger.info(f"🧪 SIM ORDER: {side} {safe_qty} {asset_name} @ {limit_price} ({order_type})")
+        if self.events: self.events.emit(ORDER, self.clock.time(), self.slug, side, safe_qty, asset_name, limit_price, order_type)
+        else: logger.info(f"🧪 SIM ORDER: {side} {safe_qty} {asset_name} @ {limit_price} ({order_type})")
 
-        # FOK Logic
+        # FOK Logic: walk depth up to the limit, fill all-or-nothing at the VWAP
         if order_type == OrderType.FOK:
-            prices = self.latest_prices.get(token_id)
-            if not prices: return None
+            book = self.books.get(token_id)
+            if not book: return None
             
-            market_price = prices["ask"] if side == BUY else prices["bid"]
-            can_fill = False
-            if side == BUY and market_price <= limit_price: can_fill = True
-            if side == SELL and market_price >= limit_price: can_fill = True
+            filled, avg_price = book.walk(side, safe_qty, limit_price)
+            if filled < safe_qty:
+                if self.events: self.events.emit(KILLED, self.clock.time(), self.slug, asset_name, filled, safe_qty, limit_price)
+                else: logger.info(f"🚫 FOK KILLED: only {filled:.2f}/{safe_qty} {asset_name} available @ {'<=' if side == BUY else '>='} {limit_price}")
+                return None
             
-            if can_fill:
-                await self._execute_sim_fill(token_id, side, limit_price, safe_qty)
-                return order_id
-            return None
+            await self._execute_sim_fill(token_id, side, self._sanitize(avg_price, 4), safe_qty)
+            return order_id
         
         return None
 
-    async def _report_sim_trade(self, asset_id, side, price, size, pnl=None):
-        if not self.api_url or not self.simulation_id: return
-        try:
-            label = self.asset_map.get(asset_id, asset_id[:8])
-            payload = {"assetId": label, "side": side, "price": price, "size": size, "pnl": pnl}
-            url = f"{self.api_url}/simulations/{self.simulation_id}/trade"
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as resp:
-                    pass
-        except: pass
+    def _report_sim_trade(self, asset_id, side, price, size, pnl=None, label=None):
+        """Queues the trade for the background reporter; never waits on the network."""
+        if not self.reporter: return
+        label = label or self.asset_map.get(asset_id, asset_id[:8])
+        self.reporter.submit({"assetId": label, "side": side, "price": price, "size": size, "pnl": pnl})
 
     async def _execute_sim_fill(self, asset_id, side, price, size):
         val = size * price
@@ -312,7 +580,10 @@ class VolatilityBot:
             self.cumulative_cost += val
             self.inventory[asset_id] += size
             self.inventory_cost[asset_id] += val
-            logger.info(f"💸 SIM BUY FILL: {size} {asset_name} @ {price} | Cost: ${val:.2f} | Bal: ${self.balance:.2f}")
+            if self.lat: self.lat.decision_to_fill.record(perf_counter() - self.decision_at)
+            if self.journal: self.journal.delta(FILL, self.clock.time(), asset_id, -val, size, val, 0.0, val)
+            if self.events: self.events.emit(EV_FILL, self.clock.time(), self.slug, side, asset_name, price, size, val, self.balance, 0.0)
+            else: logger.info(f"💸 SIM BUY FILL: {size} {asset_name} @ {price} | Cost: ${val:.2f} | Bal: ${self.balance:.2f}")
         else:
             avg_cost = 0
             if self.inventory[asset_id] > 0:
@@ -321,22 +592,46 @@ class VolatilityBot:
             realized = val - (size * avg_cost)
             self.realized_pnl += realized
             self.balance += val
+            cost_before = self.inventory_cost[asset_id]
             self.inventory[asset_id] -= size
             if self.inventory[asset_id] <= 0: self.inventory_cost[asset_id] = 0
             else: self.inventory_cost[asset_id] -= (size * avg_cost)
+            if self.journal:
+                self.journal.delta(FILL, self.clock.time(), asset_id, val, -size,
+                                   self.inventory_cost[asset_id] - cost_before, realized)
             
-            logger.info(f"💰 SIM SELL FILL: {size} {asset_name} @ {price} | PnL: ${realized:.2f}")
+            if self.events: self.events.emit(EV_FILL, self.clock.time(), self.slug, side, asset_name, price, size, val, self.balance, realized)
+            else: logger.info(f"💰 SIM SELL FILL: {size} {asset_name} @ {price} | PnL: ${realized:.2f}")
         
-        await self._report_sim_trade(asset_id, side, price, size, pnl=realized if side == SELL else None)
+        self._report_sim_trade(asset_id, side, price, size, pnl=realized if side == SELL else None)
 
     async def _update_prices(self, data):
-        asset_id = data.get("asset_id")
-        if not asset_id or not data.get("asks") or not data.get("bids"): return
+        """
+        Applies a decoded market channel item (book snapshot or price_change delta, see
+        volbot.decode) to the local books. Returns the books that changed.
+        """
+        resync = self.resync
+        if data.get("event_type") == "price_change":
+            touched = []
+            if resync is not None: ts = float(data.get("timestamp") or 0)
+            for asset_id, side, price, size in data["changes"]:
+                if resync is not None and asset_id in resync:
+                    resync[asset_id].append((ts, side, price, size))  # applied on top of the REST snapshot
+                    continue
+                book = self.books.get(asset_id)
+                if book:
+                    book.apply_change(side, price, size)
+                    if book not in touched: touched.append(book)
+            return touched
 
-        best_ask = float(min(data["asks"], key=lambda x: float(x["price"]))["price"])
-        best_bid = float(max(data["bids"], key=lambda x: float(x["price"]))["price"])
-        
-        self.latest_prices[asset_id] = {"ask": best_ask, "bid": best_bid}
+        asset_id = data.get("asset_id")
+        if not asset_id or "asks" not in data: return ()
+        book = self.books.get(asset_id)
+        if book is None: book = self.books[asset_id] = OrderBook(asset_id)
+        book.apply_snapshot(data.get("bids", []), data["asks"], data.get("timestamp", 0), data.get("hash"))
+        if resync is not None and resync.pop(asset_id, None) is not None and not resync:
+            self._resync_done("market channel snapshots")
+        return (book,)
 
     async def execute_strategy(self):
         """
@@ -345,7 +640,24 @@ class VolatilityBot:
         if self.state != "SEARCHING": return
         if not self.strike_price or self.strike_price <= 0: return
         if not self.bull_id or not self.bear_id: return
-        if time.time() < self.cooldown_until: return
+        if not self.vol_estimator.ready:
+            if not self.vol_wait_logged:
+                logger.warning("⏳ Volatility not primed yet (candle backfill pending): decisions suppressed")
+                self.vol_wait_logged = True
+            return
+        now = self.clock.time()
+        if now < self.cooldown_until: return
+        
+        # Never trade on a stale price or book (inline pre-check; _stale_feed applies the per-feed switches)
+        if self.check_feeds:
+            b, p = self.binance_health, self.poly_health
+            if (now - b.last > self.binance_limit or now - p.last > self.poly_limit or not b.connected
+                    or not p.connected or self.resync is not None):
+                stale = self._stale_feed(now)
+                if stale:
+                    self._on_stale_decision(stale, now)
+                    return
+            if self.stale_since: self._on_feeds_live(now)
         
         # Circuit Breaker
         if self.cumulative_cost >= self.max_risk_per_round:
@@ -356,178 +668,677 @@ class VolatilityBot:
         
         diff = self.current_binance_price - self.strike_price
         
-        up_prices = self.latest_prices.get(self.bull_id)
-        down_prices = self.latest_prices.get(self.bear_id)
-        if not up_prices or not down_prices: return
+        up_book = self.books.get(self.bull_id)
+        down_book = self.books.get(self.bear_id)
+        if not up_book or not down_book: return
+        if self.awaiting_first_decision: self._log_startup()
         
-        ask_up = up_prices["ask"]
-        ask_down = down_prices["ask"]
+        ask_up = up_book.ask
+        ask_down = down_book.ask
         
         # Signal Check with Dynamic Threshold
         if diff > self.dynamic_threshold:
             # Bullish
             if 0 < ask_up < self.max_chase_price:
-                logger.info(f"📈 BULLISH: Diff +${diff:.2f} > Thresh ${self.dynamic_threshold:.2f} | Buying UP @ {ask_up}")
+                if self.events: self.events.emit(SIGNAL, self.clock.time(), self.slug, "up", diff, self.dynamic_threshold, ask_up)
+                else: logger.info(f"📈 BULLISH: Diff +${diff:.2f} > Thresh ${self.dynamic_threshold:.2f} | Buying UP @ {ask_up}")
                 oid = await self._place_order(self.bull_id, ask_up, self.base_qty, BUY, OrderType.FOK)
-                if oid: self.cooldown_until = time.time() + self.cooldown_seconds
+                if oid: self.cooldown_until = self.clock.time() + self.cooldown_seconds
         
         elif diff < -self.dynamic_threshold:
             # Bearish
             if 0 < ask_down < self.max_chase_price:
-                logger.info(f"📉 BEARISH: Diff ${diff:.2f} < -Thresh ${self.dynamic_threshold:.2f} | Buying DOWN @ {ask_down}")
+                if self.events: self.events.emit(SIGNAL, self.clock.time(), self.slug, "down", diff, self.dynamic_threshold, ask_down)
+                else: logger.info(f"📉 BEARISH: Diff ${diff:.2f} < -Thresh ${self.dynamic_threshold:.2f} | Buying DOWN @ {ask_down}")
                 oid = await self._place_order(self.bear_id, ask_down, self.base_qty, BUY, OrderType.FOK)
-                if oid: self.cooldown_until = time.time() + self.cooldown_seconds
+                if oid: self.cooldown_until = self.clock.time() + self.cooldown_seconds
+
+    def _stale_feed(self, now):
+        """Name of the first stale feed (disconnected, silent too long or resyncing its books), else None."""
+        b, p = self.binance_health, self.poly_health
+        if self.binance_stale and (not b.connected or now - b.last > self.binance_stale): return "binance"
+        if self.poly_stale and (not p.connected or self.resync is not None or now - p.last > self.poly_stale):
+            return "polymarket"
+        return None
+
+    def _on_stale_decision(self, feed, now):
+        self.stale_decisions += 1
+        if self.stale_total: self.stale_total.value += 1
+        if not self.stale_since:
+            self.stale_since = now
+            health = self.binance_health if feed == "binance" else self.poly_health
+            if health.connected_at:  # not worth a warning before the first connect
+                reason = ("resyncing books" if health.connected and self.resync is not None
+                          else f"silent {now - health.last:.1f}s" if health.connected else "disconnected")
+                logger.warning(f"⏸️ {feed} feed stale ({reason}): decisions suppressed")
+
+    def _on_feeds_live(self, now):
+        if self.binance_health.disconnects or self.poly_health.disconnects:
+            logger.info(f"▶️ Feeds live again after {now - self.stale_since:.1f}s "
+                        f"({self.stale_decisions} decision(s) suppressed so far)")
+        self.stale_since = 0.0
+
+    async def _on_binance_trade(self, price, qty, exch_ts, now, side=1):
+        """Handles one Binance tick (live or replayed)."""
+        stats = self.tick_stats
+        stats["ticks"] += 1
+        lat = self.lat
+        if lat:
+            lat.binance.exch_to_recv.record(now - exch_ts)
+            decoded_at = perf_counter()
+        if self.recorder: self.recorder.trade(now, exch_ts, price, qty, side)
+        
+        # Streaming candles: volatility/strike update on bar close
+        closed = self.candles.update(exch_ts, price, qty)
+        if closed: self._on_bars_closed(closed)
+        
+        if self.events:
+            # Every tick at full detail; EVENT_LOG_RATE decides how many get written
+            self.events.emit(PRICE, now, self.slug, price, price - self.strike_price if self.strike_price > 0 else 0.0,
+                             self.dynamic_threshold)
+        elif now - self.last_price_log > 10:
+            diff = price - self.strike_price if self.strike_price > 0 else 0
+            logger.info(f"📊 ${price:.2f} | Diff: {diff:+.2f} | Thresh: ±${self.dynamic_threshold:.2f}")
+            self.last_price_log = now
+        
+        if self.conflate:
+            # Keep only the latest price; _decision_loop picks it up
+            if exch_ts < self.last_tick_ts: stats["dropped"] += 1; return
+            if self.tick_pending.is_set(): stats["conflated"] += 1
+            self.current_binance_price = price
+            self.last_tick_ts = exch_ts
+            if lat: self.tick_decoded_at = decoded_at
+            self.tick_pending.set()
+            return
+        
+        self.current_binance_price = price
+        self.last_tick_ts = exch_ts
+        if lat: self.tick_decoded_at = decoded_at
+        stats["decisions"] += 1
+        await self._decide()
+
+    async def _decide(self):
+        lat = self.lat
+        if not lat:
+            async with self.lock: await self.execute_strategy()
+            if self.shadow: self._shadow_step()
+            return
+        lock = self.lock
+        if lock.locked():
+            waited = perf_counter()
+            await lock.acquire()
+            t = perf_counter()
+            lat.lock_wait.record(t - waited)
+        else:
+            await lock.acquire()  # uncontended: no wait to time
+            t = perf_counter()
+            lat.lock_wait.record(0.0)
+        try:
+            self.decision_at = t
+            lat.decode_to_decision.record(t - self.tick_decoded_at)
+            await self.execute_strategy()
+        finally:
+            lock.release()
+        if self.shadow: self._shadow_step()
+
+    def _shadow_step(self):
+        """Every shadow variant on the tick the live decision just saw; runs after it, so live latency is untouched."""
+        if self.state != "SEARCHING" or self.strike_price <= 0 or not self.vol_estimator.ready: return
+        up_book, down_book = self.books.get(self.bull_id), self.books.get(self.bear_id)
+        if up_book and down_book:
+            self.shadow.evaluate(self.clock.time(), self.current_binance_price - self.strike_price, up_book, down_book)
+
+    async def _decision_loop(self):
+        """Conflated mode: evaluates the latest tick at most once per loop pass (or DECISION_INTERVAL_MS)."""
+        while True:
+            await self.tick_pending.wait()
+            if self.decision_interval: await self.clock.sleep(self.decision_interval)
+            self.tick_pending.clear()
+            self.tick_stats["decisions"] += 1
+            await self._decide()
+
+    def _log_tick_stats(self):
+        s = self.tick_stats
+        now = self.clock.time()
+        logger.info(f"🧮 Ticks: {s['ticks']} | Decisions: {s['decisions']} | "
+                    f"Conflated: {s['conflated']} | Dropped (out of order): {s['dropped']} | "
+                    f"Stale-suppressed: {self.stale_decisions} | Downtime: binance "
+                    f"{self.binance_health.total_downtime(now):.1f}s, polymarket {self.poly_health.total_downtime(now):.1f}s")
+
+    async def _on_market_message(self, item, recv_ts):
+        """Handles one decoded Polymarket market channel item (live or replayed)."""
+        lat = self.lat
+        if lat:
+            if item.get("timestamp"): lat.poly.exch_to_recv.record(recv_ts - float(item["timestamp"]) / 1000)
+            waited = perf_counter()
+            async with self.lock:
+                lat.lock_wait.record(perf_counter() - waited)
+                touched = await self._update_prices(item)
+        else:
+            async with self.lock: touched = await self._update_prices(item)
+        if self.recorder and touched:
+            exch_ts = float(item.get("timestamp") or 0) / 1000
+            for book in touched:
+                # Prefetched next-round books start recording when that round goes live
+                if book.asset_id in self.asset_map: self.recorder.book(recv_ts, exch_ts, book)
+
+    def _on_binance_connect(self):
+        if self._check_candle_gap() and not (self.backfill_task and not self.backfill_task.done()):
+            self.backfill_task = asyncio.create_task(self._backfill_candles())
 
     async def binance_ws_handler(self):
         symbol = self.binance_symbol.lower()
-        url = f"wss://stream.binance.com:9443/ws/{symbol}@trade"
+        url = f"{self.binance_ws_host}/ws/{symbol}@{self.binance_stream}"
         logger.info(f"🔌 Connecting to Binance Spot: {url}")
-        last_log_time = 0
         
+        health, backoff = self.binance_health, Backoff()
         while True:
+            dog = None
             try:
                 async with websockets.connect(url) as ws:
                     logger.info(f"✅ Connected to Binance for {self.binance_symbol}")
+                    health.on_connect(self.clock.time())
+                    if self.binance_stale:
+                        dog = asyncio.create_task(watchdog(ws, health, self.clock, 2 * self.binance_stale))
+                    self._on_binance_connect()
+                    lat = self.lat and self.lat.binance
                     while True:
                         msg = await ws.recv()
-                        data = json.loads(msg)
-                        price = float(data['p'])
-                        now = time.time()
-                        self.current_binance_price = price
-                        
-                        # Periodically refresh volatility (every 60s)
-                        if now - self.last_vol_check > 60:
-                            await self._update_volatility_threshold()
-                        
-                        if now - last_log_time > 10:
-                            diff = price - self.strike_price if self.strike_price > 0 else 0
-                            logger.info(f"📊 ${price:.2f} | Diff: {diff:+.2f} | Thresh: ±${self.dynamic_threshold:.2f}")
-                            last_log_time = now
-                        
-                        async with self.lock:
-                            await self.execute_strategy()
+                        now = health.last = self.clock.time()  # liveness on our clock; exch_ts only feeds lag metrics
+                        if lat: t = perf_counter()
+                        _, price, qty, exch_ms, maker = self.decoder.binance_trade(msg)
+                        if lat:
+                            lat.recv_to_decode.record(perf_counter() - t)
+                            lat.messages.value += 1
+                        exch_ts = (exch_ms or now * 1000) / 1000
+                        await self._on_binance_trade(price, qty, exch_ts, now, -1 if maker else 1)
 
             except Exception as e:
-                logger.error(f"Binance WS Error: {e}")
-                await asyncio.sleep(5)
+                delay = retry_delay(health, backoff, self.clock.time())
+                logger.error(f"Binance WS Error: {e} (reconnecting in {delay:.1f}s)")
+                if delay: await self.clock.sleep(delay)
+            finally:
+                if dog: dog.cancel()
 
     async def market_ws_handler(self):
-        url = f"{POLY_WS_HOST}/market"
+        url = f"{self.poly_ws_host}/market"
+        health, backoff = self.poly_health, Backoff()
         while True:
+            dog = None
             try:
                 async with websockets.connect(url) as ws:
+                    self.ws = ws
                     ping = asyncio.create_task(self._ping(ws))
                     try:
-                        if self.asset_ids:
-                            await ws.send(json.dumps({"assets_ids": self.asset_ids, "type": "market"}))
+                        if self.market_subs:
+                            await ws.send(json.dumps({"assets_ids": self.market_subs, "type": "market"}))
+                        health.on_connect(self.clock.time())
+                        if self.poly_stale:
+                            dog = asyncio.create_task(watchdog(ws, health, self.clock, 2 * self.poly_stale))
+                        self._on_market_connect()
+                        lat = self.lat and self.lat.poly
                         async for msg in ws:
+                            recv_ts = health.last = self.clock.time()  # PONGs count as heartbeats
                             if msg == "PONG": continue
-                            data = json.loads(msg)
-                            items = data if isinstance(data, list) else [data]
-                            for item in items:
-                                if "asks" in item:
-                                    async with self.lock: await self._update_prices(item)
+                            if lat: t = perf_counter()
+                            items = self.decoder.market(msg)
+                            if lat:
+                                lat.recv_to_decode.record(perf_counter() - t)
+                                lat.messages.value += 1
+                            for item in items: await self._on_market_message(item, recv_ts)
+                        raise ConnectionError("connection closed")
                     finally:
                         ping.cancel()
+                        self.ws = None
             except Exception as e:
-                logger.error(f"Market WS Error: {e}"); await asyncio.sleep(5)
+                delay = retry_delay(health, backoff, self.clock.time())
+                logger.error(f"Market WS Error: {e} (reconnecting in {delay:.1f}s)")
+                if delay: await self.clock.sleep(delay)
+            finally:
+                if dog: dog.cancel()
+
+    def _on_market_connect(self):
+        """The books missed every delta while the market channel was down: resync them on reconnect."""
+        self.market_connects += 1
+        if self.market_connects > 1 and self.market_subs: self._start_resync(list(self.market_subs))
+
+    def _start_resync(self, asset_ids):
+        self.resync = {a: [] for a in asset_ids}
+        if self.resync_task: self.resync_task.cancel()
+        self.resync_task = asyncio.create_task(self._resync_books())
+
+    async def _resync_books(self):
+        """REST snapshot for every book still resyncing, then the deltas buffered since the reconnect that are newer."""
+        started, applied = self.clock.time(), 0
+        backoff = Backoff()
+        while self.resync:
+            async def fetch(tid):
+                try:
+                    status, data = await self.http.get_json(f"{self.clob_host}/book", "book", params={"token_id": tid})
+                    return tid, data if status == 200 and data else None
+                except Exception: return tid, None
+            snaps = await asyncio.gather(*(fetch(tid) for tid in list(self.resync)))
+            async with self.lock:
+                if self.resync is None: return  # market channel snapshots got there first
+                for tid, data in snaps:
+                    pending = self.resync.get(tid)
+                    if pending is None or not data: continue
+                    if tid not in self.market_subs:
+                        del self.resync[tid]; continue
+                    snap_ts = float(data.get("timestamp") or 0)
+                    book = self.books.get(tid)
+                    if book is None: book = self.books[tid] = OrderBook(tid)
+                    book.apply_snapshot(data.get("bids", []), data.get("asks", []), data.get("timestamp", 0), data.get("hash"))
+                    for ts, side, price, size in pending:
+                        if ts > snap_ts or not snap_ts:
+                            book.apply_change(side, price, size); applied += 1
+                    del self.resync[tid]
+                if not self.resync:
+                    self._resync_done(f"REST snapshots + {applied} buffered deltas", started)
+                    break
+            await self.clock.sleep(backoff.next() or 0.1)
+        self.resync_task = None
+
+    def _resync_done(self, source, started=None):
+        self.resync = None
+        took = f" in {(self.clock.time() - started) * 1000:.0f}ms" if started else ""
+        logger.info(f"🔄 Books resynced from {source}{took}")
+
+    async def _market_op(self, operation, asset_ids):
+        try:
+            await self.ws.send(json.dumps({"assets_ids": asset_ids, "operation": operation}))
+        except Exception as e:
+            logger.warning(f"⚠️ Market {operation} failed: {e}")
+
+    def _subscribe_assets(self, asset_ids):
+        """Adds assets on the live market connection (no reconnect)."""
+        new = [a for a in asset_ids if a not in self.market_subs]
+        if not new: return
+        self.market_subs.extend(new)
+        if self.feeds: self.feeds.poly.subscribe(new, self._on_market_message)
+        elif self.ws: asyncio.create_task(self._market_op("subscribe", new))
+
+    def _unsubscribe_assets(self, asset_ids):
+        gone = [a for a in asset_ids if a in self.market_subs]
+        if not gone: return
+        self.market_subs = [a for a in self.market_subs if a not in gone]
+        if self.feeds: self.feeds.poly.unsubscribe(gone)
+        elif self.ws: asyncio.create_task(self._market_op("unsubscribe", gone))
 
     async def _ping(self, ws):
         try:
             while True:
-                await asyncio.sleep(10); await ws.send("PING")
-        except: pass
-
-    async def _settle_simulation(self):
-        logger.info("🏁 Settling Simulation...")
-        winner_id = None
-        # Try fetch Gamma
-        for i in range(12):
-            await self.fetch_market()
-            if self.market_details:
-                try:
-                    clob_ids = json.loads(self.market_details.get("clobTokenIds", "[]"))
-                    prices = json.loads(self.market_details.get("outcomePrices", "[]"))
-                    if clob_ids and prices:
-                        for idx, p in enumerate(prices):
-                            if float(p) > 0.95: winner_id = clob_ids[idx]; break
-                except: pass
-            if winner_id: break
-            await asyncio.sleep(10)
-        
-        # Fallback to Binance Price
-        if not winner_id:
-            if self.current_binance_price > self.strike_price:
-                winner_id = self.bull_id
-                logger.info(f"✅ Winner (Price): UP (${self.current_binance_price:.2f} > ${self.strike_price:.2f})")
-            else:
-                winner_id = self.bear_id
-                logger.info(f"✅ Winner (Price): DOWN (${self.current_binance_price:.2f} <= ${self.strike_price:.2f})")
+                await self.clock.sleep(PING_SECONDS); await ws.send("PING")
+        except Exception: pass
+
+    def _round_snapshot(self):
+        """What settlement needs from a finished round, so the live state can move on to the next one."""
+        rnd = {"slug": self.slug, "asset_ids": list(self.asset_ids), "asset_map": dict(self.asset_map),
+               "bull_id": self.bull_id, "bear_id": self.bear_id, "strike": self.strike_price,
+               "final_price": self.current_binance_price}
+        if self.shadow: rnd["shadow"] = self.shadow.close_round()
+        return rnd
+
+    def _shadow_side(self, rnd, winner_id):
+        if winner_id and winner_id == rnd["bull_id"]: return "up"
+        if winner_id and winner_id == rnd["bear_id"]: return "down"
+        return None
+
+    async def _settle_simulation(self, rnd=None):
+        """Settles a finished round in place: provisional PnL now, then waits for the official result."""
+        rnd = rnd or self._round_snapshot()
+        self._settle_provisional(rnd)
+        await self._resolve_round(rnd)
+
+    def _round_traded(self, rnd):
+        """Whether a finished round holds anything to settle: open positions or shadow variants."""
+        if not rnd["bull_id"]: return False  # never loaded
+        return "shadow" in rnd or any(self.inventory.get(a, 0) > 0 for a in rnd["asset_ids"])
 
-        # Calculate PnL
+    def _start_settlement(self, rnd):
+        """Books the round provisionally and leaves resolution to a background job (several can be pending)."""
+        self._settle_provisional(rnd)
+        self._spawn_resolution(rnd)
+
+    def _spawn_resolution(self, rnd):
+        task = asyncio.create_task(self._resolve_round(rnd))
+        self.settlements.add(task)
+        task.add_done_callback(self.settlements.discard)
+
+    def _settle_provisional(self, rnd):
+        """Pays out the round at Binance close vs strike right away, so the capital is free for the next round."""
+        logger.info(f"🏁 Settling Simulation... ({rnd['slug']})")
+        final_price, strike = rnd["final_price"], rnd["strike"]
+        if rnd.get("recovered"):
+            winner_id = None
+            logger.info("❔ Round ended while the bot was down: positions held at $0 until the official result")
+        elif final_price > strike:
+            winner_id = rnd["bull_id"]
+            logger.info(f"✅ Winner (Price): UP (${final_price:.2f} > ${strike:.2f})")
+        else:
+            winner_id = rnd["bear_id"]
+            logger.info(f"✅ Winner (Price): DOWN (${final_price:.2f} <= ${strike:.2f})")
+
+        # This round's tokens only; the next round may already hold inventory
+        positions = {}
         game_pnl = 0.0
-        if self.inventory:
-            for asset_id, size in list(self.inventory.items()):
-                if size <= 0: continue
-                final_price = 1.0 if asset_id == winner_id else 0.0
-                revenue = size * final_price
-                cost = self.inventory_cost[asset_id]
-                asset_pnl = revenue - cost
-                game_pnl += asset_pnl
-                
-                await self._report_sim_trade(asset_id, "SETTLEMENT", final_price, size, pnl=asset_pnl)
-                self.balance += revenue
-                self.inventory[asset_id] = 0
-                self.inventory_cost[asset_id] = 0
+        for asset_id in rnd["asset_ids"]:
+            size = self.inventory.get(asset_id, 0)
+            if size <= 0: continue
+            cost = self.inventory_cost[asset_id]
+            positions[asset_id] = (size, cost)
+            revenue = size * (1.0 if asset_id == winner_id else 0.0)
+            game_pnl += revenue - cost
+            self.balance += revenue
+            self.inventory[asset_id] = 0
+            self.inventory_cost[asset_id] = 0
+            if self.journal:
+                self.journal.delta(SETTLE, self.clock.time(), asset_id, revenue, -size, -cost, revenue - cost)
 
         self.realized_pnl += game_pnl
+        rnd.update(winner_id=winner_id, positions=positions, pnl=game_pnl)
+        if self.journal: self.journal.pending({k: v for k, v in rnd.items() if k != "shadow"})
         total_pnl = self.balance - self.initial_capital
-        logger.info(f"🏆 GAME OVER | Winner: {self.asset_map.get(winner_id, 'Unknown')} | Game PnL: ${game_pnl:.2f} | Total: ${total_pnl:+.2f}")
+        logger.info(f"🏆 GAME OVER (provisional) | Winner: {rnd['asset_map'].get(winner_id, 'Unknown')} | Game PnL: ${game_pnl:.2f} | Total: ${total_pnl:+.2f}")
+        if self.shadow and "shadow" in rnd:
+            self.shadow.settle(rnd["shadow"], self._shadow_side(rnd, winner_id))
+            self.shadow.log_summary()
 
-    async def rollover(self):
-        logger.info("🔄 Rolling over...")
+    async def _resolve_round(self, rnd):
+        """Polls the round's resolution fields until official (or SETTLE_TIMEOUT_SECONDS), then reconciles and reports."""
+        official = None
+        done = False
+        deadline = self.clock.time() + self.settle_timeout
+        try:
+            while True:
+                official = await self._fetch_resolution(rnd["slug"])
+                if official or self.clock.time() >= deadline: break
+                await self.clock.sleep(self.settle_poll)
+            done = True
+        finally:
+            # With a journal, an interrupted job stays pending and resumes on restart
+            if done or not self.journal: self._finalize_round(rnd, official)
+        if self.reporter: await self.reporter.flush()
+
+    async def _fetch_resolution(self, slug):
+        """(winner_id, outcomePrices) once Gamma has resolved the market, else None. Reads only those fields."""
+        try:
+            status, data = await self.http.get_json(f"{self.gamma_api}/markets", "gamma", params={"slug": slug})
+            if status != 200 or not data: return None
+            return self._resolution_from(data[0] if isinstance(data, list) else data)
+        except Exception as e:
+            logger.warning(f"⚠️ Resolution check failed for {slug}: {e}")
+            return None
+
+    def _resolution_from(self, market):
+        if not market: return None
+        clob_ids, prices = market.get("clobTokenIds") or "[]", market.get("outcomePrices") or "[]"
+        if isinstance(clob_ids, str): clob_ids = json.loads(clob_ids)
+        if isinstance(prices, str): prices = json.loads(prices)
+        for idx, p in enumerate(prices):
+            if float(p) > 0.95 and idx < len(clob_ids): return clob_ids[idx], prices
+        return None
+
+    def _finalize_round(self, rnd, official):
+        slug, winner_id = rnd["slug"], rnd["winner_id"]
+        if official:
+            official_id, prices = official
+            if self.recorder: self.recorder.update_meta(slug=slug, outcome_prices=prices)
+            if official_id != winner_id:
+                # The provisional call was wrong: move the payout to the official winner
+                delta = sum(size * ((a == official_id) - (a == winner_id)) for a, (size, _) in rnd["positions"].items())
+                self.balance += delta
+                self.realized_pnl += delta
+                rnd["pnl"] += delta
+                if self.journal: self.journal.delta(ADJUST, self.clock.time(), None, delta, d_realized=delta)
+                if self.shadow and "shadow" in rnd: self.shadow.reconcile(rnd["shadow"], self._shadow_side(rnd, official_id))
+                winner_id = official_id
+                logger.warning(f"♻️ RECONCILED {slug}: official winner {rnd['asset_map'].get(winner_id, 'Unknown')} | "
+                               f"PnL adjustment ${delta:+.2f} | Game PnL: ${rnd['pnl']:.2f}")
+            else:
+                logger.info(f"✅ Resolved {slug}: provisional result confirmed")
+        else:
+            logger.warning(f"⌛ {slug} not resolved in time; provisional result stands")
+
+        for asset_id, (size, cost) in rnd["positions"].items():
+            price = 1.0 if asset_id == winner_id else 0.0
+            self._report_sim_trade(asset_id, "SETTLEMENT", price, size, pnl=size * price - cost,
+                                   label=rnd["asset_map"].get(asset_id))
+        if self.journal: self.journal.resolved(self.clock.time(), slug)
+
+    def _reset_round(self):
+        for tid in self.asset_ids: self.books.pop(tid, None)  # the next round's books may already be live
         self.asset_ids = []; self.asset_map.clear(); self.state = "SEARCHING"
         self.bull_id = None; self.bear_id = None
         self.strike_price = 0.0; self.cumulative_cost = 0.0
         self.stop_triggered = False; self.open_sim_orders.clear()
+
+    def _round_key(self, slug):
+        """(market prefix, start timestamp) of a rolling round slug, or None."""
+        if not slug: return None
+        prefix, _, ts = slug.split('?')[0].rpartition("-")
+        return (prefix, int(ts)) if ts.isdigit() else None
+
+    def _next_slug(self):
+        """Slug of the round after the current one (None if the slug has no timestamp)."""
+        if not self.slug: return None
+        clean = self.slug.split('?')[0].split("-")
+        if not clean[-1].isdigit(): return None
+        ts = int(clean[-1])
+        now = self.clock.time()
+        next_ts = ts + 900 if (now - ts) <= 1800 else (int(now) // 900) * 900
+        return f"{'-'.join(clean[:-1])}-{next_ts}"
+
+    async def _prefetch_next_round(self):
+        """
+        Ahead of market_end: finds the next round on Gamma, warms its books and
+        subscribes its assets on the live market connection. Returns (slug, parsed)
+        for _switch_round, or None if the round did not show up in time.
+        """
+        try:
+            await self.clock.sleep(max(0.0, self.market_end - self.prefetch_lead - self.clock.time()))
+            slug = self._next_slug()
+            if not slug: return None
+            deadline = self.market_end + 120
+            while True:
+                market = await self._fetch_gamma_market(slug)
+                if market:
+                    parsed = self._parse_market(market)
+                    if parsed["bull_id"] and parsed["bear_id"]: break
+                if self.clock.time() > deadline: return None
+                await self.clock.sleep(5)
+            await self._warmup_prices(parsed["asset_ids"])
+            self._subscribe_assets(parsed["asset_ids"])
+            logger.info(f"⏭️ Next round ready: {slug}")
+            return slug, parsed
+        except asyncio.CancelledError: raise
+        except Exception as e:
+            logger.error(f"Prefetch error: {e}")
+            return None
+
+    def _switch_round(self, slug, parsed):
+        """Makes the prefetched round live. Synchronous, so no tick sees a half-switched state."""
+        old_ids = self.asset_ids
+        self._reset_round()
+        self._unsubscribe_assets(old_ids)
+        self.slug = slug
+        self._apply_market(parsed)
+        if self.recorder:
+            now = self.clock.time()
+            for tid in self.asset_ids:
+                book = self.books.get(tid)
+                if book: self.recorder.book(now, 0.0, book)
+        # The stream sets the strike on the round's first trade (see _on_bars_closed)
+        if not self._strike_from_candles():
+            self.strike_task = asyncio.create_task(self._await_strike())
+        self._update_volatility_threshold()
+
+    async def _await_strike(self, grace=5.0):
+        """REST fallback if the stream has not produced the round's 15m OPEN shortly after the start."""
+        await self.clock.sleep(max(0.0, self.market_start + grace - self.clock.time()))
+        if not self.strike_price: await self._fetch_strike_price()
+
+    async def rollover(self):
+        """
+        Slow path when prefetching failed: polls Gamma for the next round, backing off,
+        until it loads. Keeps the previous slug while the lookup fails. Returns False
+        if the bot stopped meanwhile.
+        """
+        logger.info("🔄 Rolling over...")
+        old_ids = self.asset_ids
+        self._reset_round()
+        self._unsubscribe_assets(old_ids)
+        
+        backoff = Backoff(base=5.0, cap=60.0)
+        while self.running:
+            delay = backoff.next()
+            if delay:
+                logger.warning(f"⚠️ Next round not found; retrying in {delay:.0f}s")
+                await self.clock.sleep(delay)
+            prev_slug, next_slug = self.slug, self._next_slug()
+            if not next_slug: self.running = False; return False
+            self.slug = next_slug
+            logger.info(f"🔍 Searching: {self.slug}")
+            try:
+                if await self.fetch_market():
+                    self._subscribe_assets(self.asset_ids)
+                    return True
+            except Exception as e:
+                logger.error(f"Rollover error: {e}")
+            self.slug = prev_slug
+        return False
+
+    async def _startup(self):
+        """
+        Cold start as a dependency graph rather than a sequence. The Binance stream and the
+        candle backfill need only the symbol, so they start at once; the market channel, book
+        warmup and strike need the Gamma market and run together once it arrives. Every step
+        has a deadline; only a missing market aborts the start.
+        """
+        self._start_binance_feed()
+        self._on_binance_connect()  # backfill while the socket connects
+        candles = self.backfill_task
+        market = await self._startup_step("market", self._fetch_gamma_market(self.slug))
+        if not market:
+            logger.error(f"❌ No market for {self.slug}; not starting")
+            return False
+        try:
+            self._apply_market(self._parse_market(market))
+        except Exception as e:
+            logger.error(f"Error fetching market: {e}")
+            return False
         
+        self._start_market_channel()
+        steps = [self._startup_step("books", self._warmup_prices()),
+                 self._startup_step("strike", self._fetch_strike_price())]
+        # A late backfill keeps running; volatility primes itself when it lands
+        if candles: steps.append(self._startup_step("candles", asyncio.shield(candles)))
+        await asyncio.gather(*steps)
+        if not self.strike_price: self.strike_task = asyncio.create_task(self._await_strike())
+        self._update_volatility_threshold()
+        return True
+
+    async def _startup_step(self, name, aw):
+        start = perf_counter()
         try:
-            if not self.slug: self.running = False; return
-            clean = self.slug.split('?')[0].split("-")
-            if not clean[-1].isdigit(): self.running = False; return
-            
-            ts = int(clean[-1])
-            now = time.time()
-            next_ts = ts + 900 if (now - ts) <= 1800 else (int(now) // 900) * 900
-            
-            base = "-".join(clean[:-1])
-            for i in range(12):
-                self.slug = f"{base}-{next_ts}"
-                logger.info(f"🔍 Searching: {self.slug}")
-                if await self.fetch_market(): break
-                await asyncio.sleep(10)
-        except: self.running = False
+            return await asyncio.wait_for(aw, self.startup_deadlines[name])
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ Startup step '{name}' missed its {self.startup_deadlines[name]:g}s deadline; continuing")
+        finally:
+            self.startup_timings[name] = perf_counter() - start
+
+    def _log_startup(self):
+        """Time-to-first-decision: the first strategy pass with market, strike and both books in place."""
+        self.awaiting_first_decision = False
+        now = perf_counter()
+        ttfd = now - self.run_started
+        steps = " | ".join(f"{name} {t * 1000:.0f}ms" for name, t in self.startup_timings.items())
+        logger.info(f"⚡ First decision {ttfd * 1000:.0f}ms after start ({(now - IMPORT_STARTED) * 1000:.0f}ms "
+                    f"since import, imports {IMPORT_SECONDS * 1000:.0f}ms) | {steps}")
+        if self.metrics:
+            self.metrics.histogram("startup_seconds", step="imports").record(IMPORT_SECONDS)
+            self.metrics.histogram("startup_seconds", step="first_decision").record(ttfd)
+            for name, t in self.startup_timings.items(): self.metrics.histogram("startup_seconds", step=name).record(t)
 
     async def run(self):
+        self.run_started = perf_counter()
         logger.info(f"🚀 VOLATILITY HUNTER STARTED | Target: {self.slug}")
-        if not await self.fetch_market(): return
-        
-        while self.running:
-            self.ws_tasks = [
-                asyncio.create_task(self.market_ws_handler()),
-                asyncio.create_task(self.binance_ws_handler())
-            ]
-            
-            wait = self.market_end - time.time()
-            if wait > 0:
-                try: await asyncio.sleep(wait)
-                except: pass
-            
-            for t in self.ws_tasks: t.cancel()
-            self.ws_tasks = []
+        if self.reporter: self.reporter.start()
+        if self.conflate: self.decision_task = asyncio.create_task(self._decision_loop())
+        if self.metrics and self.owns_metrics: await self.metrics.start()
+        try:
+            if not await self._startup(): return
+            self._recover_rounds()
+            self.awaiting_first_decision = True
             
-            await self._settle_simulation()
-            await self.rollover()
+            while self.running:
+                self.prefetch_task = asyncio.create_task(self._prefetch_next_round())
+                
+                wait = self.market_end - self.clock.time()
+                if wait > 0:
+                    try: await self.clock.sleep(wait)
+                    except Exception: pass
+                
+                self.state = "SETTLING"
+                finished = self._round_snapshot()
+                nxt = await self.prefetch_task
+                self.prefetch_task = None
+                if nxt: self._switch_round(*nxt)
+                if self._round_traded(finished): self._start_settlement(finished)
+                if not nxt and not await self.rollover(): break
+                self.http.log_stats()
+                self._log_tick_stats()
+        finally:
+            await self.shutdown()
+
+    def _start_binance_feed(self):
+        """Connections live for the whole run; rounds only change market channel subscriptions."""
+        if self.feeds:
+            self.feeds.binance.subscribe(self.binance_symbol, self._on_binance_trade, self._on_binance_connect,
+                                         self.binance_stream)
+        else:
+            self.ws_tasks.append(asyncio.create_task(self.binance_ws_handler()))
+
+    def _start_market_channel(self):
+        if self.feeds: self.feeds.poly.connect_hooks.append(self._on_market_connect)
+        else: self.ws_tasks.append(asyncio.create_task(self.market_ws_handler()))
+        self._subscribe_assets(self.asset_ids)
+
+    def _stop_market_feeds(self):
+        self._unsubscribe_assets(list(self.market_subs))
+        if self.feeds:
+            self.feeds.binance.unsubscribe(self.binance_symbol, self._on_binance_trade, self._on_binance_connect,
+                                           self.binance_stream)
+            if self._on_market_connect in self.feeds.poly.connect_hooks:
+                self.feeds.poly.connect_hooks.remove(self._on_market_connect)
+        if self.resync_task: self.resync_task.cancel()
+        for t in self.ws_tasks: t.cancel()
+        self.ws_tasks = []
+
+    async def shutdown(self):
+        self._stop_market_feeds()
+        for t in (self.prefetch_task, self.strike_task, self.decision_task):
+            if t: t.cancel()
+        if self.settlements:
+            # Unresolved rounds keep their provisional result (and resume from the journal, if any)
+            logger.info(f"⌛ {len(self.settlements)} settlement(s) pending at shutdown")
+            for t in list(self.settlements): t.cancel()
+            await asyncio.gather(*self.settlements, return_exceptions=True)
+        if self.shadow:
+            self.shadow.log_summary(top=5)
+            if self.shadow_report: self.shadow.write_csv(self.shadow_report)
+        if self.metrics and self.owns_metrics:
+            logger.info(f"⏱️ {self.metrics.summary()}")
+            await self.metrics.close()
+        if self.reporter: await self.reporter.close()
+        if self.recorder: await asyncio.to_thread(self.recorder.close)
+        if self.journal: await asyncio.to_thread(self.journal.close)
+        if self.events and self.owns_events:
+            logger.removeHandler(self.dump_handler)
+            await asyncio.to_thread(self.events.close)
+        if self.owns_http:
+            self.http.log_stats()
+            await self.http.close()
 
 if __name__ == "__main__":
     bot = VolatilityBot()
@@ -0,0 +1,43 @@
+"""FOK limits and the depth walk (volbot.orderbook)."""
+
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import example
+from volbot.orderbook import OrderBook
+
+
+def _bot_with_book(asks, bids=()):
+    bot = example.VolatilityBot(config={"MARKET_SLUG": "btc-updown-15m-1700000000", "JOURNAL_DIR": "",
+                                        "EVENT_LOG": "", "SIMULATION_ID": ""})
+    book = bot.books["up"] = OrderBook("up")
+    book.apply_snapshot(list(bids), list(asks), 0, None)
+    return bot, book
+
+
+def test_limit_keeps_prices_exact_in_cents():
+    bot, _ = _bot_with_book([(0.5, 1.0)])
+    for price in (0.29, 0.57, 0.58):
+        assert bot._sanitize(price, 2) == price
+    assert bot._sanitize(0.589, 2) == 0.58
+
+
+def test_fok_buy_at_the_ask_fills():
+    bot, book = _bot_with_book([(0.58, 10.0), (0.59, 50.0)], [(0.57, 20.0)])
+    assert book.walk("BUY", 10.0, bot._sanitize(0.58, 2)) == (10.0, 0.58)
+
+    async def run():
+        bot.decision_at = 0
+        return await bot._place_order("up", 0.58, 10, example.BUY)
+    assert asyncio.run(run())
+    assert bot.inventory["up"] == 10.0
+
+
+def test_walk_stops_at_the_limit():
+    _, book = _bot_with_book([(0.58, 5.0), (0.59, 50.0)], [(0.57, 5.0), (0.56, 50.0)])
+    assert book.walk("BUY", 10.0, 0.58) == (5.0, 0.58)
+    filled, avg = book.walk("SELL", 10.0, 0.56)
+    assert filled == 10.0 and abs(avg - 0.565) < 1e-9
@@ -0,0 +1,57 @@
+"""
+Restart from a wallet journal written mid-round (JOURNAL_DIR).
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+import asyncio
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import example
+from volbot.clock import WallClock
+
+START = 1700000000
+OLD, LIVE = f"btc-updown-15m-{START}", f"btc-updown-15m-{START + 900}"
+
+
+def _parsed(bot, slug, up, down):
+    end = int(slug.rsplit("-", 1)[1]) + 900
+    end_iso = datetime.fromtimestamp(end, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return bot._parse_market({"conditionId": f"0x{slug}", "question": slug, "clobTokenIds": [up, down],
+                              "outcomes": '["Up", "Down"]', "endDate": end_iso})
+
+
+def _bot(journal_dir):
+    return example.VolatilityBot(clock=WallClock(), config={"MARKET_SLUG": OLD, "JOURNAL_DIR": journal_dir})
+
+
+def test_restart_mid_round_keeps_positions_and_risk_spend(tmp_path):
+    async def run():
+        # First run: started on MARKET_SLUG, rolled over once, bought in the live round, crashed
+        bot = _bot(str(tmp_path))
+        bot._apply_market(_parsed(bot, OLD, "old-up", "old-down"))
+        bot.slug = LIVE
+        bot._apply_market(_parsed(bot, LIVE, "up", "down"))
+        bot.decision_at = 0
+        await bot._execute_sim_fill("up", example.BUY, 0.5, 10)
+        await bot._execute_sim_fill("up", example.BUY, 0.6, 10)
+        balance, spend = bot.balance, bot.cumulative_cost
+        bot.journal.close()
+
+        # Restart with the same (now stale) MARKET_SLUG
+        bot = _bot(str(tmp_path))
+        assert bot.slug == LIVE
+        bot._apply_market(_parsed(bot, bot.slug, "up", "down"))
+        bot._recover_rounds()
+        assert bot.balance == balance
+        assert bot.inventory["up"] == 20
+        assert abs(bot.inventory_cost["up"] - 11.0) < 1e-9
+        assert abs(bot.cumulative_cost - spend) < 1e-9 and spend > 0
+        assert not bot.settlements  # the live round's positions are not orphans
+        bot.journal.close()
+
+    asyncio.run(run())
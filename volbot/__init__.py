@@ -0,0 +1,6 @@
+"""
+Support modules for the Volatility Hunter bot (example.py).
+
+Submodules are imported directly (e.g. ``from volbot.net import HttpClient``)
+so the bot only pays for what it uses.
+"""
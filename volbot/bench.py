@@ -0,0 +1,433 @@
+"""
+Benchmark suite for the bot's hot paths, with stored results and comparison.
+
+    python -m volbot.bench run [--out bench.json] [--seconds 0.5] [--only decode,update_prices] [--no-e2e]
+    python -m volbot.bench compare old.json new.json [--threshold 0.10]
+
+Microbenchmarks time one call of each hot path (best ns/op of several timed
+batches) on a bot primed with a live-looking market:
+
+    decode.<backend>.*          WebSocket message decoding (see volbot.bench_decode)
+    update_prices.*             book snapshots (20 / 100 levels a side) and price_change deltas
+    execute_strategy.*          no signal, and signal -> FOK walk -> simulated fill
+    execute_sim_fill.*          BUY and SELL wallet updates
+    on_binance_trade / on_market_message    whole per-message handlers
+
+The end-to-end benchmark streams Binance trades and Polymarket price_changes
+(3:1) from a generator process over loopback WebSockets into one bot through
+volbot.feeds, stepping the rate up until the bot stops keeping up: less than
+95% of sent messages handled, or p99 exchange->receive lag above --max-lag-ms.
+The generator shares the machine, so on few cores the figure is a lower bound;
+compare runs from the same host.
+
+compare prints every benchmark side by side and exits 1 if any got slower (or
+the sustained rate lower) by more than the threshold. The new times are scaled
+by a fixed calibration workload timed in each run, so results from a faster or
+slower host still compare (the raw times are printed alongside); run on a
+quiet machine, since noise within a run is not corrected.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+
+from volbot.decode import DECODERS
+from volbot.bench_decode import BINANCE_TRADE, BOOK, PRICE_CHANGE, _baseline_trade, _baseline_market
+
+UP, DOWN = "1" * 77, "2" * 77
+E2E_RATES = [1000, 2000, 5000, 10000, 20000, 40000, 80000]
+
+
+# --- Timing ---
+
+def _calibrate(run_n, seconds):
+    n = 1
+    while True:
+        elapsed = run_n(n)
+        if elapsed >= seconds / 10: return max(1, int(n * seconds / 5 / elapsed))
+        n *= 4
+
+
+def measure(fn, seconds=0.5, repeats=5):
+    """Best and median ns per call of fn() over `repeats` timed batches."""
+    def run_n(n):
+        start = time.perf_counter()
+        for _ in range(n): fn()
+        return time.perf_counter() - start
+    return _summarize(run_n, seconds, repeats)
+
+
+def measure_async(loop, coro_fn, seconds=0.5, repeats=5):
+    """Same for a coroutine function; the batch runs inside one task, so only the awaited work is timed."""
+    async def batch(n):
+        start = time.perf_counter()
+        for _ in range(n): await coro_fn()
+        return time.perf_counter() - start
+    return _summarize(lambda n: loop.run_until_complete(batch(n)), seconds, repeats)
+
+
+def _summarize(run_n, seconds, repeats):
+    n = _calibrate(run_n, seconds)
+    samples = [run_n(n) / n * 1e9 for _ in range(repeats)]
+    # The fastest batch is the least disturbed by the rest of the machine; compare uses it
+    return {"ns_per_op": round(min(samples), 1), "median": round(statistics.median(samples), 1), "n": n}
+
+
+def _calibration_work():
+    # Fixed interpreter-bound work: dict, float and call overhead like the hot paths
+    d = {}
+    for i in range(200): d[i] = d.get(i - 1, 0.0) * 0.5 + i
+    return d
+
+
+# --- Fixtures ---
+
+def _book_item(asset_id, levels):
+    return {"event_type": "book", "asset_id": asset_id, "timestamp": "1760000000123", "hash": "0x0",
+            "bids": [(round(0.50 - i / 1000, 3), 100.0 + 7 * i) for i in range(levels)],
+            "asks": [(round(0.51 + i / 1000, 3), 120.0 + 5 * i) for i in range(levels)]}
+
+
+def make_bot(feeds=None, metrics=None, **config):
+    """A VolatilityBot mid-round: both books, strike and a primed estimator, nothing opt-in enabled."""
+    from example import VolatilityBot
+    from volbot.orderbook import OrderBook
+    base = {"MARKET_SLUG": "btc-updown-15m-1760000000", "INITIAL_CAPITAL": "1e12", "MAX_RISK_PER_ROUND": "1e15",
+            "JOURNAL_DIR": "", "RECORD_DIR": "", "SIMULATION_ID": "", "SHADOW_GRID": "", "METRICS": "",
+            "METRICS_PORT": "", "CONFLATE_TICKS": "false", "BINANCE_STALE_SECONDS": "3600", "POLY_STALE_SECONDS": "3600"}
+    bot = VolatilityBot(config=dict(base, **config), feeds=feeds, metrics=metrics)
+    for health in (bot.binance_health, bot.poly_health): health.on_connect(bot.clock.time())  # liveness check stays timed
+    bot.asset_ids = [UP, DOWN]
+    bot.asset_map.update({UP: "Up", DOWN: "Down"})
+    bot.bull_id, bot.bear_id = UP, DOWN
+    bot.strike_price = 100000.0
+    bot.current_binance_price = 100000.5
+    for _ in range(20): bot.vol_estimator.update(100000.0, 100050.0, 99950.0, 100000.0)
+    bot._update_volatility_threshold()
+    bot.dynamic_threshold = 50.0  # fixed, so results compare across VOL_MODEL settings
+    bot.state = "SEARCHING"
+    for asset_id in (UP, DOWN):
+        item = _book_item(asset_id, 100)
+        book = bot.books[asset_id] = OrderBook(asset_id)
+        book.apply_snapshot(item["bids"], item["asks"], item["timestamp"], item["hash"])
+    return bot
+
+
+# --- Microbenchmarks ---
+
+def bench_decode(seconds):
+    out = {
+        "decode.baseline.binance_trade": measure(lambda: _baseline_trade(BINANCE_TRADE), seconds),
+        "decode.baseline.book": measure(lambda: _baseline_market(BOOK), seconds),
+        "decode.baseline.price_change": measure(lambda: _baseline_market(PRICE_CHANGE), seconds),
+    }
+    for name, cls in DECODERS.items():
+        d = cls()
+        out[f"decode.{name}.binance_trade"] = measure(lambda: d.binance_trade(BINANCE_TRADE), seconds)
+        out[f"decode.{name}.book"] = measure(lambda: d.market(BOOK), seconds)
+        out[f"decode.{name}.price_change"] = measure(lambda: d.market(PRICE_CHANGE), seconds)
+    return out
+
+
+def bench_update_prices(seconds):
+    loop = asyncio.new_event_loop()
+    bot = make_bot()
+    book20, book100 = _book_item(UP, 20), _book_item(UP, 100)
+    change = {"event_type": "price_change", "timestamp": "1760000000123",
+              "changes": [(UP, "SELL", 0.52, 250.5), (DOWN, "BUY", 0.48, 0.0)]}
+    try:
+        return {
+            "update_prices.book_20": measure_async(loop, lambda: bot._update_prices(book20), seconds),
+            "update_prices.book_100": measure_async(loop, lambda: bot._update_prices(book100), seconds),
+            "update_prices.price_change_2": measure_async(loop, lambda: bot._update_prices(change), seconds),
+        }
+    finally:
+        loop.close()
+
+
+def bench_strategy(seconds):
+    loop = asyncio.new_event_loop()
+    bot = make_bot()
+    quiet = measure_async(loop, bot.execute_strategy, seconds)
+
+    async def signal():
+        bot.cooldown_until = 0.0  # let every call trade
+        await bot.execute_strategy()
+    bot.current_binance_price = bot.strike_price + 100
+    try:
+        filled = measure_async(loop, signal, seconds)
+        # Guard against timing an early return: the signal case must really trade
+        if not bot.inventory[UP]: raise RuntimeError("execute_strategy.signal_fill did not fill")
+        return {"execute_strategy.no_signal": quiet, "execute_strategy.signal_fill": filled}
+    finally:
+        loop.close()
+
+
+def bench_sim_fill(seconds):
+    loop = asyncio.new_event_loop()
+    bot = make_bot()
+    bot.inventory[DOWN] = 1e12
+    bot.inventory_cost[DOWN] = 5e11
+    try:
+        return {
+            "execute_sim_fill.buy": measure_async(loop, lambda: bot._execute_sim_fill(UP, "BUY", 0.51, 10.0), seconds),
+            "execute_sim_fill.sell": measure_async(loop, lambda: bot._execute_sim_fill(DOWN, "SELL", 0.49, 10.0), seconds),
+        }
+    finally:
+        loop.close()
+
+
+def bench_handlers(seconds):
+    loop = asyncio.new_event_loop()
+    bot = make_bot()
+    ts = [1760000000.0]
+
+    async def trade():
+        ts[0] += 0.001
+        await bot._on_binance_trade(100000.5, 0.001, ts[0], ts[0] + 0.002)
+    change = {"event_type": "price_change", "timestamp": "1760000000123",
+              "changes": [(UP, "SELL", 0.52, 250.5), (DOWN, "BUY", 0.48, 130.0)]}
+    try:
+        return {
+            "on_binance_trade": measure_async(loop, trade, seconds),
+            "on_market_message.price_change": measure_async(loop, lambda: bot._on_market_message(change, ts[0]), seconds),
+        }
+    finally:
+        loop.close()
+
+
+MICRO = {"decode": bench_decode, "update_prices": bench_update_prices, "execute_strategy": bench_strategy,
+         "execute_sim_fill": bench_sim_fill, "handlers": bench_handlers}
+
+
+# --- End-to-end ---
+
+async def _serve(port, rate, duration):
+    """Generator process: streams at `rate` msgs/s to whoever connects, then reports what it sent."""
+    import websockets
+    sent = {"binance": 0, "poly": 0}
+    done = asyncio.Event()
+    ready = asyncio.Event()
+    conns = {}
+
+    async def handler(ws):
+        kind = "poly" if ws.request.path.endswith("/market") else "binance"
+        conns[kind] = ws
+        if len(conns) == 2: ready.set()
+        await done.wait()
+
+    async def stream():
+        await ready.wait()
+        b_ws, p_ws = conns["binance"], conns["poly"]
+        start = time.time()
+        i = 0
+        while True:
+            now = time.time()
+            if now - start >= duration: break
+            target = int((now - start) * rate)
+            ms = int(now * 1000)
+            while i < target:
+                i += 1
+                if i % 4:
+                    price = 100000.0 + (i % 200) / 10
+                    await b_ws.send(f'{{"stream":"btcusdt@trade","data":{{"e":"trade","E":{ms},"s":"BTCUSDT",'
+                                    f'"t":{i},"p":"{price:.2f}","q":"0.00100000","T":{ms},"m":{"true" if i & 1 else "false"}}}}}')
+                    sent["binance"] += 1
+                else:
+                    p = 0.40 + (i % 20) / 100
+                    await p_ws.send(f'{{"event_type":"price_change","market":"0x0","timestamp":"{ms}","price_changes":['
+                                    f'{{"asset_id":"{UP}","price":"{p:.2f}","size":"{100 + i % 50}","side":"SELL"}},'
+                                    f'{{"asset_id":"{DOWN}","price":"{1 - p:.2f}","size":"{80 + i % 30}","side":"BUY"}}]}}')
+                    sent["poly"] += 1
+            await asyncio.sleep(0.0005)
+        print(json.dumps(sent), flush=True)
+        await done.wait()  # keep the connections open until the parent kills us
+
+    async with websockets.serve(handler, "127.0.0.1", port):
+        print("ready", flush=True)
+        await stream()
+
+
+async def _e2e_step(rate, duration, max_lag):
+    from volbot.feeds import MarketFeeds
+    from volbot.metrics import Metrics
+
+    port = _free_port()
+    proc = await asyncio.create_subprocess_exec(sys.executable, "-m", "volbot.bench", "serve", str(port), str(rate),
+                                                str(duration), stdout=subprocess.PIPE)
+    await proc.stdout.readline()  # "ready"
+    metrics = Metrics(summary_interval=0)
+    host = f"ws://127.0.0.1:{port}"
+    feeds = MarketFeeds(metrics=metrics, binance_host=host, poly_host=host)
+    bot = make_bot(feeds, metrics)
+    bot.dynamic_threshold = 1e9  # evaluate every tick, never trade
+    bot._on_binance_connect = lambda: None  # no REST candle backfill
+    try:
+        bot._start_binance_feed()
+        bot._start_market_channel()
+        feeds.start()
+        sent = json.loads(await asyncio.wait_for(proc.stdout.readline(), duration + 30))
+        await asyncio.sleep(0.5)  # drain what is in flight
+    finally:
+        await feeds.close()
+        await bot.http.close()
+        if proc.returncode is None: proc.kill()
+        await proc.wait()
+
+    metrics.fold()
+    handled = {f: metrics.counter("messages_total", feed=f).value for f in ("binance", "polymarket")}
+    lag = metrics.histogram("exchange_to_receive_seconds", feed="binance")
+    total_sent = sent["binance"] + sent["poly"]
+    total_handled = handled["binance"] + handled["polymarket"]
+    step = {"rate": rate, "sent_per_s": round(total_sent / duration), "handled_per_s": round(total_handled / duration),
+            "lag_p50_ms": round(lag.percentile(0.5) * 1000, 2), "lag_p99_ms": round(lag.percentile(0.99) * 1000, 2)}
+    step["generator_limited"] = total_sent < 0.95 * rate * duration
+    step["sustained"] = total_handled >= 0.95 * total_sent and step["lag_p99_ms"] <= max_lag
+    return step
+
+
+async def bench_e2e(duration=3.0, max_lag=10.0, rates=E2E_RATES, refine=2):
+    """Steps through `rates`, then bisects `refine` times between the last sustained and the first failed rate."""
+    steps, best = [], 0
+
+    async def attempt(rate):
+        step = await _e2e_step(rate, duration, max_lag)
+        steps.append(step)
+        print(f"  e2e {rate:>7,}/s: handled {step['handled_per_s']:>7,}/s | lag p50 {step['lag_p50_ms']}ms "
+              f"p99 {step['lag_p99_ms']}ms" + (" | generator-limited" if step["generator_limited"] else ""), flush=True)
+        return step["sustained"] and not step["generator_limited"], step
+
+    lo, hi = 0, None
+    for rate in rates:
+        ok, step = await attempt(rate)
+        if not ok:
+            hi = rate; break
+        lo, best = rate, step["handled_per_s"]
+    for _ in range(refine if hi else 0):
+        mid = (lo + hi) // 2
+        ok, step = await attempt(mid)
+        if ok: lo, best = mid, step["handled_per_s"]
+        else: hi = mid
+    return {"max_sustained_rate": best, "max_lag_ms": max_lag, "steps": steps}
+
+
+def _free_port():
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# --- Results ---
+
+def _meta():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        rev = ""
+    from volbot.decode import get_decoder
+    return {"git": rev, "python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "decoder": get_decoder().name, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def run(args):
+    logging.getLogger("VolatilityHunterSim").setLevel(logging.WARNING)
+    only = set(args.only.split(",")) if args.only else set(MICRO) | {"e2e"}
+    meta = _meta()
+    results = {"meta": meta, "micro": {}, "e2e": None}
+    calibration = [measure(_calibration_work, args.seconds)["ns_per_op"]]
+    for group, fn in MICRO.items():
+        if group not in only: continue
+        for name, r in fn(args.seconds).items():
+            results["micro"][name] = r
+            print(f"{name:<40} {_fmt_ns(r['ns_per_op']):>10}", flush=True)
+    calibration.append(measure(_calibration_work, args.seconds)["ns_per_op"])
+    meta["calibration_ns"] = min(calibration)
+    if "e2e" in only and not args.no_e2e:
+        results["e2e"] = asyncio.run(bench_e2e(args.e2e_seconds, args.max_lag_ms))
+        print(f"{'e2e.max_sustained_rate':<40} {results['e2e']['max_sustained_rate']:>8,}/s")
+
+    out = args.out or f"bench-{meta['git'] or int(time.time())}.json"
+    with open(out, "w") as f: json.dump(results, f, indent=2)
+    print(f"Saved {out}")
+    return 0
+
+
+def compare(args):
+    with open(args.old) as f: old = json.load(f)
+    with open(args.new) as f: new = json.load(f)
+    print(f"old: {old['meta'].get('git') or args.old} ({old['meta']['time']})  "
+          f"new: {new['meta'].get('git') or args.new} ({new['meta']['time']})")
+    regressions = 0
+    # Scale by the fixed calibration workload so a slower (or busier) host does not read as a regression
+    scale = 1.0
+    if args.normalize and old["meta"].get("calibration_ns") and new["meta"].get("calibration_ns"):
+        scale = old["meta"]["calibration_ns"] / new["meta"]["calibration_ns"]
+        print(f"Normalized by host speed: new host takes {1 / scale - 1:+.1%} on the calibration workload; "
+              f"'new' is scaled to the old host, 'new raw' as measured")
+    print(f"{'benchmark':<40} {'old':>10} {'new':>10} {'change':>8} {'new raw':>10}")
+    for name in sorted(set(old["micro"]) | set(new["micro"])):
+        a, b = old["micro"].get(name), new["micro"].get(name)
+        if not a or not b:
+            print(f"{name:<40} {_fmt_ns(a['ns_per_op']) if a else '-':>10} "
+                  f"{_fmt_ns(b['ns_per_op'] * scale) if b else '-':>10} {'':>8} {_fmt_ns(b['ns_per_op']) if b else '-':>10}")
+            continue
+        scaled = b["ns_per_op"] * scale
+        change = scaled / a["ns_per_op"] - 1
+        bad = change > args.threshold
+        regressions += bad
+        print(f"{name:<40} {_fmt_ns(a['ns_per_op']):>10} {_fmt_ns(scaled):>10} {change:>+8.1%} {_fmt_ns(b['ns_per_op']):>10}"
+              + ("  REGRESSION" if bad else ""))
+    if old.get("e2e") and new.get("e2e"):
+        a, b = old["e2e"]["max_sustained_rate"], new["e2e"]["max_sustained_rate"]
+        change = b / a - 1 if a else 0.0
+        bad = change < -args.threshold
+        regressions += bad
+        print(f"{'e2e.max_sustained_rate (msgs/s)':<40} {a:>10,} {b:>10,} {change:>+8.1%}" + ("  REGRESSION" if bad else ""))
+    if old["meta"].get("cpus") != new["meta"].get("cpus") or old["meta"].get("decoder") != new["meta"].get("decoder"):
+        print("Note: runs differ in CPU count or decoder; numbers are not directly comparable")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def _fmt_ns(ns):
+    if ns >= 1e6: return f"{ns / 1e6:.2f}ms"
+    if ns >= 1e3: return f"{ns / 1e3:.2f}µs"
+    return f"{ns:.0f}ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot path and end-to-end benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("run", help="Run the suite and save JSON")
+    p.add_argument("--out", help="Result file (default bench-<git rev>.json)")
+    p.add_argument("--seconds", type=float, default=0.5, help="Time per microbenchmark")
+    p.add_argument("--only", help=f"Comma-separated groups: {', '.join(MICRO)}, e2e")
+    p.add_argument("--no-e2e", action="store_true", help="Skip the end-to-end benchmark")
+    p.add_argument("--e2e-seconds", type=float, default=3.0, help="Duration of each end-to-end rate step")
+    p.add_argument("--max-lag-ms", type=float, default=10.0, help="p99 exchange->receive lag that counts as degraded")
+    c = sub.add_parser("compare", help="Compare two result files")
+    c.add_argument("old")
+    c.add_argument("new")
+    c.add_argument("--threshold", type=float, default=0.10, help="Relative change that counts as a regression")
+    c.add_argument("--no-normalize", dest="normalize", action="store_false",
+                   help="Compare raw times instead of scaling by the calibration workload")
+    s = sub.add_parser("serve")  # end-to-end generator process
+    s.add_argument("port", type=int)
+    s.add_argument("rate", type=int)
+    s.add_argument("duration", type=float)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve": return asyncio.run(_serve(args.port, args.rate, args.duration))
+    return run(args) if args.cmd == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark for the WebSocket decoders (see volbot.decode).
+
+Measures messages/sec for the old path (json.loads into dicts, then float()
+on the string fields where they are used) against every installed decoder
+backend, on representative Binance trade and Polymarket market messages.
+
+    python -m volbot.bench_decode [--seconds 1.0]
+
+The same cases run as the decode group of the stored suite (volbot.bench).
+"""
+
+import sys
+import json
+import time
+import argparse
+
+from volbot.decode import DECODERS
+
+BINANCE_TRADE = json.dumps({
+    "e": "trade", "E": 1760000000123, "s": "BTCUSDT", "t": 5123456789, "p": "112345.67000000",
+    "q": "0.00150000", "T": 1760000000120, "m": True, "M": True,
+}).encode()
+
+BOOK = json.dumps([{
+    "event_type": "book", "asset_id": "1" * 77, "market": "0x" + "ab" * 32, "timestamp": "1760000000123",
+    "hash": "0x" + "cd" * 20,
+    "bids": [{"price": f"{0.50 - i / 100:.2f}", "size": f"{100 + 7 * i:.2f}"} for i in range(20)],
+    "asks": [{"price": f"{0.51 + i / 100:.2f}", "size": f"{120 + 5 * i:.2f}"} for i in range(20)],
+}]).encode()
+
+PRICE_CHANGE = json.dumps({
+    "event_type": "price_change", "market": "0x" + "ab" * 32, "timestamp": "1760000000123",
+    "price_changes": [
+        {"asset_id": "1" * 77, "price": "0.52", "size": "250.5", "side": "SELL", "hash": "0x" + "ef" * 20,
+         "best_bid": "0.50", "best_ask": "0.51"},
+        {"asset_id": "2" * 77, "price": "0.48", "size": "0", "side": "BUY", "hash": "0x" + "01" * 20,
+         "best_bid": "0.47", "best_ask": "0.49"},
+    ],
+}).encode()
+
+
+# --- Old path: what the handlers did before volbot.decode ---
+
+def _baseline_trade(raw):
+    data = json.loads(raw)
+    return float(data["p"]), float(data.get("q", 0)), data.get("T", 0) / 1000, -1 if data.get("m") else 1
+
+
+def _baseline_market(raw):
+    data = json.loads(raw)
+    out = []
+    for item in (data if isinstance(data, list) else [data]):
+        if item.get("event_type") == "price_change":
+            out.extend((c["asset_id"], c["side"], float(c["price"]), float(c["size"])) for c in item["price_changes"])
+        else:
+            out.append(([(float(l["price"]), float(l["size"])) for l in item["bids"]],
+                        [(float(l["price"]), float(l["size"])) for l in item["asks"]]))
+    return out
+
+
+def _rate(fn, raw, seconds):
+    n, batch = 0, 1000
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch): fn(raw)
+        n += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds: return n / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WebSocket decoder micro-benchmark")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time per case")
+    args = parser.parse_args(argv)
+
+    cases = [("binance trade", BINANCE_TRADE), ("book (20x2)", BOOK), ("price_change (2)", PRICE_CHANGE)]
+    rows = [("baseline", [_rate(_baseline_trade, BINANCE_TRADE, args.seconds),
+                          _rate(_baseline_market, BOOK, args.seconds),
+                          _rate(_baseline_market, PRICE_CHANGE, args.seconds)])]
+    for name, cls in DECODERS.items():
+        d = cls()
+        rows.append((name, [_rate(d.binance_trade, BINANCE_TRADE, args.seconds),
+                            _rate(d.market, BOOK, args.seconds),
+                            _rate(d.market, PRICE_CHANGE, args.seconds)]))
+
+    print("msgs/sec".ljust(10) + "".join(f"{c:>20}" for c, _ in cases))
+    base = rows[0][1]
+    for name, rates in rows:
+        print(name.ljust(10) + "".join(f"{r:>12,.0f} ({r / b:4.1f}x)" for r, b in zip(rates, base)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
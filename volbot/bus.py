@@ -0,0 +1,401 @@
+"""
+Shared-memory market data bus between the feed process and strategy workers (volbot.shard).
+
+The feed process owns the Binance and Polymarket connections (volbot.feeds),
+decodes every message once and publishes it as fixed-size binary records
+into a ring in shared memory. Workers map the same ring and read the records
+with struct.unpack_from: no JSON, no pickling, no copy through a pipe. There
+is one writer and any number of readers, each with its own cursor, and no
+locks: the writer never waits for a reader.
+
+Every 64-byte slot is a seqlock with the sequence stamped at both ends.
+The writer fills slot n % capacity front to back with one struct.pack_into
+(stamp n+1, record, stamp n+1) and then advances the header's head. A
+reader checks the end stamp (the record is complete), copies the fields,
+then checks the start stamp (no newer write has begun). A start stamp that
+changed while the reader copied, or a head already past a slot that does
+not hold its record, means the writer has lapped the reader. A lapped
+reader skips to the head, drops the rest of the book batch it lands in and
+treats the gap like a reconnect: the books resync and the candles backfill. The ordering relies on stores reaching
+memory in program order, which x86 guarantees.
+
+    header   u64 head (records published), u64 capacity
+    slot     u64 n+1 | u8 kind, i8 side | u64 key | f64 ts, exch_ts, price, size | u64 n+1
+
+Record kinds:
+
+    TRADE      key=stream ("btcusdt@trade"), price, size=qty, side=+1 buy / -1 sell
+    LEVEL      key=asset, price, size, side=+1 bid (BUY) / -1 ask (SELL)
+    BOOK       key=asset: the LEVELs since the last BOOK / CHANGES are its snapshot
+    CHANGES    the LEVELs since the last BOOK / CHANGES are one price_change batch
+    CONNECT    key=feed (0 Binance, 1 Polymarket) (re)connected
+    HEARTBEAT  key=feed, exch_ts=its newest message (receive time), size=1 if connected
+
+Keys are 64-bit hashes of the asset id / stream name, so both sides derive
+them without a shared table. exch_ts on book records is the exchange
+timestamp in milliseconds, as on the wire. Subscriptions travel the other
+way, over each worker's control pipe.
+"""
+
+import time
+import struct
+import asyncio
+import hashlib
+import logging
+from multiprocessing import shared_memory
+
+from volbot.clock import WallClock
+from volbot.liveness import FeedHealth
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+TRADE, LEVEL, BOOK, CHANGES, CONNECT, HEARTBEAT = 1, 2, 3, 4, 5, 6
+BINANCE, POLYMARKET = 0, 1
+HEARTBEAT_SECONDS = 0.5
+YIELD_EVERY = 256  # records a worker reads back to back before it lets other tasks run
+
+_HEADER = struct.Struct("<QQ")
+_SEQ = struct.Struct("<Q")
+_SLOT = struct.Struct("<QBb6xQddddQ")  # stamp, record, stamp
+_RECORD = struct.Struct("<Bb6xQdddd")
+HEADER_SIZE = 64
+SLOT_SIZE = 64
+
+
+def key_of(name):
+    """64-bit key of an asset id or stream name (the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little")
+
+
+class Ring:
+    """Single-writer broadcast ring of seqlocked records in a SharedMemory block."""
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.buf = shm.buf
+        self.next, self.capacity = _HEADER.unpack_from(self.buf, 0)  # next: writer only
+
+    @classmethod
+    def create(cls, capacity=65536):
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * SLOT_SIZE)
+        _HEADER.pack_into(shm.buf, 0, 0, capacity)
+        return cls(shm)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self, unlink=False):
+        self.buf = None
+        self.shm.close()
+        if unlink: self.shm.unlink()
+
+    # --- Writer (feed process) ---
+
+    def publish(self, kind, side, key, ts, exch_ts, price, size):
+        n = self.next
+        stamp = n + 1
+        _SLOT.pack_into(self.buf, HEADER_SIZE + (n % self.capacity) * SLOT_SIZE,
+                        stamp, kind, side, key, ts, exch_ts, price, size, stamp)
+        self.next = stamp
+        _SEQ.pack_into(self.buf, 0, stamp)
+
+    # --- Readers (workers) ---
+
+    def head(self):
+        return _SEQ.unpack_from(self.buf, 0)[0]
+
+    def read(self, n):
+        """
+        Record n as (kind, side, key, ts, exch_ts, price, size), or None if the slot does not
+        hold it (not yet published, or overwritten if head() is already past n).
+        """
+        buf = self.buf
+        off = HEADER_SIZE + (n % self.capacity) * SLOT_SIZE
+        if _SEQ.unpack_from(buf, off + SLOT_SIZE - 8)[0] != n + 1: return None
+        rec = _RECORD.unpack_from(buf, off + 8)
+        if _SEQ.unpack_from(buf, off)[0] != n + 1: return None
+        return rec
+
+
+class Publisher:
+    """
+    Feed process side: subscribes the shared MarketFeeds on behalf of the workers
+    (reference counted, so a stream two workers need is subscribed once) and
+    publishes every tick, book and connect into the ring.
+    """
+
+    def __init__(self, ring, feeds, clock=None):
+        self.ring = ring
+        self.feeds = feeds
+        self.clock = clock or WallClock()
+        self.keys = {}         # {asset_id / stream: key}
+        self.refs = {}         # {("binance", stream) / ("poly", asset_id): workers subscribed}
+        self.owned = {}        # {worker: {("binance", symbol, stream) / ("poly", asset_id)}}
+        self.trade_cbs = {}    # {stream: callback registered with the BinanceFeed}
+        self.task = None
+        feeds.binance.connect_hooks.append(lambda: self._connected(BINANCE))
+        feeds.poly.connect_hooks.append(lambda: self._connected(POLYMARKET))
+
+    def start(self):
+        if self.task is None: self.task = asyncio.create_task(self._heartbeat())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            try: await self.task
+            except asyncio.CancelledError: pass
+            self.task = None
+
+    def _key(self, name):
+        key = self.keys.get(name)
+        if key is None: key = self.keys[name] = key_of(name)
+        return key
+
+    # --- Control (worker requests) ---
+
+    def handle(self, worker, msg):
+        """Applies one control message from a worker: ("binance"|"poly", "subscribe"|"unsubscribe", ...)."""
+        feed, op, *args = msg
+        if feed == "binance":
+            symbol, stream = args
+            item = ("binance", symbol.lower(), stream)
+            if op == "subscribe": self._add(worker, item)
+            else: self._remove(worker, item)
+        elif feed == "poly":
+            for asset_id in args[0]:
+                if op == "subscribe": self._add(worker, ("poly", asset_id))
+                else: self._remove(worker, ("poly", asset_id))
+
+    def drop(self, worker):
+        """Releases everything a worker that went away had subscribed."""
+        for item in list(self.owned.get(worker, ())): self._remove(worker, item)
+        self.owned.pop(worker, None)
+
+    def _add(self, worker, item):
+        owned = self.owned.setdefault(worker, set())
+        if item in owned: return
+        owned.add(item)
+        ref = item[:2] if item[0] == "poly" else ("binance", f"{item[1]}@{item[2]}")
+        self.refs[ref] = self.refs.get(ref, 0) + 1
+        if self.refs[ref] > 1: return
+        if item[0] == "poly":
+            self._key(item[1])
+            self.feeds.poly.subscribe([item[1]], self._on_market)
+        else:
+            stream = ref[1]
+            key = self._key(stream)
+            publish = self.ring.publish
+            async def on_trade(price, qty, exch_ts, recv_ts, side):
+                publish(TRADE, side, key, recv_ts, exch_ts, price, qty)
+            self.trade_cbs[stream] = on_trade
+            self.feeds.binance.subscribe(item[1], on_trade, stream=item[2])
+
+    def _remove(self, worker, item):
+        owned = self.owned.get(worker)
+        if not owned or item not in owned: return
+        owned.discard(item)
+        ref = item[:2] if item[0] == "poly" else ("binance", f"{item[1]}@{item[2]}")
+        self.refs[ref] -= 1
+        if self.refs[ref]: return
+        del self.refs[ref]
+        if item[0] == "poly":
+            self.feeds.poly.unsubscribe([item[1]])
+        else:
+            self.feeds.binance.unsubscribe(item[1], self.trade_cbs.pop(ref[1]), stream=item[2])
+
+    # --- Publishing ---
+
+    async def _on_market(self, item, recv_ts):
+        publish, key = self.ring.publish, self._key
+        ts = float(item.get("timestamp") or 0)
+        if item.get("event_type") == "price_change":
+            for asset_id, side, price, size in item["changes"]:
+                publish(LEVEL, 1 if side == "BUY" else -1, key(asset_id), recv_ts, ts, price, size)
+            publish(CHANGES, 0, 0, recv_ts, ts, 0.0, 0.0)
+            return
+        k = key(item["asset_id"])
+        for side, levels in ((1, item.get("bids") or ()), (-1, item.get("asks") or ())):
+            for lvl in levels:
+                price, size = lvl if type(lvl) is tuple else (lvl.price, lvl.size)
+                publish(LEVEL, side, k, recv_ts, ts, price, size)
+        publish(BOOK, 0, k, recv_ts, ts, 0.0, 0.0)
+
+    def _connected(self, feed):
+        self.ring.publish(CONNECT, 0, feed, self.clock.time(), 0.0, 0.0, 0.0)
+
+    async def _heartbeat(self):
+        """Feed state and newest message time, so workers see disconnects, PONGs and a dead feed process."""
+        feeds = ((BINANCE, self.feeds.binance.health), (POLYMARKET, self.feeds.poly.health))
+        while True:
+            now = self.clock.time()
+            for feed, health in feeds:
+                self.ring.publish(HEARTBEAT, 0, feed, now, health.last, 0.0, 1.0 if health.connected else 0.0)
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+
+
+class BusBinance:
+    """Worker side stand-in for volbot.feeds.BinanceFeed: same subscribe API, ticks come off the ring."""
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.health = FeedHealth("binance")
+        self.subs = {}           # {key: [callback(price, qty, exch_ts, recv_ts, side)]}
+        self.connect_hooks = []
+
+    def subscribe(self, symbol, callback, on_connect=None, stream="trade"):
+        key = key_of(f"{symbol.lower()}@{stream}")
+        self.subs.setdefault(key, []).append(callback)
+        if on_connect: self.connect_hooks.append(on_connect)
+        self.bus.control(("binance", "subscribe", symbol, stream))
+
+    def unsubscribe(self, symbol, callback, on_connect=None, stream="trade"):
+        key = key_of(f"{symbol.lower()}@{stream}")
+        subs = self.subs.get(key)
+        if subs and callback in subs: subs.remove(callback)
+        if on_connect in self.connect_hooks: self.connect_hooks.remove(on_connect)
+        if subs is not None and not subs:
+            del self.subs[key]
+            self.bus.control(("binance", "unsubscribe", symbol, stream))
+
+
+class BusPoly:
+    """Worker side stand-in for volbot.feeds.PolymarketFeed."""
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.health = FeedHealth("polymarket")
+        self.subs = {}           # {key: (asset_id, callback(item, recv_ts))}
+        self.connect_hooks = []
+
+    def subscribe(self, asset_ids, callback):
+        new = [a for a in asset_ids if key_of(a) not in self.subs]
+        for a in asset_ids: self.subs[key_of(a)] = (a, callback)
+        if new: self.bus.control(("poly", "subscribe", new))
+
+    def unsubscribe(self, asset_ids):
+        gone = [a for a in asset_ids if self.subs.pop(key_of(a), None) is not None]
+        if gone: self.bus.control(("poly", "unsubscribe", gone))
+
+
+class BusFeeds:
+    """
+    The MarketFeeds a worker hands its VolatilityBots: reads the ring, rebuilds
+    the decoded items for its own assets and streams, and forwards
+    subscriptions to the feed process over `conn`. An idle reader yields to
+    the event loop `spin` times before it sleeps a millisecond between polls.
+    """
+
+    def __init__(self, ring, conn, spin=1000):
+        self.ring = ring
+        self.conn = conn
+        self.spin = spin
+        self.binance = BusBinance(self)
+        self.poly = BusPoly(self)
+        self.cursor = ring.head()
+        self.lost = 0
+        self.lap_logged = 0.0
+        self.task = None
+
+    def control(self, msg):
+        try: self.conn.send(msg)
+        except (OSError, ValueError) as e: logger.warning(f"⚠️ Bus control message failed: {e}")
+
+    def start(self):
+        if self.task is None: self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            try: await self.task
+            except asyncio.CancelledError: pass
+            self.task = None
+        if self.lost: logger.warning(f"⚠️ Bus reader lost {self.lost} records to overruns")
+
+    def _lapped(self, head):
+        """The writer overwrote records we had not read: skip to the present and resync like after a reconnect."""
+        self.lost += head - self.cursor
+        self.cursor = head
+        now = time.time()
+        if now - self.lap_logged > 10:
+            logger.warning(f"⚠️ Bus reader lapped: {self.lost} records lost so far; resyncing")
+            self.lap_logged = now
+        for feed in (self.binance, self.poly):
+            if feed.health.connected: self._connected(feed, now)
+
+    def _connected(self, feed, ts):
+        if feed.health.connected: feed.health.on_disconnect(ts)
+        feed.health.on_connect(ts)
+        for hook in list(feed.connect_hooks): hook()
+
+    async def _run(self):
+        ring = self.ring
+        read = ring.read
+        trades, books = self.binance.subs, self.poly.subs
+        bh, ph = self.binance.health, self.poly.health
+        feeds = (self.binance, self.poly)
+        pending = []  # this worker's LEVELs of the batch being read
+        partial = True  # joined (or lapped into) a batch midway: drop it up to its BOOK / CHANGES
+        idle = busy = 0
+        while True:
+            rec = read(self.cursor)
+            if rec is None:
+                if ring.head() > self.cursor:
+                    self._lapped(ring.head()); pending.clear(); partial = True; continue
+                idle += 1
+                await asyncio.sleep(0 if idle < self.spin else 0.001)
+                continue
+            idle = 0
+            self.cursor += 1
+            busy += 1
+            if busy == YIELD_EVERY:
+                busy = 0
+                await asyncio.sleep(0)  # a steady stream must not starve the bots' other tasks
+            kind, side, key, ts, exch_ts, price, size = rec
+            if kind == TRADE:
+                bh.last = ts
+                subs = trades.get(key)
+                if subs:
+                    for cb in subs: await cb(price, size, exch_ts, ts, side)
+            elif kind == LEVEL:
+                ph.last = ts
+                if key in books and not partial: pending.append((key, side, price, size))
+            elif kind == BOOK:
+                ph.last = ts
+                if partial:
+                    partial = False
+                    continue
+                sub = books.get(key)
+                if sub:
+                    item = {"event_type": "book", "asset_id": sub[0], "timestamp": exch_ts, "hash": None,
+                            "bids": [(p, s) for _, sd, p, s in pending if sd > 0],
+                            "asks": [(p, s) for _, sd, p, s in pending if sd < 0]}
+                    await sub[1](item, ts)
+                pending.clear()
+            elif kind == CHANGES:
+                ph.last = ts
+                if partial:
+                    partial = False
+                    continue
+                if pending:
+                    changes, cbs = [], []
+                    for k, sd, p, s in pending:
+                        sub = books.get(k)
+                        if not sub: continue
+                        changes.append((sub[0], "BUY" if sd > 0 else "SELL", p, s))
+                        if sub[1] not in cbs: cbs.append(sub[1])
+                    pending.clear()
+                    item = {"event_type": "price_change", "timestamp": exch_ts, "changes": changes}
+                    for cb in cbs: await cb(item, ts)
+            elif kind == HEARTBEAT:
+                feed = feeds[key]
+                health = feed.health
+                if size and not health.connected: self._connected(feed, ts)
+                elif not size and health.connected: health.on_disconnect(ts)
+                if exch_ts > health.last: health.last = exch_ts
+            elif kind == CONNECT:
+                self._connected(feeds[key], ts)
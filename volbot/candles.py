@@ -0,0 +1,175 @@
+"""
+Streaming OHLC candle aggregator.
+
+Builds 1m/5m/15m bars straight from the Binance trade stream into fixed-size
+ring buffers, so the strike price (15m OPEN) and previous-bar ranges come
+from local state instead of REST /klines polling. REST is only used to seed
+history at startup or after a feed gap (see CandleSeries.seed).
+"""
+
+INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600}
+
+
+def interval_seconds(name):
+    if name in INTERVALS: return INTERVALS[name]
+    raise ValueError(f"Unsupported candle interval: {name}")
+
+
+class Bar:
+    __slots__ = ("start", "open", "high", "low", "close", "volume", "complete")
+
+    def __init__(self, start, open, high, low, close, volume, complete):
+        self.start = start
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.complete = complete
+
+    @property
+    def range(self):
+        return self.high - self.low
+
+
+class CandleSeries:
+    """
+    Ring buffer of bars for one interval. Slots are consecutive in time:
+    intervals with no trades while the feed is live are filled with flat bars.
+    A bar is `complete` only if the feed was live from its first trade.
+    """
+
+    def __init__(self, name, capacity=96):
+        self.name = name
+        self.interval = interval_seconds(name)
+        self.capacity = capacity
+        self.start = [0] * capacity
+        self.open = [0.0] * capacity
+        self.high = [0.0] * capacity
+        self.low = [0.0] * capacity
+        self.close = [0.0] * capacity
+        self.volume = [0.0] * capacity
+        self.complete = [False] * capacity
+        self.head = -1          # slot of the forming bar
+        self.count = 0          # bars currently held (<= capacity)
+        self.cur_start = None   # start of the forming bar, None = no live data
+        self.gap = True         # history is missing or stale; needs a backfill
+
+    def _push(self, start, o, h, l, c, v, complete):
+        self.head = (self.head + 1) % self.capacity
+        i = self.head
+        self.start[i] = start
+        self.open[i] = o; self.high[i] = h; self.low[i] = l; self.close[i] = c
+        self.volume[i] = v
+        self.complete[i] = complete
+        if self.count < self.capacity: self.count += 1
+        self.cur_start = start
+
+    def update(self, ts, price, size=0.0):
+        """Adds a trade (ts in seconds). Returns the number of bars closed by it (0 if none)."""
+        interval = self.interval
+        bucket = int(ts // interval) * interval
+        cur = self.cur_start
+        if bucket == cur:
+            i = self.head
+            if price > self.high[i]: self.high[i] = price
+            elif price < self.low[i]: self.low[i] = price
+            self.close[i] = price
+            self.volume[i] += size
+            return 0
+        if cur is None:
+            # First trade after start/reconnect: this bar started before we were listening
+            self._push(bucket, price, price, price, price, size, False)
+            return 0
+        if bucket < cur: return 0  # late trade for an already-closed bar
+        closed = 1
+        last_close = self.close[self.head]
+        flat = cur + interval
+        while flat < bucket:
+            self._push(flat, last_close, last_close, last_close, last_close, 0.0, True)
+            flat += interval
+            closed += 1
+        self._push(bucket, price, price, price, price, size, True)
+        return closed
+
+    def mark_gap(self):
+        """Call when the feed dropped: the next bar is partial and history needs a backfill."""
+        self.cur_start = None
+        self.gap = True
+
+    def seed(self, klines):
+        """
+        Loads REST klines ([openTime_ms, open, high, low, close, volume, ...], oldest first).
+        The last kline is treated as the forming bar and merged with any live trades in it.
+        """
+        if not klines: return
+        live = self.bar(0) if self.cur_start is not None else None
+        self.head = -1
+        self.count = 0
+        self.cur_start = None
+        for k in klines:
+            self._push(int(k[0]) // 1000, float(k[1]), float(k[2]), float(k[3]),
+                       float(k[4]), float(k[5]), True)
+        if live and live.start == self.cur_start:
+            i = self.head
+            if live.high > self.high[i]: self.high[i] = live.high
+            if live.low < self.low[i]: self.low[i] = live.low
+            self.close[i] = live.close
+        elif live and live.start > self.cur_start:
+            self._push(live.start, live.open, live.high, live.low, live.close, live.volume, live.complete)
+        self.gap = False
+
+    def bar(self, offset=0):
+        """Bar `offset` positions back from the forming bar (0 = forming, 1 = last closed)."""
+        if offset >= self.count or self.head < 0: return None
+        i = (self.head - offset) % self.capacity
+        return Bar(self.start[i], self.open[i], self.high[i], self.low[i],
+                   self.close[i], self.volume[i], self.complete[i])
+
+    def find(self, start):
+        """Bar that opened at `start` (seconds), or None if it is not in the buffer."""
+        if self.count == 0: return None
+        head_start = self.start[self.head]
+        if start > head_start or (head_start - start) % self.interval: return None
+        offset = (head_start - start) // self.interval
+        if offset < self.count and self.start[(self.head - offset) % self.capacity] == start:
+            return self.bar(offset)
+        # Slots are not contiguous across a feed gap; fall back to a scan
+        for off in range(min(offset, self.count)):
+            if self.start[(self.head - off) % self.capacity] == start: return self.bar(off)
+        return None
+
+    def closed_bars(self, limit=None):
+        """Closed bars, oldest first."""
+        n = self.count - 1
+        if limit is not None: n = min(n, limit)
+        return [self.bar(off) for off in range(n, 0, -1)]
+
+
+class CandleAggregator:
+    """Feeds every trade into one CandleSeries per interval."""
+
+    def __init__(self, intervals=("1m", "5m", "15m"), capacity=96):
+        self.series = {name: CandleSeries(name, capacity) for name in intervals}
+        self.last_ts = 0.0
+
+    def __getitem__(self, name):
+        return self.series[name]
+
+    def update(self, ts, price, size=0.0):
+        """Returns [(interval, bars_closed)] for series whose bar closed on this trade (usually empty)."""
+        self.last_ts = ts
+        closed = None
+        for name, s in self.series.items():
+            n = s.update(ts, price, size)
+            if n:
+                if closed is None: closed = []
+                closed.append((name, n))
+        return closed or ()
+
+    def mark_gap(self):
+        for s in self.series.values(): s.mark_gap()
+
+    @property
+    def gap(self):
+        return any(s.gap for s in self.series.values())
@@ -0,0 +1,55 @@
+"""
+Clocks injected into VolatilityBot.
+
+WallClock is the live default. VirtualClock only moves when the replay
+engine advances it, so sleeps return immediately and runs are deterministic.
+ScaledClock runs wall time `speed` times faster from a fixed origin, for soak
+tests against volbot.exchange: processes started with the same CLOCK_SPEED
+and CLOCK_ORIGIN agree on the time without talking to each other.
+"""
+
+import time
+import asyncio
+
+
+class WallClock:
+    def time(self):
+        return time.time()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def advance_to(self, ts):
+        if ts > self.now: self.now = ts
+
+    async def sleep(self, seconds):
+        if seconds > 0: self.now += seconds
+        await asyncio.sleep(0)
+
+
+class ScaledClock:
+    def __init__(self, speed, origin=None):
+        self.speed = speed
+        self.origin = time.time() if origin is None else origin
+
+    def time(self):
+        return self.origin + (time.time() - self.origin) * self.speed
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds / self.speed)
+
+
+def clock_from_env(env):
+    """ScaledClock when CLOCK_SPEED is set, else WallClock."""
+    speed = env("CLOCK_SPEED")
+    if not speed or float(speed) == 1: return WallClock()
+    origin = env("CLOCK_ORIGIN")
+    return ScaledClock(float(speed), float(origin) if origin else None)
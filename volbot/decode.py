@@ -0,0 +1,187 @@
+"""
+Pluggable WebSocket message decoders.
+
+Each decoder pulls only the fields the bot uses and parses prices/sizes to
+float once, at the edge, so nothing downstream converts strings again.
+
+    binance_trade(raw)   -> (symbol, price, qty, exch_ts_ms, buyer_is_maker)   (/ws/<s>@trade)
+    binance_stream(raw)  -> (stream, ...same), or None for SUBSCRIBE acks      (/stream?streams=)
+    Both also take @aggTrade (same fields) and @bookTicker, whose price is the
+    bid/ask mid with qty 0 and no event time (exch_ts_ms 0).
+    market(raw)          -> [item] with only book / price_change events:
+        {"event_type": "book", "asset_id", "timestamp", "hash", "bids": [level], "asks": [level]}
+        {"event_type": "price_change", "timestamp", "changes": [(asset_id, side, price, size)]}
+    A level is a (price, size) pair or an object with .price / .size (see OrderBook).
+
+Backends: msgspec (typed structs), orjson, or stdlib json. DECODER=msgspec|orjson|json
+picks one; the default is the fastest one installed.
+"""
+
+import os
+import json
+from typing import Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JsonDecoder:
+    name = "json"
+
+    def __init__(self, loads=json.loads):
+        self.loads = loads
+
+    def binance_trade(self, raw):
+        return _tick(self.loads(raw), "s")
+
+    def binance_stream(self, raw):
+        msg = self.loads(raw)
+        d = msg.get("data")
+        if not d: return None
+        return _tick(d, msg.get("stream", ""))
+
+    def market(self, raw):
+        data = self.loads(raw)
+        return _normalize_items(data if isinstance(data, list) else [data])
+
+
+def _tick(d, key):
+    label = d.get("s", "") if key == "s" else key
+    p = d.get("p")
+    if p is None:  # bookTicker
+        return label, (float(d["b"]) + float(d["a"])) / 2, 0.0, 0, False
+    return label, float(p), float(d.get("q", 0)), d.get("T", 0), bool(d.get("m"))
+
+
+def _normalize_items(items):
+    out = []
+    for item in items:
+        if not isinstance(item, dict): continue
+        event = item.get("event_type")
+        if event == "price_change" or "price_changes" in item or "changes" in item:
+            changes = item.get("price_changes")
+            if changes is not None:
+                norm = [(c.get("asset_id"), c["side"], float(c["price"]), float(c["size"])) for c in changes]
+            else:
+                # Legacy format: one asset per message
+                asset_id = item.get("asset_id")
+                norm = [(asset_id, c["side"], float(c["price"]), float(c["size"])) for c in item.get("changes", ())]
+            out.append({"event_type": "price_change", "timestamp": item.get("timestamp"), "changes": norm})
+        elif "asks" in item or "bids" in item:
+            out.append({
+                "event_type": "book",
+                "asset_id": item.get("asset_id"),
+                "timestamp": item.get("timestamp"),
+                "hash": item.get("hash"),
+                "bids": [(float(l["price"]), float(l["size"])) for l in item.get("bids") or ()],
+                "asks": [(float(l["price"]), float(l["size"])) for l in item.get("asks") or ()],
+            })
+    return out
+
+
+class OrjsonDecoder(JsonDecoder):
+    name = "orjson"
+
+    def __init__(self):
+        super().__init__(orjson.loads)
+
+
+if msgspec is not None:
+    class _Trade(msgspec.Struct):
+        s: str = ""
+        p: "float | None" = None  # None: bookTicker
+        q: float = 0.0
+        T: int = 0
+        m: bool = False
+        b: float = 0.0  # bookTicker bid / ask (on trades: order ids)
+        a: float = 0.0
+
+    class _Stream(msgspec.Struct):
+        stream: str = ""
+        data: "_Trade | None" = None
+
+    class _Level(msgspec.Struct):
+        price: float
+        size: float
+
+    class _Change(msgspec.Struct):
+        asset_id: str = ""
+        side: str = ""
+        price: float = 0.0
+        size: float = 0.0
+
+    class _Event(msgspec.Struct):
+        event_type: str = ""
+        asset_id: str = ""
+        timestamp: "str | int" = 0
+        hash: str = ""
+        bids: "list[_Level] | None" = None
+        asks: "list[_Level] | None" = None
+        price_changes: "list[_Change] | None" = None
+        changes: "list[_Change] | None" = None
+
+    _Events = Union[list[_Event], _Event]
+
+
+class MsgspecDecoder:
+    name = "msgspec"
+
+    def __init__(self):
+        # strict=False lets the exchanges' quoted numbers decode straight into floats
+        self._trade = msgspec.json.Decoder(_Trade, strict=False)
+        self._stream = msgspec.json.Decoder(_Stream, strict=False)
+        self._events = msgspec.json.Decoder(_Events, strict=False)
+        self._fallback = JsonDecoder(msgspec.json.decode)
+
+    def binance_trade(self, raw):
+        t = self._trade.decode(raw)
+        if t.p is None: return t.s, (t.b + t.a) / 2, 0.0, 0, False
+        return t.s, t.p, t.q, t.T, t.m
+
+    def binance_stream(self, raw):
+        msg = self._stream.decode(raw)
+        t = msg.data
+        if t is None: return None
+        if t.p is None: return msg.stream, (t.b + t.a) / 2, 0.0, 0, False
+        return msg.stream, t.p, t.q, t.T, t.m
+
+    def market(self, raw):
+        try:
+            data = self._events.decode(raw)
+        except msgspec.ValidationError:
+            return self._fallback.market(raw)
+        out = []
+        for e in (data if isinstance(data, list) else (data,)):
+            if e.price_changes is not None:
+                out.append({"event_type": "price_change", "timestamp": e.timestamp,
+                            "changes": [(c.asset_id, c.side, c.price, c.size) for c in e.price_changes]})
+            elif e.changes is not None:
+                a = e.asset_id
+                out.append({"event_type": "price_change", "timestamp": e.timestamp,
+                            "changes": [(a, c.side, c.price, c.size) for c in e.changes]})
+            elif e.asks is not None or e.bids is not None:
+                out.append({"event_type": "book", "asset_id": e.asset_id, "timestamp": e.timestamp,
+                            "hash": e.hash, "bids": e.bids or [], "asks": e.asks or []})
+        return out
+
+
+DECODERS = {"json": JsonDecoder}
+if orjson is not None: DECODERS["orjson"] = OrjsonDecoder
+if msgspec is not None: DECODERS["msgspec"] = MsgspecDecoder
+
+
+def get_decoder(name=None):
+    name = (name or os.getenv("DECODER") or "auto").lower()
+    if name == "auto":
+        for candidate in ("msgspec", "orjson", "json"):
+            if candidate in DECODERS: return DECODERS[candidate]()
+    if name not in DECODERS:
+        raise ValueError(f"Decoder {name} is not available (installed: {', '.join(DECODERS)})")
+    return DECODERS[name]()
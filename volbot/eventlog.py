@@ -0,0 +1,303 @@
+"""
+Non-blocking structured event log for the hot paths (EVENT_LOG).
+
+In text mode every signal, order, fill and price line is an f-string written
+synchronously to stdout, so a backed-up stdout pipe stalls the event loop.
+With EVENT_LOG set, those become structured events: emit() stores a tuple in
+a preallocated ring buffer and returns, and a background thread formats and
+writes them in batches. Nothing on the event loop ever waits on the output;
+if the writer falls a whole ring behind, the overwritten events are counted
+as lost. The bot's remaining log lines go through a QueueHandler, so they
+are written off the loop as well.
+
+The ring keeps every event at full detail. Sampling and rate limits per type
+and market (in event time, so replays log the same lines) apply only to what
+is written. volbot.multi and volbot.shard workers share one log per process.
+On any ERROR log line, the last EVENT_DUMP_SECONDS of events are written
+unsampled (at most one dump per window), bounded by the ring size.
+
+    EVENT_LOG            "stdout" or a file path
+    EVENT_LOG_FORMAT     line (default) | binary
+    EVENT_LOG_SIZE       ring capacity in events (65536)
+    EVENT_LOG_RATE       max written per second by type, e.g. "price=0.1,signal=5"
+    EVENT_LOG_SAMPLE     fraction written by type, e.g. "signal=0.25"
+    EVENT_DUMP_SECONDS   history dumped on error (10, 0 = off)
+    EVENT_DUMP_FILE      where dumps go (default: the event log)
+
+Line format: "<epoch> <type> k=v ...", dump lines prefixed with "!". Binary
+records are u16 length, f64 ts, u8 type (0x80 set on dump records), then
+tagged fields; decode them with
+
+    python -m volbot.eventlog events.bin
+"""
+
+import sys
+import json
+import time
+import atexit
+import struct
+import logging
+import threading
+import logging.handlers
+import queue
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+PRICE, SIGNAL, ORDER, KILLED, FILL = 1, 2, 3, 4, 5
+SCHEMA, DUMP = 126, 127
+FIELDS = {  # bot events lead with the market (round slug), so several bots can share one log
+    PRICE: ("price", ("market", "price", "diff", "thr")),
+    SIGNAL: ("signal", ("market", "side", "diff", "thr", "ask")),
+    ORDER: ("order", ("market", "side", "qty", "asset", "limit", "type")),
+    KILLED: ("killed", ("market", "asset", "filled", "qty", "limit")),
+    FILL: ("fill", ("market", "side", "asset", "px", "qty", "value", "balance", "pnl")),
+    DUMP: ("dump", ("reason", "seconds", "events")),
+}
+TYPES = {name: kind for kind, (name, _) in FIELDS.items()}
+DUMP_FLAG = 0x80
+
+_HEAD = struct.Struct("<HdB")  # payload length, ts, type
+_F64 = struct.Struct("<d")
+
+
+def _parse_spec(spec):
+    """ "price=0.1,signal=5" -> {PRICE: 0.1, SIGNAL: 5.0}"""
+    out = {}
+    for item in (spec or "").replace(" ", ",").split(","):
+        if not item: continue
+        name, value = item.split("=", 1)
+        if name not in TYPES: raise ValueError(f"Unknown event type {name} (choose from {', '.join(TYPES)})")
+        out[TYPES[name]] = float(value)
+    return out
+
+
+def format_line(ts, kind, fields, dump=False):
+    name, names = FIELDS[kind]
+    parts = [f"{'!' if dump else ''}{ts:.3f}", name]
+    for k, v in zip(names, fields):
+        parts.append(f"{k}={v:.6g}" if isinstance(v, float) else f"{k}={v}")
+    return " ".join(parts) + "\n"
+
+
+def encode(ts, kind, fields, dump=False):
+    body = bytearray()
+    for v in fields:
+        if isinstance(v, str):
+            b = v.encode()[:255]
+            body += b"s" + bytes((len(b),)) + b
+        else:
+            body += b"d" + _F64.pack(v)
+    return _HEAD.pack(len(body), ts, kind | (DUMP_FLAG if dump else 0)) + body
+
+
+def read_binary(path):
+    """Yields (ts, kind, fields, dump) for every complete record of a binary event log."""
+    with open(path, "rb") as f: data = f.read()
+    pos = 0
+    while pos + _HEAD.size <= len(data):
+        length, ts, kind = _HEAD.unpack_from(data, pos)
+        pos += _HEAD.size
+        end = pos + length
+        if end > len(data): return
+        fields = []
+        while pos < end:
+            if data[pos:pos + 1] == b"s":
+                n = data[pos + 1]
+                fields.append(data[pos + 2:pos + 2 + n].decode()); pos += 2 + n
+            else:
+                fields.append(_F64.unpack_from(data, pos + 1)[0]); pos += 1 + _F64.size
+        yield ts, kind & ~DUMP_FLAG, tuple(fields), bool(kind & DUMP_FLAG)
+
+
+class EventLog:
+    def __init__(self, out=None, binary=False, capacity=65536, rates=None, sample=None,
+                 dump_seconds=10.0, dump_out=None, flush_interval=0.1):
+        self.capacity = capacity
+        # Preallocated ring: the event loop only stores into these slots
+        self.ts = [0.0] * capacity
+        self.kind = [0] * capacity
+        self.fields = [None] * capacity
+        self.head = 0          # events emitted (next slot = head % capacity); written only by the event loop
+        self.tail = 0          # events consumed by the writer
+        self.lost = 0          # overwritten before the writer got to them
+        self.filtered = 0      # dropped by sampling / rate limits
+        self.binary = binary
+        self.out = out if out is not None else sys.stdout.buffer
+        self.dump_out = dump_out or self.out
+        self.rates = rates or {}
+        self.sample = sample or {}
+        self.dump_seconds = dump_seconds
+        self.flush_interval = flush_interval
+        self._tokens = {}  # {(type, market): token bucket}, refilled in event time
+        self._last = {}
+        self._acc = {}     # {(type, market): sampling accumulator}
+        self._dump_reason = None
+        self._last_dump = 0.0
+        self._wake = threading.Event()
+        self._running = True
+        if binary:
+            schema = json.dumps({name: list(names) for name, names in FIELDS.values()})
+            self.out.write(encode(0.0, SCHEMA, (schema,)))
+        self.thread = threading.Thread(target=self._writer, name="event-log", daemon=True)
+        self.thread.start()
+
+    # --- Event loop thread ---
+
+    def emit(self, kind, ts, *fields):
+        i = self.head % self.capacity
+        self.ts[i] = ts
+        self.kind[i] = kind
+        self.fields[i] = fields
+        self.head += 1
+
+    def dump(self, reason):
+        """Asks the writer to dump the last dump_seconds of events unsampled (at most once per window)."""
+        if not self.dump_seconds: return
+        now = time.monotonic()
+        if now - self._last_dump < self.dump_seconds: return
+        self._last_dump = now
+        self._dump_reason = reason
+        self._wake.set()
+
+    def close(self, timeout=5.0):
+        self._running = False
+        self._wake.set()
+        self.thread.join(timeout)
+
+    # --- Writer thread ---
+
+    def _keep(self, kind, ts, market):
+        key = (kind, market)
+        rate = self.rates.get(kind)
+        if rate is not None:
+            tokens = min(1.0, self._tokens.get(key, 1.0) + (ts - self._last.get(key, ts)) * rate)
+            self._last[key] = ts
+            if tokens < 1.0:
+                self._tokens[key] = tokens
+                return False
+            self._tokens[key] = tokens - 1.0
+        frac = self.sample.get(kind)
+        if frac is not None:
+            acc = self._acc.get(key, 0.0) + frac
+            if acc < 1.0:
+                self._acc[key] = acc
+                return False
+            self._acc[key] = acc - 1.0
+        return True
+
+    def _format(self, ts, kind, fields, dump=False):
+        return encode(ts, kind, fields, dump) if self.binary else format_line(ts, kind, fields, dump).encode()
+
+    def _drain(self):
+        head = self.head
+        if head - self.tail > self.capacity:
+            self.lost += head - self.tail - self.capacity
+            self.tail = head - self.capacity
+        out = []
+        cap = self.capacity
+        for n in range(self.tail, head):
+            i = n % cap
+            ts, kind, fields = self.ts[i], self.kind[i], self.fields[i]
+            if self.head - n > cap:  # overwritten while we were reading
+                self.lost += 1; continue
+            if self._keep(kind, ts, fields[0] if fields else None): out.append(self._format(ts, kind, fields))
+            else: self.filtered += 1
+        self.tail = head
+        return out
+
+    def _history(self, reason):
+        """The ring's events from the last dump_seconds (event time), oldest first, marked as dump records."""
+        head = self.head
+        first = max(head - self.capacity + 1, 0)  # leave the slot being written alone
+        if head == first: return []
+        cutoff = self.ts[(head - 1) % self.capacity] - self.dump_seconds
+        rows = []
+        for n in range(head - 1, first - 1, -1):
+            i = n % self.capacity
+            ts, kind, fields = self.ts[i], self.kind[i], self.fields[i]
+            if ts < cutoff: break
+            rows.append(self._format(ts, kind, fields, dump=True))
+        rows.reverse()
+        last = self.ts[(head - 1) % self.capacity]
+        return [self._format(last, DUMP, (reason, float(self.dump_seconds), float(len(rows))), dump=True)] + rows
+
+    def _write(self, out, chunks):
+        if not chunks: return
+        try:
+            out.write(b"".join(chunks)); out.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _writer(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            running = self._running
+            self._write(self.out, self._drain())
+            if self._dump_reason is not None:
+                reason, self._dump_reason = self._dump_reason, None
+                self._write(self.dump_out, self._history(reason))
+            if not running: break
+        if self.lost or self.filtered:
+            self._write(self.out, [] if self.binary else [f"# event log: {self.filtered} filtered, {self.lost} lost\n".encode()])
+        for f in {self.out, self.dump_out}:
+            if f is not sys.stdout.buffer: f.close()
+
+
+class DumpOnError(logging.Handler):
+    """Triggers an event log dump on every ERROR record (the dump itself is rate limited)."""
+
+    def __init__(self, events):
+        super().__init__(logging.ERROR)
+        self.events = events
+
+    def emit(self, record):
+        self.events.dump(record.getMessage()[:200])
+
+
+_listener = None
+
+
+def queue_logging():
+    """Moves the root logging handlers behind a QueueHandler, so log lines are written by a background thread."""
+    global _listener
+    if _listener: return
+    root = logging.getLogger()
+    q = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(q, *root.handlers, respect_handler_level=True)
+    for h in list(root.handlers): root.removeHandler(h)
+    root.addHandler(logging.handlers.QueueHandler(q))
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def event_log_from_env(env):
+    """EventLog if EVENT_LOG is set, else None. Also queues the regular log output."""
+    target = env("EVENT_LOG")
+    if not target: return None
+    binary = (env("EVENT_LOG_FORMAT") or "line").lower() == "binary"
+    out = sys.stdout.buffer if target == "stdout" else open(target, "ab")
+    dump_file = env("EVENT_DUMP_FILE")
+    events = EventLog(out, binary, capacity=int(env("EVENT_LOG_SIZE") or "65536"),
+                      rates=_parse_spec(env("EVENT_LOG_RATE") if env("EVENT_LOG_RATE") is not None else "price=0.1"),
+                      sample=_parse_spec(env("EVENT_LOG_SAMPLE")),
+                      dump_seconds=float(env("EVENT_DUMP_SECONDS") or "10"),
+                      dump_out=open(dump_file, "ab") if dump_file else None)
+    queue_logging()
+    return events
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python -m volbot.eventlog events.bin", file=sys.stderr)
+        return 1
+    for ts, kind, fields, dump in read_binary(argv[0]):
+        if kind == SCHEMA: continue
+        if kind not in FIELDS: continue
+        sys.stdout.write(format_line(ts, kind, fields, dump))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
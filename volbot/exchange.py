@@ -0,0 +1,580 @@
+"""
+Local synthetic exchange for load and soak tests.
+
+Stands in for every endpoint VolatilityBot talks to, driven by one seeded
+price path, so the bot runs unchanged against it:
+
+    Binance   GET /api/v3/klines, WS /ws/<symbol>@<trade|aggTrade|bookTicker>,
+              WS /stream?streams=a/b (SUBSCRIBE / UNSUBSCRIBE)
+    CLOB      GET /book?token_id=
+    Poly WS   /ws/market: book snapshots on subscribe, then price_change diffs
+    Gamma     GET /events?slug= and /markets?slug= with rolling 15m rounds,
+              listed --listing-lead seconds ahead and resolved --resolve-delay
+              seconds after the end (Up wins if the close is >= the open)
+    Sim API   POST /simulations/<id>/trade
+    GET /stats   counters and current rates as JSON
+
+Up/Down books follow the round's fair value (normal CDF of the distance to
+the strike over the remaining volatility). Message rates are per wall second
+and come in Poisson bursts of --burst messages on average; --latency-ms /
+--jitter-ms delay every message and response, --disconnect-every drops
+sockets after an exponential lifetime and --http-error-rate answers 503s.
+
+Finding the breaking point: --ramp 1.5 multiplies both rates every
+--ramp-every seconds. Each socket has a bounded send queue; a client that
+lets it fill is disconnected (as Binance does) and the rate it happened at
+is logged. Watch the bot's own tick lag alongside (METRICS_*). The server
+is one Python process too: trust the figure only while its stats line still
+shows the requested rate going out.
+
+Soak: --speed 96 runs the market 96x faster than wall time (24h of rollovers
+in 15 minutes) and --soak-hours 24 stops after 24 market hours with a
+summary. The bot runs in the same time with the CLOCK_SPEED / CLOCK_ORIGIN
+and host overrides printed at startup:
+
+    python -m volbot.exchange --port 8900 --speed 96 --soak-hours 24
+    CLOCK_SPEED=96 CLOCK_ORIGIN=... CLOB_HOST=http://127.0.0.1:8900 ... python example.py
+"""
+
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+
+import numpy as np
+from aiohttp import web, WSMsgType
+
+from volbot.clock import ScaledClock
+from volbot.candles import interval_seconds
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+ROUND_SECONDS = 900
+
+
+def _cents(c):
+    return f"{c / 100:.2f}"
+
+
+def _iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+class PricePath:
+    """Seeded 1-second random walk, extended on demand. Trades, klines, fair values and resolutions all read it."""
+
+    def __init__(self, origin, price=100000.0, vol=2.0, seed=0):
+        self.t0 = int(origin) - 2 * 86400  # history for every candle backfill
+        self.vol = vol
+        self.rng = np.random.default_rng(seed)
+        self.prices = np.array([price])
+
+    def _extend(self, t):
+        need = int(t) - self.t0 + 1 - len(self.prices)
+        if need > 0:
+            steps = self.rng.normal(0.0, self.vol, max(need, 3600))
+            self.prices = np.concatenate([self.prices, self.prices[-1] + np.cumsum(steps)])
+
+    def at(self, t):
+        self._extend(t)
+        return float(self.prices[max(int(t) - self.t0, 0)])
+
+    def kline(self, start, seconds, now):
+        """Binance kline row for the bar opening at `start`, formed up to `now`."""
+        end = max(min(start + seconds, int(now) + 1), start + 1)
+        self._extend(end)
+        seg = self.prices[max(start - self.t0, 0):max(end - self.t0, 1)]
+        o, h, l, c = float(seg[0]), float(seg.max()), float(seg.min()), float(seg[-1])
+        vol = 0.05 * len(seg)
+        return [start * 1000, f"{o:.2f}", f"{h:.2f}", f"{l:.2f}", f"{c:.2f}", f"{vol:.5f}",
+                (start + seconds) * 1000 - 1, f"{vol * c:.2f}", len(seg), f"{vol / 2:.5f}", f"{vol * c / 2:.2f}", "0"]
+
+
+class Book:
+    """One token's levels in integer cents, re-centred on a fair value at every update."""
+
+    def __init__(self, rng, depth):
+        self.rng = rng
+        self.depth = depth
+        self.bids, self.asks = {}, {}
+
+    def move(self, fair):
+        """Moves the book to `fair` and returns the level changes as (side, cents, size); size 0 removes."""
+        rng = self.rng
+        bid = min(max(int(fair * 100 - 0.5), 1), 98)
+        ask = min(bid + 1 + (rng.random() < 0.3), 99)
+        changes = []
+        for side, levels, want in (("BUY", self.bids, range(bid, max(bid - self.depth, 0), -1)),
+                                   ("SELL", self.asks, range(ask, min(ask + self.depth, 100)))):
+            want = set(want)
+            for c in [c for c in levels if c not in want]:
+                del levels[c]
+                changes.append((side, c, 0.0))
+            for c in want:
+                if c not in levels or rng.random() < 0.2:
+                    levels[c] = round(float(rng.uniform(20, 400)), 2)
+                    changes.append((side, c, levels[c]))
+        return changes
+
+    def levels(self):
+        # Polymarket order: bids ascending, asks descending (best level last)
+        return ([{"price": _cents(c), "size": str(self.bids[c])} for c in sorted(self.bids)],
+                [{"price": _cents(c), "size": str(self.asks[c])} for c in sorted(self.asks, reverse=True)])
+
+
+class Client:
+    """One WebSocket connection: a bounded send queue drained with the configured latency."""
+
+    def __init__(self, exchange, ws, kind):
+        self.ex = exchange
+        self.ws = ws
+        self.kind = kind
+        self.subs = set()
+        self.combined = False
+        self.closed = False
+        self.queue = asyncio.Queue(maxsize=exchange.max_queue)
+        self.sender = asyncio.create_task(self._send())
+        self.killer = None
+        if exchange.disconnect_every:
+            lifetime = float(exchange.rng.exponential(exchange.disconnect_every))
+            self.killer = asyncio.get_running_loop().call_later(lifetime, self.kill, 1001, "going away", "disconnects")
+
+    def push(self, text):
+        if self.closed: return
+        try:
+            self.queue.put_nowait((self.ex.due(), text))
+        except asyncio.QueueFull:
+            self.ex.fell_behind(self)
+            self.kill(1008, "slow client", "slow_clients")
+
+    def kill(self, code, reason, counter):
+        if self.closed: return
+        self.closed = True
+        self.ex.stats[counter] += 1
+        asyncio.create_task(self.ws.close(code=code, message=reason.encode()))
+
+    async def _send(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                due, text = await self.queue.get()
+                delay = due - loop.time()
+                if delay > 0: await asyncio.sleep(delay)
+                await self.ws.send_str(text)
+        except (ConnectionError, RuntimeError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        self.closed = True
+        self.sender.cancel()
+        if self.killer: self.killer.cancel()
+
+
+class Exchange:
+    def __init__(self, args):
+        self.clock = ScaledClock(args.speed, args.origin)
+        self.speed = args.speed
+        self.symbol = args.symbol.upper()
+        self.prefix = args.slug_prefix
+        self.path = PricePath(self.clock.origin, args.price, args.vol, args.seed)
+        self.rng = np.random.default_rng(args.seed + 1)
+        self.trade_rate = args.trade_rate
+        self.book_rate = args.book_rate
+        self.burst = max(args.burst, 1.0)
+        self.latency = args.latency_ms / 1000
+        self.jitter = args.jitter_ms / 1000
+        self.disconnect_every = args.disconnect_every
+        self.http_error_rate = args.http_error_rate
+        self.listing_lead = args.listing_lead
+        self.resolve_delay = args.resolve_delay
+        self.depth = args.depth
+        self.max_queue = args.max_queue
+        self.ramp, self.ramp_every = args.ramp, args.ramp_every
+        self.stats_every = args.stats_every
+        self.soak_until = self.clock.time() + args.soak_hours * 3600 if args.soak_hours else None
+
+        self.binance = []         # Binance clients
+        self.poly = []            # market channel clients
+        self.books = {}           # {asset_id: Book}
+        self.trade_id = 0
+        self.stats = {"binance_msgs": 0, "poly_msgs": 0, "http": 0, "http_errors": 0, "sim_trades": 0,
+                      "disconnects": 0, "slow_clients": 0, "rounds_listed": 0, "rounds_resolved": 0}
+        self.listed, self.resolved = set(), set()
+        self.broke_at = None      # (trade_rate, book_rate) when a client first fell behind
+        self.sim_trades = {}      # {simulation_id: count}
+
+    # --- Rounds ---
+
+    def round_of_slug(self, slug):
+        head, _, ts = (slug or "").rpartition("-")
+        if head != self.prefix or not ts.isdigit() or int(ts) % ROUND_SECONDS: return None
+        return int(ts)
+
+    def round_of_asset(self, asset_id):
+        if not asset_id or len(asset_id) < 3 or not asset_id[:-2].isdigit() or asset_id[-2:] not in ("01", "02"): return None
+        start = int(asset_id[:-2])
+        return start if start % ROUND_SECONDS == 0 else None
+
+    def tokens(self, start):
+        return f"{start}01", f"{start}02"  # Up, Down
+
+    def fair_up(self, start, now):
+        end = start + ROUND_SECONDS
+        if now >= end: return 1.0 if self.up_won(start) else 0.0
+        if now < start: return 0.5
+        sigma = self.path.vol * math.sqrt(end - now)
+        return 0.5 * (1 + math.erf((self.path.at(now) - self.path.at(start)) / (sigma * math.sqrt(2))))
+
+    def up_won(self, start):
+        return self.path.at(start + ROUND_SECONDS - 1) >= self.path.at(start)
+
+    def market(self, start):
+        """Gamma market record, or None before the round is listed."""
+        now = self.clock.time()
+        if now < start - self.listing_lead: return None
+        end = start + ROUND_SECONDS
+        resolved = now >= end + self.resolve_delay
+        slug = f"{self.prefix}-{start}"
+        if slug not in self.listed:
+            self.listed.add(slug); self.stats["rounds_listed"] += 1
+        if resolved and slug not in self.resolved:
+            self.resolved.add(slug); self.stats["rounds_resolved"] += 1
+        up = self.up_won(start) if resolved else None
+        return {
+            "conditionId": f"0x{start:064x}",
+            "question": f"{self.symbol} Up or Down - {_iso(start)}",
+            "slug": slug,
+            "clobTokenIds": json.dumps(list(self.tokens(start))),
+            "outcomes": json.dumps(["Up", "Down"]),
+            "startDate": _iso(start),
+            "endDate": _iso(end),
+            # Unresolved rounds report 0.5 / 0.5, so only the resolution crosses the bot's 0.95 winner mark
+            "outcomePrices": json.dumps(["0.5", "0.5"] if up is None else (["1", "0"] if up else ["0", "1"])),
+            "active": not resolved,
+            "closed": resolved,
+        }
+
+    def book(self, asset_id):
+        book = self.books.get(asset_id)
+        if book is None:
+            start = self.round_of_asset(asset_id)
+            if start is None: return None
+            book = self.books[asset_id] = Book(self.rng, self.depth)
+            fair = self.fair_up(start, self.clock.time())
+            book.move(fair if asset_id.endswith("01") else 1 - fair)
+        return book
+
+    def book_event(self, asset_id, ms):
+        bids, asks = self.book(asset_id).levels()
+        start = self.round_of_asset(asset_id)
+        return {"event_type": "book", "asset_id": asset_id, "market": f"0x{start:064x}", "timestamp": str(ms),
+                "hash": f"{ms:x}", "bids": bids, "asks": asks}
+
+    # --- Delivery ---
+
+    def due(self):
+        jitter = self.jitter * float(self.rng.random()) if self.jitter else 0.0
+        return asyncio.get_running_loop().time() + self.latency + jitter
+
+    def fell_behind(self, client):
+        if self.broke_at is None:
+            self.broke_at = (self.trade_rate, self.book_rate)
+            logger.warning(f"💥 A {client.kind} client fell behind ({self.max_queue} messages queued) at "
+                           f"{self.trade_rate:,.0f} trades/s + {self.book_rate:,.0f} book msgs/s per round")
+
+    def _bursts(self, rate, dt):
+        """Messages due in `dt` seconds: Poisson bursts of geometric size averaging --burst."""
+        events = int(self.rng.poisson(rate / self.burst * dt))
+        if not events or self.burst == 1: return events
+        return int(self.rng.geometric(1 / self.burst, events).sum())
+
+    async def _binance_loop(self):
+        loop = asyncio.get_running_loop()
+        sym = self.symbol.lower()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(0.001)
+            now = loop.time()
+            n = self._bursts(self.trade_rate, now - last)
+            last = now
+            if not n or not self.binance: continue
+            t = self.clock.time()
+            ms = int(t * 1000)
+            base = self.path.at(t)
+            noise = self.rng.normal(0.0, 0.3, n)
+            makers = self.rng.random(n) < 0.5
+            qtys = self.rng.exponential(0.01, n)
+            msgs = {}
+            for i in range(n):
+                self.trade_id += 1
+                tid, p, q, m = self.trade_id, base + noise[i], qtys[i] + 0.00001, "true" if makers[i] else "false"
+                msgs.setdefault("trade", []).append(
+                    f'{{"e":"trade","E":{ms},"s":"{self.symbol}","t":{tid},"p":"{p:.2f}","q":"{q:.5f}",'
+                    f'"T":{ms},"m":{m},"M":true}}')
+                msgs.setdefault("aggTrade", []).append(
+                    f'{{"e":"aggTrade","E":{ms},"s":"{self.symbol}","a":{tid},"p":"{p:.2f}","q":"{q:.5f}",'
+                    f'"f":{tid},"l":{tid},"T":{ms},"m":{m},"M":true}}')
+                msgs.setdefault("bookTicker", []).append(
+                    f'{{"u":{tid},"s":"{self.symbol}","b":"{p - 0.01:.2f}","B":"{q:.5f}",'
+                    f'"a":"{p + 0.01:.2f}","A":"{q:.5f}"}}')
+            for client in self.binance:
+                for kind, texts in msgs.items():
+                    stream = f"{sym}@{kind}"
+                    if stream not in client.subs: continue
+                    for text in texts:
+                        client.push(f'{{"stream":"{stream}","data":{text}}}' if client.combined else text)
+                        self.stats["binance_msgs"] += 1
+
+    async def _book_loop(self):
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(0.001)
+            now = loop.time()
+            dt, last = now - last, now
+            subscribed = {}
+            for client in self.poly:
+                for a in client.subs: subscribed.setdefault(self.round_of_asset(a), []).append(client)
+            if not subscribed: continue
+            t = self.clock.time()
+            ms = int(t * 1000)
+            for start, clients in subscribed.items():
+                for _ in range(self._bursts(self.book_rate, dt)):
+                    fair = self.fair_up(start, t)
+                    changes = []
+                    for asset_id, value in zip(self.tokens(start), (fair, 1 - fair)):
+                        changes += [{"asset_id": asset_id, "price": _cents(c), "size": str(size), "side": side}
+                                    for side, c, size in self.book(asset_id).move(value)]
+                    text = json.dumps({"event_type": "price_change", "market": f"0x{start:064x}",
+                                       "timestamp": str(ms), "price_changes": changes}, separators=(",", ":"))
+                    for client in set(clients):
+                        client.push(text)
+                        self.stats["poly_msgs"] += 1
+            # Rounds nobody has watched for an hour drop their books
+            for asset_id in [a for a in self.books if self.round_of_asset(a) < t - 3600]:
+                del self.books[asset_id]
+
+    # --- WebSockets ---
+
+    async def ws_handler(self, request):
+        stream = request.match_info["stream"]
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        if stream == "market":
+            client = Client(self, ws, "poly")
+            self.poly.append(client)
+            try: await self._poly_reader(client)
+            finally:
+                self.poly.remove(client); client.close()
+        else:
+            client = Client(self, ws, "binance")
+            client.subs.add(stream.lower())
+            await self._binance_session(client)
+        return ws
+
+    async def stream_handler(self, request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        client = Client(self, ws, "binance")
+        client.combined = True
+        client.subs.update(s.lower() for s in request.query.get("streams", "").split("/") if s)
+        await self._binance_session(client)
+        return ws
+
+    async def _binance_session(self, client):
+        self.binance.append(client)
+        try:
+            async for msg in client.ws:
+                if msg.type != WSMsgType.TEXT: continue
+                try: req = json.loads(msg.data)
+                except ValueError: continue
+                params = [s.lower() for s in req.get("params") or ()]
+                if req.get("method") == "SUBSCRIBE": client.subs.update(params)
+                elif req.get("method") == "UNSUBSCRIBE": client.subs.difference_update(params)
+                client.push(json.dumps({"result": None, "id": req.get("id")}))
+        finally:
+            self.binance.remove(client); client.close()
+
+    async def _poly_reader(self, client):
+        async for msg in client.ws:
+            if msg.type != WSMsgType.TEXT: continue
+            if msg.data == "PING":
+                client.push("PONG"); continue
+            try: req = json.loads(msg.data)
+            except ValueError: continue
+            ids = [a for a in req.get("assets_ids") or () if self.round_of_asset(a) is not None]
+            if req.get("operation") == "unsubscribe":
+                client.subs.difference_update(ids); continue
+            new = [a for a in ids if a not in client.subs]
+            client.subs.update(new)
+            if new:
+                ms = int(self.clock.time() * 1000)
+                client.push(json.dumps([self.book_event(a, ms) for a in new], separators=(",", ":")))
+
+    # --- HTTP ---
+
+    @web.middleware
+    async def http_faults(self, request, handler):
+        self.stats["http"] += 1
+        if self.latency or self.jitter: await asyncio.sleep(self.due() - asyncio.get_running_loop().time())
+        if request.path != "/stats" and self.http_error_rate and self.rng.random() < self.http_error_rate:
+            self.stats["http_errors"] += 1
+            return web.json_response({"error": "injected fault"}, status=503)
+        return await handler(request)
+
+    async def klines(self, request):
+        q = request.query
+        try:
+            seconds = interval_seconds(q.get("interval", "1m"))
+            limit = min(int(q.get("limit", 500)), 1000)
+        except ValueError:
+            return web.json_response({"code": -1120, "msg": "Invalid interval."}, status=400)
+        if q.get("symbol", "").upper() != self.symbol: return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        now = self.clock.time()
+        current = int(now) // seconds * seconds
+        if "startTime" in q:
+            first = -(-int(q["startTime"]) // 1000 // seconds) * seconds
+            starts = range(first, min(first + limit * seconds, current + 1), seconds)
+        else:
+            starts = range(current - (limit - 1) * seconds, current + 1, seconds)
+        return web.json_response([self.path.kline(s, seconds, now) for s in starts])
+
+    async def order_book(self, request):
+        asset_id = request.query.get("token_id", "")
+        book = self.book(asset_id)
+        if book is None: return web.json_response({"error": "No orderbook exists for the requested token id"}, status=404)
+        ev = self.book_event(asset_id, int(self.clock.time() * 1000))
+        return web.json_response({k: ev[k] for k in ("market", "asset_id", "timestamp", "hash", "bids", "asks")})
+
+    async def events(self, request):
+        start = self.round_of_slug(request.query.get("slug"))
+        market = self.market(start) if start is not None else None
+        if not market: return web.json_response([])
+        return web.json_response([{"slug": market["slug"], "title": market["question"], "markets": [market]}])
+
+    async def markets(self, request):
+        start = self.round_of_slug(request.query.get("slug"))
+        market = self.market(start) if start is not None else None
+        return web.json_response([market] if market else [])
+
+    async def sim_trade(self, request):
+        sim = request.match_info["sim"]
+        try: await request.json()
+        except ValueError: return web.json_response({"error": "invalid JSON"}, status=400)
+        self.sim_trades[sim] = self.sim_trades.get(sim, 0) + 1
+        self.stats["sim_trades"] += 1
+        return web.json_response({"ok": True, "id": self.stats["sim_trades"]})
+
+    async def stats_handler(self, request):
+        return web.json_response(self.snapshot())
+
+    def snapshot(self):
+        return dict(self.stats, sim_time=self.clock.time(), trade_rate=self.trade_rate, book_rate=self.book_rate,
+                    binance_clients=len(self.binance), poly_clients=len(self.poly),
+                    max_queue=max((c.queue.qsize() for c in self.binance + self.poly), default=0),
+                    broke_at=self.broke_at, sim_trades_by_id=self.sim_trades)
+
+    def app(self):
+        app = web.Application(middlewares=[self.http_faults])
+        app.router.add_get("/api/v3/klines", self.klines)
+        app.router.add_get("/book", self.order_book)
+        app.router.add_get("/events", self.events)
+        app.router.add_get("/markets", self.markets)
+        app.router.add_post("/simulations/{sim}/trade", self.sim_trade)
+        app.router.add_get("/stats", self.stats_handler)
+        app.router.add_get("/stream", self.stream_handler)
+        app.router.add_get("/ws/{stream}", self.ws_handler)
+        return app
+
+    # --- Control ---
+
+    async def _monitor(self):
+        last, last_t = dict(self.stats), time.monotonic()
+        next_ramp = time.monotonic() + self.ramp_every
+        while True:
+            await asyncio.sleep(1)
+            now = time.monotonic()
+            if self.ramp != 1 and now >= next_ramp:
+                self.trade_rate *= self.ramp
+                self.book_rate *= self.ramp
+                next_ramp = now + self.ramp_every
+                logger.info(f"📈 Rates now {self.trade_rate:,.0f} trades/s, {self.book_rate:,.0f} book msgs/s per round")
+            if now - last_t >= self.stats_every:
+                dt = now - last_t
+                s = self.snapshot()
+                rate = lambda k: (s[k] - last[k]) / dt
+                logger.info(f"🏭 {_iso(s['sim_time'])} | binance {rate('binance_msgs'):,.0f}/s, poly {rate('poly_msgs'):,.0f}/s "
+                            f"| clients {s['binance_clients']}+{s['poly_clients']} | max queue {s['max_queue']} "
+                            f"| http {s['http']} ({s['http_errors']} faults) | sim trades {s['sim_trades']} "
+                            f"| disconnects {s['disconnects']}, slow {s['slow_clients']}")
+                last, last_t = dict(self.stats), now
+            if self.soak_until and self.clock.time() >= self.soak_until: return
+
+    def bot_env(self, host, port):
+        http, ws = f"http://{host}:{port}", f"ws://{host}:{port}"
+        start = int(self.clock.time()) // ROUND_SECONDS * ROUND_SECONDS
+        return {"CLOCK_SPEED": self.speed, "CLOCK_ORIGIN": self.clock.origin, "CLOB_HOST": http, "GAMMA_API": http,
+                "BINANCE_API": f"{http}/api/v3", "BINANCE_WS_HOST": ws, "POLY_WS_HOST": f"{ws}/ws",
+                "API_URL": http, "SIMULATION_ID": "soak", "BINANCE_PAIR": self.symbol,
+                "MARKET_SLUG": f"{self.prefix}-{start}"}
+
+    async def serve(self, host, port):
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"🏭 Synthetic exchange on {host}:{port} | {self.speed:g}x time | {self.trade_rate:,.0f} trades/s, "
+                    f"{self.book_rate:,.0f} book msgs/s per round")
+        print(" ".join(f"{k}={v}" for k, v in self.bot_env(host, port).items()), flush=True)
+        tasks = [asyncio.create_task(self._binance_loop()), asyncio.create_task(self._book_loop())]
+        try:
+            await self._monitor()
+            s = self.snapshot()
+            logger.info(f"🏁 Soak done: {s['rounds_listed']} rounds listed, {s['rounds_resolved']} resolved | "
+                        f"{s['binance_msgs']:,} binance + {s['poly_msgs']:,} poly msgs | sim trades {s['sim_trades']} | "
+                        f"disconnects {s['disconnects']}, slow clients {s['slow_clients']}")
+            print(json.dumps(s), flush=True)
+        finally:
+            for t in tasks: t.cancel()
+            await runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local synthetic Binance / Polymarket / sim API for load and soak tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--symbol", default="BTCUSDT")
+    parser.add_argument("--slug-prefix", default="btc-updown-15m")
+    parser.add_argument("--speed", type=float, default=1.0, help="Market seconds per wall second")
+    parser.add_argument("--origin", type=float, help="Epoch the accelerated clock starts from (default now)")
+    parser.add_argument("--soak-hours", type=float, help="Stop after this many market hours and print a summary")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--price", type=float, default=100000.0, help="Starting price")
+    parser.add_argument("--vol", type=float, default=2.0, help="Price path stddev per market second")
+    parser.add_argument("--trade-rate", type=float, default=50.0, help="Binance messages per wall second")
+    parser.add_argument("--book-rate", type=float, default=10.0, help="price_change messages per wall second per round")
+    parser.add_argument("--burst", type=float, default=1.0, help="Mean messages per burst (1 = plain Poisson)")
+    parser.add_argument("--depth", type=int, default=10, help="Book levels per side")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=float, default=0.0, help="Mean socket lifetime in wall seconds (0 = never)")
+    parser.add_argument("--http-error-rate", type=float, default=0.0, help="Fraction of HTTP requests answered 503")
+    parser.add_argument("--listing-lead", type=float, default=300.0, help="Market seconds a round is listed before it starts")
+    parser.add_argument("--resolve-delay", type=float, default=120.0, help="Market seconds from a round's end to its resolution")
+    parser.add_argument("--max-queue", type=int, default=10000, help="Queued messages before a socket counts as too slow")
+    parser.add_argument("--ramp", type=float, default=1.0, help="Rate multiplier applied every --ramp-every seconds")
+    parser.add_argument("--ramp-every", type=float, default=30.0)
+    parser.add_argument("--stats-every", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S",
+                        handlers=[logging.StreamHandler(sys.stdout)])
+
+    try: asyncio.run(Exchange(args).serve(args.host, args.port))
+    except KeyboardInterrupt: pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Shared, multiplexed market data feeds for hosting many bots in one process.
+
+BinanceFeed keeps one combined-stream connection for every subscribed stream
+(<symbol>@trade, @aggTrade or @bookTicker) and fans each decoded tick out to
+that stream's subscribers.
+PolymarketFeed keeps one market channel connection and subscribes /
+unsubscribes assets_ids on it as rounds come and go, routing each message to
+the bot that owns the asset. Both reconnect on their own (see
+volbot.liveness) and live for the whole process, not one round; each keeps a
+FeedHealth the hosted bots read to stop trading while the feed is stale.
+"""
+
+import json
+import asyncio
+import logging
+from time import perf_counter
+import websockets
+
+from volbot.clock import WallClock
+from volbot.decode import get_decoder
+from volbot.metrics import FeedMetrics
+from volbot.liveness import Backoff, FeedHealth, watchdog, retry_delay
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+BINANCE_WS_HOST = "wss://stream.binance.com:9443"
+POLY_WS_HOST = "wss://ws-subscriptions-clob.polymarket.com/ws"
+PING_SECONDS = 5
+
+
+class BinanceFeed:
+    def __init__(self, clock=None, host=BINANCE_WS_HOST, metrics=None, timeout=10.0):
+        self.clock = clock or WallClock()
+        self.decoder = get_decoder()
+        self.lat = FeedMetrics(metrics, "binance") if metrics else None
+        self.health = FeedHealth("binance", metrics)
+        self.timeout = timeout   # silence (receive time) before the socket is considered dead
+        self.host = host
+        self.subs = {}           # {"<symbol>@<kind>": [callback(price, qty, exch_ts, recv_ts, side)]}
+        self.connect_hooks = []  # called on every (re)connect
+        self.ws = None
+        self.task = None
+        self._ready = asyncio.Event()
+        self._msg_id = 0
+
+    def subscribe(self, symbol, callback, on_connect=None, stream="trade"):
+        s = f"{symbol.lower()}@{stream}"
+        new = s not in self.subs
+        self.subs.setdefault(s, []).append(callback)
+        if on_connect: self.connect_hooks.append(on_connect)
+        if new and self.ws: asyncio.create_task(self._control("SUBSCRIBE", [s]))
+        self._ready.set()
+
+    def unsubscribe(self, symbol, callback, on_connect=None, stream="trade"):
+        s = f"{symbol.lower()}@{stream}"
+        subs = self.subs.get(s)
+        if subs and callback in subs: subs.remove(callback)
+        if on_connect in self.connect_hooks: self.connect_hooks.remove(on_connect)
+        if subs is not None and not subs:
+            del self.subs[s]
+            if self.ws: asyncio.create_task(self._control("UNSUBSCRIBE", [s]))
+
+    async def _control(self, method, streams):
+        self._msg_id += 1
+        try:
+            await self.ws.send(json.dumps({"method": method, "params": streams, "id": self._msg_id}))
+        except Exception as e:
+            logger.warning(f"⚠️ Binance {method} failed for {streams}: {e}")
+
+    def start(self):
+        if self.task is None: self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            try: await self.task
+            except asyncio.CancelledError: pass
+            self.task = None
+
+    async def _run(self):
+        health, backoff = self.health, Backoff()
+        while True:
+            await self._ready.wait()
+            if not self.subs:
+                self._ready.clear(); continue
+            streams = "/".join(self.subs)
+            url = f"{self.host}/stream?streams={streams}"
+            dog = None
+            try:
+                async with websockets.connect(url) as ws:
+                    self.ws = ws
+                    logger.info(f"✅ Connected to Binance combined stream: {', '.join(self.subs)}")
+                    health.on_connect(self.clock.time())
+                    if self.timeout: dog = asyncio.create_task(watchdog(ws, health, self.clock, self.timeout))
+                    for hook in list(self.connect_hooks): hook()
+                    lat = self.lat
+                    async for msg in ws:
+                        recv_ts = health.last = self.clock.time()
+                        if lat: t = perf_counter()
+                        trade = self.decoder.binance_stream(msg)
+                        if lat:
+                            lat.recv_to_decode.record(perf_counter() - t)
+                            lat.messages.value += 1
+                        if trade is None: continue  # SUBSCRIBE / UNSUBSCRIBE acks
+                        stream, price, qty, exch_ms, maker = trade
+                        subs = self.subs.get(stream)
+                        if not subs: continue
+                        exch_ts = (exch_ms or recv_ts * 1000) / 1000
+                        side = -1 if maker else 1
+                        for cb in subs: await cb(price, qty, exch_ts, recv_ts, side)
+                    raise ConnectionError("connection closed")
+            except Exception as e:
+                delay = retry_delay(health, backoff, self.clock.time())
+                logger.error(f"Binance WS Error: {e} (reconnecting in {delay:.1f}s)")
+                if delay: await self.clock.sleep(delay)
+            finally:
+                self.ws = None
+                if dog: dog.cancel()
+
+
+class PolymarketFeed:
+    def __init__(self, clock=None, host=POLY_WS_HOST, metrics=None, timeout=24.0):
+        self.clock = clock or WallClock()
+        self.decoder = get_decoder()
+        self.lat = FeedMetrics(metrics, "polymarket") if metrics else None
+        self.health = FeedHealth("polymarket", metrics)
+        self.timeout = timeout   # silence, PONGs included, before the socket is considered dead
+        self.url = f"{host}/market"
+        self.subs = {}  # {asset_id: callback(item, recv_ts)}
+        self.connect_hooks = []  # called on every (re)connect, after the subscription is sent
+        self.ws = None
+        self.task = None
+        self._ready = asyncio.Event()
+
+    def subscribe(self, asset_ids, callback):
+        new = [a for a in asset_ids if a not in self.subs]
+        for a in asset_ids: self.subs[a] = callback
+        if new and self.ws: asyncio.create_task(self._control("subscribe", new))
+        if self.subs: self._ready.set()
+
+    def unsubscribe(self, asset_ids):
+        gone = [a for a in asset_ids if self.subs.pop(a, None) is not None]
+        if gone and self.ws: asyncio.create_task(self._control("unsubscribe", gone))
+
+    async def _control(self, operation, asset_ids):
+        try:
+            await self.ws.send(json.dumps({"assets_ids": asset_ids, "operation": operation}))
+        except Exception as e:
+            logger.warning(f"⚠️ Polymarket {operation} failed: {e}")
+
+    def start(self):
+        if self.task is None: self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            try: await self.task
+            except asyncio.CancelledError: pass
+            self.task = None
+
+    def _route(self, item):
+        asset_id = item.get("asset_id")
+        if asset_id:
+            cb = self.subs.get(asset_id)
+            return (cb,) if cb else ()
+        # price_change batches can carry several assets
+        cbs = []
+        for c in item.get("changes", ()):
+            cb = self.subs.get(c[0])
+            if cb and cb not in cbs: cbs.append(cb)
+        return cbs
+
+    async def _run(self):
+        health, backoff = self.health, Backoff()
+        while True:
+            await self._ready.wait()
+            if not self.subs:
+                self._ready.clear(); continue
+            dog = None
+            try:
+                async with websockets.connect(self.url) as ws:
+                    self.ws = ws
+                    ping = asyncio.create_task(self._ping(ws))
+                    try:
+                        await ws.send(json.dumps({"assets_ids": list(self.subs), "type": "market"}))
+                        health.on_connect(self.clock.time())
+                        if self.timeout: dog = asyncio.create_task(watchdog(ws, health, self.clock, self.timeout))
+                        for hook in list(self.connect_hooks): hook()
+                        lat = self.lat
+                        async for msg in ws:
+                            recv_ts = health.last = self.clock.time()
+                            if msg == "PONG": continue
+                            if lat: t = perf_counter()
+                            items = self.decoder.market(msg)
+                            if lat:
+                                lat.recv_to_decode.record(perf_counter() - t)
+                                lat.messages.value += 1
+                            for item in items:
+                                for cb in self._route(item): await cb(item, recv_ts)
+                        raise ConnectionError("connection closed")
+                    finally:
+                        ping.cancel()
+            except Exception as e:
+                delay = retry_delay(health, backoff, self.clock.time())
+                logger.error(f"Market WS Error: {e} (reconnecting in {delay:.1f}s)")
+                if delay: await self.clock.sleep(delay)
+            finally:
+                self.ws = None
+                if dog: dog.cancel()
+
+    async def _ping(self, ws):
+        try:
+            while True:
+                await self.clock.sleep(PING_SECONDS); await ws.send("PING")
+        except Exception: pass
+
+
+class MarketFeeds:
+    """The pair of shared connections handed to every hosted VolatilityBot."""
+
+    def __init__(self, clock=None, metrics=None, binance_host=BINANCE_WS_HOST, poly_host=POLY_WS_HOST):
+        self.binance = BinanceFeed(clock, binance_host, metrics)
+        self.poly = PolymarketFeed(clock, poly_host, metrics)
+
+    def start(self):
+        self.binance.start()
+        self.poly.start()
+
+    async def close(self):
+        await self.binance.close()
+        await self.poly.close()
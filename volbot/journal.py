@@ -0,0 +1,227 @@
+"""
+Append-only wallet journal with snapshots (JOURNAL_DIR).
+
+Every change to the simulated wallet is one compact binary record, appended
+by a background thread that fsyncs once per batch (group commit). Wallet
+records are deltas, so recovery is just addition:
+
+    FILL / SETTLE / ADJUST   balance, inventory[asset], inventory_cost[asset],
+                             realized_pnl and cumulative_cost deltas
+    ROUND                    a new live round (cumulative_cost restarts at 0)
+    PARAM                    strategy parameter change
+    PENDING / RESOLVED       provisional settlements awaiting the official result
+
+The writer mirrors the state it has written; every SNAPSHOT_EVERY records it
+writes snapshot.json and starts a new journal file, deleting the old ones. On
+start, recovery loads the snapshot and replays only the current file's tail,
+so restart time does not grow with uptime. A torn last record is dropped.
+
+Layout:
+    JOURNAL_DIR/snapshot.json
+    JOURNAL_DIR/journal.<seq>.bin    frames: u32 length, u32 crc32, u8 kind, payload
+"""
+
+import os
+import json
+import zlib
+import queue
+import struct
+import logging
+import threading
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+FILL, SETTLE, ADJUST, ROUND = 1, 2, 3, 4
+PARAM, PENDING, RESOLVED = 10, 11, 12
+KIND_NAMES = {FILL: "FILL", SETTLE: "SETTLE", ADJUST: "ADJUST", ROUND: "ROUND",
+              PARAM: "PARAM", PENDING: "PENDING", RESOLVED: "RESOLVED"}
+
+_FRAME = struct.Struct("<IIB")     # payload length, crc32(kind + payload), kind
+_DELTA = struct.Struct("<dddddd")  # ts, d_balance, d_inventory, d_cost, d_realized, d_cumulative_cost
+
+_STOP = object()
+
+
+def empty_state():
+    return {"balance": None, "inventory": {}, "inventory_cost": {}, "realized_pnl": 0.0,
+            "cumulative_cost": 0.0, "round": None, "round_of": {}, "params": {}, "pending": {},
+            "seq": 0, "records": 0}
+
+
+def apply(state, kind, payload):
+    """Applies one decoded record to a state dict (recovery and the writer's mirror)."""
+    if kind in (FILL, SETTLE, ADJUST):
+        ts, d_bal, d_inv, d_cost, d_real, d_cum, asset = payload
+        state["balance"] = (state["balance"] or 0.0) + d_bal
+        state["realized_pnl"] += d_real
+        state["cumulative_cost"] += d_cum
+        if asset:
+            inv = state["inventory"][asset] = state["inventory"].get(asset, 0.0) + d_inv
+            state["inventory_cost"][asset] = state["inventory_cost"].get(asset, 0.0) + d_cost
+            if kind == FILL and state["round"]: state["round_of"][asset] = state["round"]
+            if inv <= 1e-9:
+                # Flat positions leave the state, so snapshots stay small
+                del state["inventory"][asset]; state["inventory_cost"].pop(asset, None)
+                state["round_of"].pop(asset, None)
+    elif kind == ROUND:
+        state["round"] = payload["slug"]
+        state["cumulative_cost"] = 0.0
+        if payload.get("balance") is not None and state["balance"] is None: state["balance"] = payload["balance"]
+    elif kind == PARAM:
+        state["params"][payload["name"]] = payload["value"]
+    elif kind == PENDING:
+        state["pending"][payload["slug"]] = payload
+    elif kind == RESOLVED:
+        state["pending"].pop(payload["slug"], None)
+
+
+def _encode(kind, payload):
+    if kind in (FILL, SETTLE, ADJUST):
+        body = _DELTA.pack(*payload[:6]) + payload[6].encode()
+    else:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+    return _FRAME.pack(len(body), zlib.crc32(bytes((kind,)) + body), kind) + body
+
+
+def _decode(kind, body):
+    if kind in (FILL, SETTLE, ADJUST):
+        return _DELTA.unpack_from(body) + (body[_DELTA.size:].decode(),)
+    return json.loads(body)
+
+
+def read_records(path):
+    """Yields (kind, payload, end_offset) for every intact frame; stops at the first torn or corrupt one."""
+    with open(path, "rb") as f: data = f.read()
+    pos, n = 0, len(data)
+    while pos + _FRAME.size <= n:
+        length, crc, kind = _FRAME.unpack_from(data, pos)
+        start = pos + _FRAME.size
+        body = data[start:start + length]
+        if len(body) < length or zlib.crc32(bytes((kind,)) + body) != crc: return
+        pos = start + length
+        yield kind, _decode(kind, body), pos
+
+
+def recover(root):
+    """Latest snapshot plus the journal tail after it. Truncates a torn tail in place."""
+    state = empty_state()
+    snap = os.path.join(root, "snapshot.json")
+    if os.path.exists(snap):
+        with open(snap) as f: state.update(json.load(f))
+    path = _segment_path(root, state["seq"])
+    if os.path.exists(path):
+        good = 0
+        for kind, payload, end in read_records(path):
+            apply(state, kind, payload)
+            state["records"] += 1
+            good = end
+        if good < os.path.getsize(path):
+            logger.warning(f"⚠️ Journal: dropping torn tail of {path} ({os.path.getsize(path) - good} bytes)")
+            with open(path, "r+b") as f: f.truncate(good)
+    return state
+
+
+def _segment_path(root, seq):
+    return os.path.join(root, f"journal.{seq:08d}.bin")
+
+
+class Journal:
+    def __init__(self, root, snapshot_every=1000, commit_interval=0.002):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.snapshot_every = snapshot_every
+        self.commit_interval = commit_interval
+        self.state = recover(root)  # what the bot restores from; the writer thread owns it afterwards
+        self.recovered = json.loads(json.dumps(self.state))
+        self.round = self.state["round"]
+        self.queue = queue.SimpleQueue()
+        self.commits = 0
+        self.thread = threading.Thread(target=self._writer, name="wallet-journal", daemon=True)
+        self.thread.start()
+
+    # --- Event loop thread ---
+
+    def delta(self, kind, ts, asset, d_balance=0.0, d_inventory=0.0, d_cost=0.0, d_realized=0.0, d_cumulative=0.0):
+        self.queue.put((kind, (ts, d_balance, d_inventory, d_cost, d_realized, d_cumulative, asset or "")))
+
+    def start_round(self, ts, slug, balance=None):
+        """Returns False if the journal is already on this round (restart mid-round)."""
+        if slug == self.round: return False
+        self.round = slug
+        self.queue.put((ROUND, {"ts": ts, "slug": slug, "balance": balance}))
+        return True
+
+    def params(self, ts, params):
+        """Journals the parameters that differ from the last journaled values."""
+        last = self.recovered["params"]
+        for name, value in params.items():
+            if last.get(name) != value:
+                self.queue.put((PARAM, {"ts": ts, "name": name, "value": value}))
+                last[name] = value
+
+    def pending(self, rnd):
+        self.queue.put((PENDING, rnd))
+
+    def resolved(self, ts, slug):
+        self.queue.put((RESOLVED, {"ts": ts, "slug": slug}))
+
+    def close(self, timeout=5.0):
+        self.queue.put((_STOP, None))
+        self.thread.join(timeout)
+
+    # --- Writer thread ---
+
+    def _writer(self):
+        state = self.state
+        f = open(_segment_path(self.root, state["seq"]), "ab")
+        since_snapshot = state["records"]
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            if self.commit_interval:
+                # Group commit: let concurrent records join this fsync
+                try: batch.append(self.queue.get(timeout=self.commit_interval))
+                except queue.Empty: pass
+            try:
+                while len(batch) < 4096: batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            frames = []
+            for kind, payload in batch:
+                if kind is _STOP:
+                    running = False
+                    continue
+                frames.append(_encode(kind, payload))
+                apply(state, kind, payload)
+            if frames:
+                try:
+                    f.write(b"".join(frames)); f.flush()
+                    os.fsync(f.fileno())
+                    self.commits += 1
+                except OSError as e:
+                    logger.error(f"Journal write failed: {e}")
+                since_snapshot += len(frames)
+            if since_snapshot >= self.snapshot_every or (not running and since_snapshot):
+                f = self._snapshot(f, state)
+                since_snapshot = 0
+        f.close()
+
+    def _snapshot(self, f, state):
+        """Writes snapshot.json for the state so far and rotates to a fresh journal file."""
+        try:
+            old_seq = state["seq"]
+            state["seq"] = old_seq + 1
+            state["records"] = 0
+            new = open(_segment_path(self.root, state["seq"]), "ab")
+            path = os.path.join(self.root, "snapshot.json")
+            tmp = path + ".tmp"
+            with open(tmp, "w") as out:
+                json.dump(state, out)
+                out.flush(); os.fsync(out.fileno())
+            os.replace(tmp, path)
+            f.close()
+            os.remove(_segment_path(self.root, old_seq))
+            return new
+        except OSError as e:
+            logger.error(f"Journal snapshot failed: {e}")
+            return f
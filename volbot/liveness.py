@@ -0,0 +1,88 @@
+"""
+Feed liveness: heartbeat tracking, reconnect backoff and a dead-socket watchdog.
+
+A FeedHealth follows one WebSocket feed. The reader stamps `last` with the
+local receive time of every message (never the exchange timestamp, which is
+on another host's clock); on the market channel PONG replies to our PINGs
+are the heartbeat. The bot
+reads it to stop trading on a stale feed, and the watchdog closes a socket
+that has gone silent for longer than its deadline (a half-open TCP
+connection never raises by itself).
+
+Reconnects retry immediately once, then back off exponentially with jitter,
+so a brief blip costs one round trip and an outage does not hammer the
+exchange.
+"""
+
+import random
+
+
+class Backoff:
+    """Reconnect delays: 0 for the first retry, then base * 2^n with equal jitter, capped."""
+
+    def __init__(self, base=0.5, cap=30.0):
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+
+    def next(self):
+        n = self.attempt
+        self.attempt += 1
+        if n == 0: return 0.0
+        delay = min(self.cap, self.base * 2 ** (n - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def reset(self):
+        self.attempt = 0
+
+
+class FeedHealth:
+    """Connection state, newest message time and downtime of one feed."""
+
+    def __init__(self, name, metrics=None):
+        self.name = name
+        self.connected = False
+        self.last = 0.0          # newest message (heartbeat) time
+        self.connected_at = 0.0
+        self.down_since = None   # set from the first failure until the next connect
+        self.downtime = 0.0      # completed outages, seconds
+        self.disconnects = 0
+        self.downtime_total = metrics.counter("feed_downtime_seconds_total", feed=name) if metrics else None
+        self.disconnects_total = metrics.counter("feed_disconnects_total", feed=name) if metrics else None
+
+    def on_connect(self, now):
+        if self.down_since is not None:
+            down = max(now - self.down_since, 0.0)
+            self.downtime += down
+            if self.downtime_total: self.downtime_total.value += down
+            self.down_since = None
+        self.connected = True
+        self.connected_at = self.last = now
+
+    def on_disconnect(self, now):
+        """Returns True if the connection that just dropped had delivered messages (worth retrying at once)."""
+        was_live = self.connected and self.last > self.connected_at
+        if self.connected:
+            self.disconnects += 1
+            if self.disconnects_total: self.disconnects_total.value += 1
+        self.connected = False
+        if self.down_since is None: self.down_since = now
+        return was_live
+
+    def total_downtime(self, now):
+        return self.downtime + (now - self.down_since if self.down_since is not None else 0.0)
+
+
+async def watchdog(ws, health, clock, timeout):
+    """Closes `ws` once nothing has arrived for `timeout` seconds, so the reader reconnects."""
+    while True:
+        await clock.sleep(timeout / 4)
+        if clock.time() - health.last > timeout:
+            await ws.close()
+            return
+
+
+def retry_delay(health, backoff, now):
+    """Records a dropped connection and returns how long to wait before reconnecting."""
+    if health.on_disconnect(now): backoff.reset()
+    return backoff.next()
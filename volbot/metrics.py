@@ -0,0 +1,268 @@
+"""
+Hot-path latency instrumentation.
+
+Latencies go into HDR-style log-linear histograms (microsecond resolution,
+~3% relative error, fixed memory). Recording a sample is a single list
+append; the metrics task bins pending samples every lag interval, off the
+hot path. The registry is exposed in Prometheus text format on a local HTTP endpoint and
+summarized to the log periodically.
+
+    METRICS=1                       enable (also implied by METRICS_PORT)
+    METRICS_PORT=9108               serve /metrics on 127.0.0.1:<port>
+    METRICS_SUMMARY_INTERVAL=60     seconds between log summaries (0 = off)
+"""
+
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+# Bucket edges published to Prometheus (seconds); the summary uses full HDR precision
+EXPORT_BUCKETS = [m * 10.0 ** e for e in range(-6, 2) for m in (1, 2, 5)]
+
+
+class Histogram:
+    """
+    Log-linear histogram over integer microseconds: values below 2**(bits+1)
+    get their own bucket, above that each power of two is split into
+    2**bits sub-buckets. record(seconds) only queues the sample; fold() bins.
+    """
+
+    __slots__ = ("name", "labels", "bits", "sub", "counts", "count", "total", "max", "_last", "pending", "record")
+
+    def __init__(self, name, labels=None, bits=5, max_bits=36):
+        self.name = name
+        self.labels = labels or {}
+        self.bits = bits
+        self.sub = 1 << (bits + 1)
+        self.counts = [0] * ((max_bits - bits) << bits)
+        self._last = len(self.counts) - 1
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.pending = []
+        self.record = self.pending.append
+
+    def fold(self):
+        pending = self.pending
+        if not pending: return
+        samples = pending[:]
+        pending.clear()
+        counts, sub, bits, last = self.counts, self.sub, self.bits, self._last
+        for seconds in samples:
+            if seconds < 0: seconds = 0.0
+            self.total += seconds
+            if seconds > self.max: self.max = seconds
+            v = int(seconds * 1e6)
+            if v < sub:
+                counts[v] += 1
+            else:
+                shift = v.bit_length() - bits - 1
+                i = (shift << bits) + (v >> shift)
+                counts[i if i < last else last] += 1
+        self.count += len(samples)
+
+    def _upper(self, i):
+        """Exclusive upper edge of bucket i, in seconds."""
+        if i < self.sub: return (i + 1) / 1e6
+        shift = (i >> self.bits) - 1
+        return ((i - (shift << self.bits) + 1) << shift) / 1e6
+
+    def percentile(self, q):
+        self.fold()
+        if not self.count: return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank: return min(self._upper(i), self.max)
+        return self.max
+
+    def cumulative(self, edges):
+        """[(le, count <= le)] for the given bucket edges (seconds)."""
+        self.fold()
+        out, seen, i = [], 0, 0
+        n = len(self.counts)
+        for le in edges:
+            while i < n and self._upper(i) <= le + 1e-12:
+                seen += self.counts[i]; i += 1
+            out.append((le, seen))
+        return out
+
+
+class Counter:
+    __slots__ = ("name", "labels", "value", "_last")
+
+    def __init__(self, name, labels=None):
+        self.name = name
+        self.labels = labels or {}
+        self.value = 0
+        self._last = 0
+
+
+class Metrics:
+    """Registry shared by every bot (and feed) in the process."""
+
+    HELP = {
+        "exchange_to_receive_seconds": "Exchange event time to local receive (includes clock skew)",
+        "receive_to_decode_seconds": "Socket receive to decoded message",
+        "decode_to_decision_seconds": "Decoded tick to strategy evaluation start",
+        "decision_to_fill_seconds": "Strategy evaluation start to simulated fill",
+        "lock_wait_seconds": "Wait to acquire the bot's state lock",
+        "loop_lag_seconds": "Event loop scheduling lag",
+        "messages_total": "WebSocket messages received",
+        "startup_seconds": "Cold start: imports, each startup step and time to first decision",
+        "feed_downtime_seconds_total": "Time a feed spent disconnected (completed outages)",
+        "feed_disconnects_total": "Feed connections lost",
+        "stale_decisions_total": "Strategy evaluations suppressed because a feed was stale",
+        "worker_restarts_total": "Strategy worker processes restarted by the feed process (volbot.shard)",
+    }
+
+    def __init__(self, port=None, summary_interval=60.0, prefix="volbot_"):
+        self.port = port
+        self.summary_interval = summary_interval
+        self.prefix = prefix
+        self.histograms = {}  # {(name, labels): Histogram}
+        self.counters = {}    # {(name, labels): Counter}
+        self.tasks = []
+        self.runner = None
+        self._last_summary = time.monotonic()
+
+    def histogram(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        h = self.histograms.get(key)
+        if h is None: h = self.histograms[key] = Histogram(name, labels)
+        return h
+
+    def counter(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        c = self.counters.get(key)
+        if c is None: c = self.counters[key] = Counter(name, labels)
+        return c
+
+    def fold(self):
+        for h in self.histograms.values(): h.fold()
+
+    # --- Export ---
+
+    def _series(self, name, labels, extra=None):
+        items = dict(labels, **(extra or {}))
+        if not items: return self.prefix + name
+        return self.prefix + name + "{" + ",".join(f'{k}="{v}"' for k, v in items.items()) + "}"
+
+    def render(self):
+        """Prometheus text exposition format."""
+        self.fold()
+        lines, typed = [], set()
+        for c in self.counters.values():
+            if c.name not in typed:
+                typed.add(c.name)
+                lines.append(f"# HELP {self.prefix}{c.name} {self.HELP.get(c.name, c.name)}")
+                lines.append(f"# TYPE {self.prefix}{c.name} counter")
+            lines.append(f"{self._series(c.name, c.labels)} {c.value}")
+        for h in self.histograms.values():
+            if h.name not in typed:
+                typed.add(h.name)
+                lines.append(f"# HELP {self.prefix}{h.name} {self.HELP.get(h.name, h.name)}")
+                lines.append(f"# TYPE {self.prefix}{h.name} histogram")
+            for le, n in h.cumulative(EXPORT_BUCKETS):
+                lines.append(f"{self._series(h.name + '_bucket', h.labels, {'le': f'{le:g}'})} {n}")
+            lines.append(f"{self._series(h.name + '_bucket', h.labels, {'le': '+Inf'})} {h.count}")
+            lines.append(f"{self._series(h.name + '_sum', h.labels)} {h.total:.9f}")
+            lines.append(f"{self._series(h.name + '_count', h.labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        now = time.monotonic()
+        elapsed = max(now - self._last_summary, 1e-9)
+        self._last_summary = now
+        self.fold()
+        parts = []
+        for c in self.counters.values():
+            if c.name != "messages_total":  # plain totals (downtime, disconnects, suppressed decisions)
+                label = c.name.replace("_total", "") + (f"[{'/'.join(c.labels.values())}]" if c.labels else "")
+                if c.value: parts.append(f"{label}: {c.value:g}")
+                continue
+            rate = (c.value - c._last) / elapsed
+            c._last = c.value
+            parts.append(f"{'/'.join(c.labels.values()) or c.name}: {rate:.1f} msg/s")
+        for h in self.histograms.values():
+            if not h.count: continue
+            label = h.name.replace("_seconds", "") + (f"[{'/'.join(h.labels.values())}]" if h.labels else "")
+            parts.append(f"{label} p50 {h.percentile(0.5) * 1000:.3f} p99 {h.percentile(0.99) * 1000:.3f} "
+                         f"max {h.max * 1000:.3f}ms")
+        return " | ".join(parts)
+
+    # --- Background tasks ---
+
+    async def start(self, lag_interval=0.1):
+        if self.tasks: return
+        self.tasks.append(asyncio.create_task(self._loop_lag(lag_interval)))
+        if self.summary_interval: self.tasks.append(asyncio.create_task(self._summaries(self.summary_interval)))
+        if self.port: await self._serve(self.port)
+
+    async def _serve(self, port):
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", port).start()
+        logger.info(f"📈 Metrics on http://127.0.0.1:{port}/metrics")
+
+    async def _loop_lag(self, interval):
+        lag = self.histogram("loop_lag_seconds")
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag.record(loop.time() - expected)
+            self.fold()
+
+    async def _summaries(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(f"⏱️ {self.summary()}")
+
+    async def close(self):
+        for t in self.tasks: t.cancel()
+        self.tasks = []
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+def metrics_from_env(env):
+    """Metrics registry if METRICS / METRICS_PORT is set, else None."""
+    port = int(env("METRICS_PORT") or "0")
+    if not port and (env("METRICS") or "").lower() not in ("1", "true", "yes"): return None
+    return Metrics(port, float(env("METRICS_SUMMARY_INTERVAL") or "60"))
+
+
+class FeedMetrics:
+    """Handles for one feed: message counter plus exchange->receive and receive->decode histograms."""
+
+    __slots__ = ("messages", "exch_to_recv", "recv_to_decode")
+
+    def __init__(self, metrics, feed):
+        self.messages = metrics.counter("messages_total", feed=feed)
+        self.exch_to_recv = metrics.histogram("exchange_to_receive_seconds", feed=feed)
+        self.recv_to_decode = metrics.histogram("receive_to_decode_seconds", feed=feed)
+
+
+class BotMetrics:
+    """Pre-resolved handles for VolatilityBot's hot paths (no registry lookups per tick)."""
+
+    __slots__ = ("binance", "poly", "decode_to_decision", "decision_to_fill", "lock_wait")
+
+    def __init__(self, metrics):
+        self.binance = FeedMetrics(metrics, "binance")
+        self.poly = FeedMetrics(metrics, "polymarket")
+        self.decode_to_decision = metrics.histogram("decode_to_decision_seconds")
+        self.decision_to_fill = metrics.histogram("decision_to_fill_seconds")
+        self.lock_wait = metrics.histogram("lock_wait_seconds")
@@ -0,0 +1,90 @@
+"""
+Hosts several VolatilityBot instances in one process.
+
+All instances share one Binance combined-stream connection, one Polymarket
+market channel connection and one pooled HTTP client. Each instance keeps
+its own wallet, inventory and strategy state, and its own config.
+
+Config is a JSON file (or the MARKETS_CONFIG env var holding the JSON):
+
+    {
+      "defaults": {"VOLATILITY_K": 0.6, "API_URL": "http://localhost:3001"},
+      "markets": [
+        {"MARKET_SLUG": "btc-updown-15m-1760000000", "BINANCE_PAIR": "BTCUSDT", "SIMULATION_ID": "a"},
+        {"MARKET_SLUG": "eth-updown-15m-1760000000", "BINANCE_PAIR": "ETHUSDT", "SIMULATION_ID": "b"}
+      ]
+    }
+
+Keys are the same names the single bot reads from the environment; anything
+not set falls back to the environment.
+
+    python -m volbot.multi markets.json
+
+To spread the markets over several cores, run the same config with volbot.shard.
+"""
+
+import os
+import sys
+import json
+import asyncio
+
+from example import VolatilityBot, logger
+from volbot.net import HttpClient
+from volbot.clock import clock_from_env
+from volbot.feeds import MarketFeeds, BINANCE_WS_HOST, POLY_WS_HOST
+from volbot.metrics import metrics_from_env
+from volbot.eventlog import event_log_from_env, DumpOnError
+
+
+def load_config(path=None):
+    if path:
+        with open(path) as f: return json.load(f)
+    raw = os.getenv("MARKETS_CONFIG")
+    if not raw: raise SystemExit("Usage: python -m volbot.multi markets.json (or set MARKETS_CONFIG)")
+    return json.loads(raw)
+
+
+async def run_markets(config, feeds=None):
+    """feeds: the shared connections, if the caller provides them (volbot.shard workers read a bus instead)."""
+    defaults = config.get("defaults", {})
+    http = HttpClient()
+    env = lambda name: str(defaults[name]) if name in defaults else os.getenv(name)
+    # One metrics registry / endpoint for the whole process (METRICS_* from defaults or env)
+    metrics = metrics_from_env(env)
+    # One event log (EVENT_LOG_*) and one dump trigger for the whole process; events carry their market
+    events = event_log_from_env(env)
+    dump_handler = DumpOnError(events) if events else None
+    if dump_handler: logger.addHandler(dump_handler)
+    feeds = feeds or MarketFeeds(clock=clock_from_env(env), metrics=metrics,
+                                 binance_host=env("BINANCE_WS_HOST") or BINANCE_WS_HOST,
+                                 poly_host=env("POLY_WS_HOST") or POLY_WS_HOST)
+    bots = [VolatilityBot(config=dict(defaults, **market), http=http, feeds=feeds, metrics=metrics, events=events)
+            for market in config.get("markets", [])]
+    logger.info(f"🧩 Hosting {len(bots)} markets in process {os.getpid()}")
+    if metrics: await metrics.start()
+    feeds.start()
+    try:
+        results = await asyncio.gather(*(bot.run() for bot in bots), return_exceptions=True)
+        for bot, res in zip(bots, results):
+            if isinstance(res, Exception): logger.error(f"Bot {bot.slug} stopped: {res}")
+    finally:
+        await feeds.close()
+        if metrics:
+            logger.info(f"⏱️ {metrics.summary()}")
+            await metrics.close()
+        http.log_stats()
+        await http.close()
+        if events:
+            logger.removeHandler(dump_handler)
+            await asyncio.to_thread(events.close)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    config = load_config(argv[0] if argv else None)
+    try: asyncio.run(run_markets(config))
+    except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__":
+    main()
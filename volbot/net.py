@@ -0,0 +1,151 @@
+"""
+Shared HTTP client layer.
+
+One long-lived aiohttp session per host, so Binance, Gamma, the CLOB and the
+sim API each keep their own warm keep-alive pool instead of paying a fresh
+TCP+TLS handshake on every call. aiohttp is imported on the first request,
+so importing the bot (or the offline tools) does not pay for it.
+"""
+
+import time
+import logging
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+# Per-endpoint total timeouts (seconds)
+DEFAULT_TIMEOUTS = {
+    "klines": 5.0,
+    "gamma": 10.0,
+    "book": 3.0,
+    "sim_trade": 5.0,
+}
+DEFAULT_TIMEOUT = 10.0
+
+
+class EndpointStats:
+    __slots__ = ("count", "errors", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed, ok=True):
+        self.count += 1
+        if not ok: self.errors += 1
+        self.total += elapsed
+        if elapsed > self.max: self.max = elapsed
+
+    def as_dict(self):
+        avg = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "errors": self.errors,
+                "avg_ms": round(avg * 1000, 2), "max_ms": round(self.max * 1000, 2)}
+
+
+class HttpClient:
+    """Pooled, keep-alive HTTP client owned by the bot. Call close() on exit."""
+
+    def __init__(self, timeouts=None, limit_per_host=8, keepalive_timeout=60.0, dns_ttl=300):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts: self.timeouts.update(timeouts)
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.sessions = {}  # {host: ClientSession}
+
+        # Counters
+        self.conn_created = 0
+        self.conn_reused = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+        self.endpoints = {}  # {endpoint: EndpointStats}
+
+    def _trace_config(self):
+        import aiohttp
+        trace = aiohttp.TraceConfig()
+
+        async def on_create(session, ctx, params): self.conn_created += 1
+        async def on_reuse(session, ctx, params): self.conn_reused += 1
+        async def on_dns_hit(session, ctx, params): self.dns_hits += 1
+        async def on_dns_miss(session, ctx, params): self.dns_misses += 1
+
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+        trace.on_dns_cache_hit.append(on_dns_hit)
+        trace.on_dns_cache_miss.append(on_dns_miss)
+        return trace
+
+    def _session(self, url):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self.sessions.get(host)
+        if session is None or session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=True,
+                trace_configs=[self._trace_config()],
+            )
+            self.sessions[host] = session
+        return session
+
+    def _timeout(self, endpoint, timeout):
+        import aiohttp
+        total = timeout or self.timeouts.get(endpoint, DEFAULT_TIMEOUT)
+        return aiohttp.ClientTimeout(total=total)
+
+    async def request_json(self, method, url, endpoint, params=None, json_body=None, timeout=None):
+        """Returns (status, parsed_json_or_None). Raises on transport errors."""
+        stats = self.endpoints.get(endpoint)
+        if stats is None: stats = self.endpoints[endpoint] = EndpointStats()
+
+        session = self._session(url)
+        start = time.perf_counter()
+        ok = False
+        try:
+            async with session.request(method, url, params=params, json=json_body,
+                                       timeout=self._timeout(endpoint, timeout)) as resp:
+                data = None
+                if resp.status == 200:
+                    data = await resp.json(content_type=None)
+                else:
+                    await resp.read()  # drain so the connection goes back to the pool
+                ok = resp.status < 400
+                return resp.status, data
+        finally:
+            stats.record(time.perf_counter() - start, ok)
+
+    async def get_json(self, url, endpoint, params=None, timeout=None):
+        return await self.request_json("GET", url, endpoint, params=params, timeout=timeout)
+
+    async def post_json(self, url, endpoint, payload, timeout=None):
+        return await self.request_json("POST", url, endpoint, json_body=payload, timeout=timeout)
+
+    def stats(self):
+        return {
+            "connections_created": self.conn_created,
+            "connections_reused": self.conn_reused,
+            "dns_cache_hits": self.dns_hits,
+            "dns_cache_misses": self.dns_misses,
+            "endpoints": {k: v.as_dict() for k, v in self.endpoints.items()},
+        }
+
+    def log_stats(self):
+        s = self.stats()
+        logger.info(f"🌐 HTTP: {s['connections_created']} new conns | {s['connections_reused']} reused | "
+                    f"DNS hit/miss {s['dns_cache_hits']}/{s['dns_cache_misses']}")
+        for name, ep in s["endpoints"].items():
+            logger.info(f"🌐   {name}: n={ep['count']} err={ep['errors']} avg={ep['avg_ms']}ms max={ep['max_ms']}ms")
+
+    async def close(self):
+        for session in self.sessions.values():
+            if not session.closed: await session.close()
+        self.sessions.clear()
@@ -0,0 +1,139 @@
+"""
+Incremental L2 order book for Polymarket outcome tokens.
+
+Prices live on a fixed tick grid in [0, 1], so each side is a flat array of
+sizes indexed by tick. Level updates are O(1), the best bid/ask indexes are
+maintained incrementally (O(1) top-of-book reads), and depth is walked by
+stepping outward from the touch.
+"""
+
+TICK_SCALE = 1000  # 0.001 tick grid
+
+
+class OrderBook:
+    __slots__ = ("asset_id", "scale", "bids", "asks", "best_bid", "best_ask", "timestamp", "hash")
+
+    def __init__(self, asset_id, scale=TICK_SCALE):
+        self.asset_id = asset_id
+        self.scale = scale
+        self.bids = [0.0] * (scale + 1)
+        self.asks = [0.0] * (scale + 1)
+        self.best_bid = -1           # tick index, -1 = empty
+        self.best_ask = scale + 1    # tick index, scale+1 = empty
+        self.timestamp = 0
+        self.hash = None
+
+    def _tick(self, price):
+        t = int(price * self.scale + 0.5)
+        if t < 0: return 0
+        if t > self.scale: return self.scale
+        return t
+
+    # --- Updates ---
+
+    def clear(self):
+        n = self.scale + 1
+        self.bids = [0.0] * n
+        self.asks = [0.0] * n
+        self.best_bid = -1
+        self.best_ask = n
+
+    def apply_snapshot(self, bids, asks, timestamp=0, book_hash=None):
+        """Replaces the book. Levels are (price, size) pairs, decoded level objects or REST dicts."""
+        self.clear()
+        for lvl in bids: self._set(True, *_level(lvl))
+        for lvl in asks: self._set(False, *_level(lvl))
+        self.timestamp = timestamp
+        self.hash = book_hash
+
+    def apply_change(self, side, price, size):
+        """Sets the aggregate size at one level (floats). side is "BUY" (bids) or "SELL" (asks); size 0 removes."""
+        self._set(side == "BUY", price, size)
+
+    def _set(self, is_bid, price, size):
+        t = self._tick(price)
+        if is_bid:
+            self.bids[t] = size
+            if size > 0:
+                if t > self.best_bid: self.best_bid = t
+            elif t == self.best_bid:
+                levels = self.bids
+                while t >= 0 and levels[t] <= 0: t -= 1
+                self.best_bid = t
+        else:
+            self.asks[t] = size
+            if size > 0:
+                if t < self.best_ask: self.best_ask = t
+            elif t == self.best_ask:
+                levels = self.asks
+                top = self.scale
+                while t <= top and levels[t] <= 0: t += 1
+                self.best_ask = t
+
+    # --- Reads ---
+
+    @property
+    def bid(self):
+        return self.best_bid / self.scale if self.best_bid >= 0 else 0.0
+
+    @property
+    def ask(self):
+        return self.best_ask / self.scale if self.best_ask <= self.scale else 0.0
+
+    @property
+    def bid_size(self):
+        return self.bids[self.best_bid] if self.best_bid >= 0 else 0.0
+
+    @property
+    def ask_size(self):
+        return self.asks[self.best_ask] if self.best_ask <= self.scale else 0.0
+
+    def has_two_sides(self):
+        return self.best_bid >= 0 and self.best_ask <= self.scale
+
+    def levels(self, side, depth=10):
+        """Top `depth` levels as [(price, size)], best first. side is "BUY" (bids) or "SELL" (asks)."""
+        out = []
+        if side == "BUY":
+            levels, t, step, end = self.bids, self.best_bid, -1, -1
+        else:
+            levels, t, step, end = self.asks, self.best_ask, 1, self.scale + 1
+        while t != end and len(out) < depth:
+            if levels[t] > 0: out.append((t / self.scale, levels[t]))
+            t += step
+        return out
+
+    def walk(self, side, size, limit_price):
+        """
+        Simulates taking `size` against the book up to `limit_price`.
+        side is the taker side: BUY walks the asks, SELL walks the bids.
+        Returns (filled_size, avg_price).
+        """
+        limit = self._tick(float(limit_price))
+        remaining = float(size)
+        notional = 0.0
+        if side == "BUY":
+            levels, t, step = self.asks, self.best_ask, 1
+            if t > limit: return 0.0, 0.0
+            end = min(limit, self.scale) + 1
+        else:
+            levels, t, step = self.bids, self.best_bid, -1
+            if t < limit or t < 0: return 0.0, 0.0
+            end = limit - 1
+        while t != end and remaining > 0:
+            avail = levels[t]
+            if avail > 0:
+                take = avail if avail < remaining else remaining
+                notional += take * t
+                remaining -= take
+            t += step
+        filled = float(size) - remaining
+        if filled <= 0: return 0.0, 0.0
+        return filled, notional / filled / self.scale
+
+
+def _level(lvl):
+    if type(lvl) is tuple: return lvl
+    if isinstance(lvl, dict): return float(lvl["price"]), float(lvl["size"])
+    if isinstance(lvl, list): return lvl[0], lvl[1]
+    return lvl.price, lvl.size
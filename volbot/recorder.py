@@ -0,0 +1,199 @@
+"""
+Opt-in tick recorder (RECORD_DIR).
+
+Appends normalized Binance trades and Polymarket top-of-book states to
+fixed-width columnar files, one raw little-endian file per column, so every
+column can be memory-mapped as a NumPy array (see volbot.tickstore).
+
+Layout:
+    RECORD_DIR/<slug>/meta.json
+    RECORD_DIR/<slug>/trades/{recv_ts,exch_ts,price,size}.f8, side.i1, time.idx
+    RECORD_DIR/<slug>/books/{recv_ts,exch_ts}.f8, asset.u2,
+                            {bid_px,bid_sz,ask_px,ask_sz}.f4 (DEPTH per row), time.idx
+
+time.idx holds int64 (second, first_row) pairs, one per wall-clock second.
+The hot path only enqueues a tuple; a background thread does all file I/O.
+"""
+
+import os
+import json
+import queue
+import logging
+import threading
+from array import array
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+DEPTH = 5
+
+TRADE_COLUMNS = (("recv_ts", "d"), ("exch_ts", "d"), ("price", "d"), ("size", "d"), ("side", "b"))
+BOOK_COLUMNS = (("recv_ts", "d"), ("exch_ts", "d"), ("asset", "H"),
+                ("bid_px", "f"), ("bid_sz", "f"), ("ask_px", "f"), ("ask_sz", "f"))
+EXT = {"d": "f8", "f": "f4", "b": "i1", "H": "u2"}
+
+_STOP = object()
+
+
+class _ColumnSet:
+    """Open column files for one stream of one segment."""
+
+    def __init__(self, path, columns):
+        os.makedirs(path, exist_ok=True)
+        self.columns = columns
+        self.files = [open(os.path.join(path, f"{name}.{EXT[code]}"), "ab") for name, code in columns]
+        self.index = open(os.path.join(path, "time.idx"), "ab")
+        # Resume row count / last indexed second from what is already on disk
+        first = columns[0]
+        self.rows = os.path.getsize(os.path.join(path, f"{first[0]}.{EXT[first[1]]}")) // 8
+        self.last_second = -1
+
+    def write(self, rows):
+        cols = [array(code) for _, code in self.columns]
+        idx = array("q")
+        row = self.rows
+        for r in rows:
+            sec = int(r[0])
+            if sec != self.last_second:
+                idx.append(sec); idx.append(row)
+                self.last_second = sec
+            for col, v in zip(cols, r):
+                if type(v) is tuple or type(v) is list: col.extend(v)
+                else: col.append(v)
+            row += 1
+        self.rows = row
+        for f, col in zip(self.files, cols):
+            f.write(col.tobytes()); f.flush()
+        if idx:
+            self.index.write(idx.tobytes()); self.index.flush()
+
+    def close(self):
+        for f in self.files: f.close()
+        self.index.close()
+
+
+class TickRecorder:
+    def __init__(self, root, depth=DEPTH):
+        self.root = root
+        self.depth = depth
+        self.queue = queue.SimpleQueue()
+        self.assets = {}   # {asset_id: index} for the current segment
+        self.slug = None
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._writer, name="tick-recorder", daemon=True)
+        self.thread.start()
+
+    # --- Hot path (event loop thread) ---
+
+    def trade(self, recv_ts, exch_ts, price, size, side):
+        self.queue.put(("T", (recv_ts, exch_ts, price, size, side)))
+
+    def book(self, recv_ts, exch_ts, book):
+        """Records the top DEPTH levels of an OrderBook after an update."""
+        idx = self.assets.get(book.asset_id)
+        if idx is None: idx = self._register(book.asset_id)
+        depth = self.depth
+        bid_px, bid_sz = _pad(book.levels("BUY", depth), depth)
+        ask_px, ask_sz = _pad(book.levels("SELL", depth), depth)
+        self.queue.put(("B", (recv_ts, exch_ts, idx, bid_px, bid_sz, ask_px, ask_sz)))
+
+    # --- Control ---
+
+    def set_segment(self, slug, **meta):
+        """Starts (or resumes) the segment for a market slug. Later ticks go there."""
+        if slug == self.slug: return
+        self.slug = slug
+        self.assets = {}
+        meta_path = os.path.join(self.root, slug, "meta.json")
+        if os.path.exists(meta_path):
+            # Resuming a segment: keep asset indexes stable across restarts
+            with open(meta_path) as f:
+                self.assets = {a: i for i, a in enumerate(json.load(f).get("assets", []))}
+        self.queue.put(("S", (slug, dict(meta, slug=slug, depth=self.depth))))
+
+    def update_meta(self, slug=None, **fields):
+        """Merges fields (e.g. the official resolution) into a segment's meta.json (default: the current one)."""
+        self.queue.put(("M", (slug, fields)))
+
+    def _register(self, asset_id):
+        idx = self.assets[asset_id] = len(self.assets)
+        self.queue.put(("A", (asset_id, idx)))
+        return idx
+
+    def close(self, timeout=5.0):
+        self.queue.put((_STOP, None))
+        self.thread.join(timeout)
+
+    # --- Writer thread ---
+
+    def _writer(self):
+        trades = books = None
+        meta = meta_path = None
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < 4096: batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            t_rows, b_rows = [], []
+            for kind, payload in batch:
+                if kind == "T": t_rows.append(payload)
+                elif kind == "B": b_rows.append(payload)
+                else:
+                    # Control messages: flush data written so far to the old segment first
+                    self._flush(trades, t_rows, books, b_rows)
+                    t_rows, b_rows = [], []
+                    if kind is _STOP:
+                        running = False
+                        break
+                    if kind == "S":
+                        if trades: trades.close(); books.close()
+                        slug, meta = payload
+                        seg = os.path.join(self.root, slug)
+                        meta_path = os.path.join(seg, "meta.json")
+                        if os.path.exists(meta_path):
+                            with open(meta_path) as f: meta = dict(json.load(f), **meta)
+                        meta.setdefault("assets", [])
+                        trades = _ColumnSet(os.path.join(seg, "trades"), TRADE_COLUMNS)
+                        books = _ColumnSet(os.path.join(seg, "books"), BOOK_COLUMNS)
+                        _write_json(meta_path, meta)
+                    elif kind == "M":
+                        slug, fields = payload
+                        if meta is not None and slug in (None, meta["slug"]):
+                            meta.update(fields)
+                            _write_json(meta_path, meta)
+                        elif slug:
+                            # A finished round settling after the next one started
+                            other = os.path.join(self.root, slug, "meta.json")
+                            if os.path.exists(other):
+                                with open(other) as f: _write_json(other, dict(json.load(f), **fields))
+                    elif kind == "A" and meta is not None:
+                        asset_id, idx = payload
+                        if asset_id not in meta["assets"]: meta["assets"].append(asset_id)
+                        _write_json(meta_path, meta)
+            self._flush(trades, t_rows, books, b_rows)
+        if trades: trades.close(); books.close()
+
+    def _flush(self, trades, t_rows, books, b_rows):
+        try:
+            if trades and t_rows: trades.write(t_rows)
+            if books and b_rows: books.write(b_rows)
+        except OSError as e:
+            self.dropped += len(t_rows) + len(b_rows)
+            logger.error(f"Tick recorder write failed: {e}")
+        else:
+            if not trades: self.dropped += len(t_rows) + len(b_rows)
+
+
+def _pad(levels, depth):
+    px = [0.0] * depth
+    sz = [0.0] * depth
+    for i, (p, s) in enumerate(levels):
+        px[i] = p; sz[i] = s
+    return px, sz
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f: json.dump(data, f)
+    os.replace(tmp, path)
@@ -0,0 +1,178 @@
+"""
+Deterministic accelerated replay of recorded ticks (see volbot.recorder).
+
+Recorded Binance trades and Polymarket book states are merged by receive
+time and fed through the bot's own _on_binance_trade / _on_market_message
+handlers, so _update_prices, execute_strategy, _execute_sim_fill and
+_settle_simulation run unchanged. A VirtualClock replaces wall time and
+market metadata comes from each segment's meta.json, so a run makes no
+network calls, goes as fast as the CPU allows and is identical every time.
+
+    python -m volbot.replay --data ./ticks [--from SLUG] [--to SLUG] [--quiet]
+"""
+
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+from datetime import datetime, timezone
+
+import numpy as np
+
+from example import VolatilityBot, logger
+from volbot.clock import VirtualClock
+from volbot.tickstore import TickStore
+
+
+class ReplayBot(VolatilityBot):
+    """VolatilityBot with a virtual clock, recorded metadata and no network side effects."""
+
+    def __init__(self, store, **params):
+        # Never touches the live wallet; recorded feeds have no connection state to go stale
+        super().__init__(clock=VirtualClock(), config={"JOURNAL_DIR": "", "BINANCE_STALE_SECONDS": "0",
+                                                       "POLY_STALE_SECONDS": "0"})
+        # Replay never reports or re-records
+        if self.recorder: self.recorder.close()
+        self.recorder = None
+        self.reporter = None
+        self.conflate = False  # one decision per recorded tick, no decision task
+        self.metrics = self.lat = None
+        self.settle_timeout = 0  # a recording either has the official result or never will
+        self.store = store
+        self.fills = []        # [(ts, label, side, price, size, pnl)]
+        self.first_trade = {}  # {slug: (exch_ts, price)} for strike fallback
+        for name, value in params.items(): setattr(self, name, value)
+        if self.shadow and params: self.shadow = self._make_shadow()  # variant 0 follows the overrides
+
+    async def _fetch_gamma_market(self, slug):
+        meta = self.store.meta(slug)
+        outcomes = meta.get("outcomes") or {}
+        asset_ids = list(outcomes) or meta.get("assets", [])
+        market = {
+            "conditionId": meta.get("market_id") or slug,
+            "question": slug,
+            "clobTokenIds": json.dumps(asset_ids),
+            "outcomes": json.dumps([outcomes.get(a, "") for a in asset_ids]),
+            "endDate": datetime.fromtimestamp(meta["market_end"], timezone.utc).isoformat(),
+        }
+        if "outcome_prices" in meta: market["outcomePrices"] = json.dumps(meta["outcome_prices"])
+        return market
+
+    async def _warmup_prices(self, asset_ids=None):
+        pass  # Books come from the recording
+
+    def _check_candle_gap(self):
+        # Recorded trades are the only history there is: treat them as continuous
+        return False
+
+    async def _fetch_strike_price(self):
+        if self._strike_from_candles(): return
+        first = self.first_trade.get(self.slug)
+        if first and first[0] >= self.market_start:
+            self.strike_price = first[1]
+            logger.info(f"🎯 Strike Price (first recorded trade): ${self.strike_price:.2f}")
+
+    async def _fetch_resolution(self, slug):
+        return self._resolution_from(await self._fetch_gamma_market(slug))
+
+    def _report_sim_trade(self, asset_id, side, price, size, pnl=None, label=None):
+        label = label or self.asset_map.get(asset_id, asset_id[:8])
+        self.fills.append((self.clock.time(), label, side, price, size, pnl))
+
+    def fills_digest(self):
+        h = hashlib.sha256()
+        for f in self.fills: h.update(repr(f).encode())
+        return h.hexdigest()
+
+
+async def replay_segment(bot, slug):
+    trades = bot.store.trades(slug)
+    books = bot.store.books(slug)
+    meta = bot.store.meta(slug)
+    assets = meta.get("assets", [])
+
+    n_t = len(trades["recv_ts"])
+    n_b = len(books["recv_ts"])
+    if n_t: bot.first_trade[slug] = (float(trades["exch_ts"][0]), float(trades["price"][0]))
+
+    bot._reset_round()
+    bot.slug = slug
+    if n_t or n_b: bot.clock.advance_to(min(
+        float(trades["recv_ts"][0]) if n_t else float("inf"),
+        float(books["recv_ts"][0]) if n_b else float("inf")))
+    if not await bot.fetch_market(): return 0
+
+    # Merge both streams by receive time; trades sort first on ties (stable)
+    ts = np.concatenate([trades["recv_ts"], books["recv_ts"]])
+    order = np.argsort(ts, kind="stable").tolist()
+    ts = ts.tolist()
+
+    t_exch, t_price, t_size, t_side = (trades[c].tolist() for c in ("exch_ts", "price", "size", "side"))
+    b_asset = books["asset"].tolist()
+    b_bid_px, b_bid_sz = books["bid_px"].tolist(), books["bid_sz"].tolist()
+    b_ask_px, b_ask_sz = books["ask_px"].tolist(), books["ask_sz"].tolist()
+
+    clock = bot.clock
+    for i in order:
+        now = ts[i]
+        if now >= bot.market_end: break
+        clock.advance_to(now)
+        if i < n_t:
+            await bot._on_binance_trade(t_price[i], t_size[i], t_exch[i], now, t_side[i])
+        else:
+            j = i - n_t
+            item = {
+                "asset_id": assets[b_asset[j]],
+                "bids": [(p, s) for p, s in zip(b_bid_px[j], b_bid_sz[j]) if s > 0],
+                "asks": [(p, s) for p, s in zip(b_ask_px[j], b_ask_sz[j]) if s > 0],
+            }
+            await bot._on_market_message(item, now)
+
+    clock.advance_to(bot.market_end)
+    await bot._settle_simulation()
+    return len(order)
+
+
+async def replay(store, slugs, **params):
+    bot = ReplayBot(store, **params)
+    events = 0
+    try:
+        for slug in slugs:
+            events += await replay_segment(bot, slug)
+    finally:
+        await bot.http.close()
+    return bot, events
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded ticks through VolatilityBot")
+    parser.add_argument("--data", required=True, help="RECORD_DIR used while recording")
+    parser.add_argument("--from", dest="start", help="First slug to replay (inclusive)")
+    parser.add_argument("--to", dest="end", help="Last slug to replay (inclusive)")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings")
+    args = parser.parse_args(argv)
+
+    if args.quiet: logger.setLevel(logging.WARNING)
+    store = TickStore(args.data)
+    slugs = store.segments()
+    if args.start: slugs = slugs[slugs.index(args.start):]
+    if args.end: slugs = slugs[: slugs.index(args.end) + 1]
+    if not slugs:
+        print("No recorded segments found", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    bot, events = asyncio.run(replay(store, slugs))
+    elapsed = time.perf_counter() - started
+
+    print(f"Rounds: {len(slugs)} | Events: {events} | {elapsed:.2f}s ({events / max(elapsed, 1e-9):,.0f} ev/s)")
+    print(f"Fills: {len(bot.fills)} | Balance: ${bot.balance:.2f} | PnL: ${bot.balance - bot.initial_capital:+.2f}")
+    print(f"Fills digest: {bot.fills_digest()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Background trade reporter for the simulation API.
+
+The trading path only calls submit(), which is a non-blocking enqueue. A
+background task drains the queue once per flush interval and POSTs the batch
+over the shared HTTP client, retrying with exponential backoff. When the
+queue is full or a trade exhausts its retries, it is spilled to a local
+JSON-lines file and re-queued on the next start.
+"""
+
+import os
+import json
+import random
+import asyncio
+import logging
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+
+class TradeReporter:
+    def __init__(self, http, url, spill_path, flush_interval=0.5, max_queue=1000,
+                 batch_size=100, max_retries=5, backoff_base=0.5, backoff_max=8.0):
+        self.http = http
+        self.url = url
+        self.spill_path = spill_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.task = None
+        self._wake = asyncio.Event()
+
+        # Counters
+        self.submitted = 0
+        self.sent = 0
+        self.retries = 0
+        self.failed = 0
+        self.spilled = 0
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self._replay_spill()
+            self.task = asyncio.create_task(self._run())
+
+    def submit(self, payload):
+        """Non-blocking enqueue. Never waits on the network."""
+        self.submitted += 1
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._spill([payload])
+        if self.queue.qsize() >= self.batch_size: self._wake.set()
+
+    async def flush(self, timeout=10.0):
+        """Sends everything queued so far (used at settlement and shutdown)."""
+        if self.task is None or self.task.done(): return
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Trade reporter flush timed out with {self.queue.qsize()} pending")
+
+    async def close(self, timeout=10.0):
+        await self.flush(timeout)
+        if self.task:
+            self.task.cancel()
+            try: await self.task
+            except asyncio.CancelledError: pass
+            self.task = None
+        leftover = []
+        while not self.queue.empty():
+            leftover.append(self.queue.get_nowait())
+            self.queue.task_done()
+        if leftover: self._spill(leftover)
+        if self.spilled or self.failed:
+            logger.warning(f"⚠️ Trade reporter: {self.sent} sent | {self.failed} failed | {self.spilled} spilled to {self.spill_path}")
+
+    async def _run(self):
+        while True:
+            try: await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError: pass
+            self._wake.clear()
+
+            batch = []
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            # Sent in order so the API sees fills before their settlement
+            for i, payload in enumerate(batch):
+                try:
+                    await self._send(payload)
+                except BaseException:
+                    # Cancelled mid-batch (close): the unsent rest, and the one in flight, which may
+                    # arrive twice, go to the spill file ahead of whatever is still queued
+                    self._spill(batch[i:])
+                    for _ in batch[i:]: self.queue.task_done()
+                    raise
+                self.queue.task_done()
+            if not self.queue.empty(): self._wake.set()
+
+    async def _send(self, payload):
+        for attempt in range(self.max_retries + 1):
+            try:
+                status, _ = await self.http.post_json(self.url, "sim_trade", payload)
+                if status < 500 and status != 429:
+                    if status >= 400: logger.warning(f"⚠️ Sim API rejected trade ({status}): {payload}")
+                    else: self.sent += 1
+                    return
+                err = f"HTTP {status}"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                err = str(e) or type(e).__name__
+            if attempt == self.max_retries: break
+            self.retries += 1
+            delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+        self.failed += 1
+        logger.warning(f"⚠️ Sim trade report failed after {self.max_retries + 1} attempts ({err}); spilling")
+        self._spill([payload])
+
+    def _spill(self, payloads):
+        try:
+            with open(self.spill_path, "a") as f:
+                for p in payloads: f.write(json.dumps(p) + "\n")
+            self.spilled += len(payloads)
+        except OSError as e:
+            logger.error(f"Trade spill write failed ({self.spill_path}): {e}")
+
+    def _replay_spill(self):
+        if not os.path.exists(self.spill_path): return
+        try:
+            with open(self.spill_path) as f: lines = f.readlines()
+            os.remove(self.spill_path)
+        except OSError as e:
+            logger.error(f"Trade spill read failed ({self.spill_path}): {e}")
+            return
+        payloads = [json.loads(line) for line in lines if line.strip()]
+        for i, p in enumerate(payloads):
+            try:
+                self.queue.put_nowait(p)
+            except asyncio.QueueFull:
+                self._spill(payloads[i:])
+                break
+        logger.info(f"📤 Re-queued {len(payloads)} spilled trade reports")
@@ -0,0 +1,156 @@
+"""
+Live shadow evaluation of many parameter variants (SHADOW_GRID).
+
+Every variant runs the bot's entry rule on the same ticks and books as the
+live strategy. State is kept in one NumPy array per field, so a tick is a
+handful of vectorized operations for all variants together:
+
+    threshold = max(volatility * volatility_k, min_diff_limit)
+    signal    = |price - strike| > threshold and 0 < ask < max_chase_price
+    fill      = FOK for base_qty walked against the live book (no market impact)
+    gated by  cooldown_seconds since the last fill, max_risk_per_round and own cash
+
+Positions are handed to the round's settlement, paid out with the live
+provisional winner and moved on reconciliation, so each variant keeps its own
+PnL. Variant 0 always uses the live parameters.
+
+SHADOW_GRID takes space-separated axes; values are comma lists or lo:hi:n
+(n evenly spaced values), e.g.
+
+    SHADOW_GRID="volatility_k=0.2:1.5:14 min_diff_limit=1,2,4 max_chase_price=0.8,0.9,0.95"
+"""
+
+import csv
+import itertools
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+PARAMS = ("volatility_k", "min_diff_limit", "max_chase_price", "cooldown_seconds", "max_risk_per_round")
+
+
+def parse_grid(spec, base):
+    """Variants for a SHADOW_GRID spec; parameters not on an axis keep their `base` value."""
+    axes = {}
+    for axis in spec.split():
+        name, values = axis.split("=", 1)
+        if name not in PARAMS: raise ValueError(f"Unknown shadow parameter {name} (choose from {', '.join(PARAMS)})")
+        if ":" in values:
+            lo, hi, n = values.split(":")
+            axes[name] = [round(float(v), 6) for v in np.linspace(float(lo), float(hi), int(n))]
+        else:
+            axes[name] = [float(v) for v in values.split(",")]
+    names = list(axes)
+    return [dict(base, **dict(zip(names, combo))) for combo in itertools.product(*axes.values())]
+
+
+class ShadowVariants:
+    def __init__(self, variants, base_qty, initial_capital, threshold, sanitize):
+        self.variants = variants
+        n = len(variants)
+        col = lambda name: np.array([float(v[name]) for v in variants])
+        self.k = col("volatility_k")
+        self.floor = col("min_diff_limit")
+        self.chase = col("max_chase_price")
+        self.cooldown = col("cooldown_seconds")
+        self.risk = col("max_risk_per_round")
+        self.sanitize = sanitize
+        self.qty = sanitize(base_qty, 2)
+
+        self.cash = np.full(n, float(initial_capital))
+        self.pnl = np.zeros(n)
+        self.fills = np.zeros(n, dtype=np.int64)
+        self.cooldown_until = np.zeros(n)
+        self._new_round()
+        self.thr = np.full(n, float(threshold))  # live default until the estimator is ready
+        self.min_thr = float(threshold)
+
+    def _new_round(self):
+        n = len(self.variants)
+        self.round_cost = np.zeros(n)
+        self.pos_up, self.pos_dn = np.zeros(n), np.zeros(n)
+        self.cost_up, self.cost_dn = np.zeros(n), np.zeros(n)
+
+    def set_volatility(self, value):
+        self.thr = np.maximum(value * self.k, self.floor)
+        self.min_thr = float(self.thr.min())
+
+    def evaluate(self, now, diff, up_book, down_book):
+        """One tick for every variant. Quiet ticks (inside every threshold) cost one comparison."""
+        if diff > 0:
+            if diff <= self.min_thr: return
+            book, pos, cost = up_book, self.pos_up, self.cost_up
+        else:
+            if -diff <= self.min_thr: return
+            book, pos, cost = down_book, self.pos_dn, self.cost_dn
+            diff = -diff
+        ask = book.ask
+        if ask <= 0: return
+        sig = (self.thr < diff) & (ask < self.chase) & (self.cooldown_until <= now) & (self.round_cost < self.risk)
+        if not sig.any(): return
+
+        # Every signalling variant sends the same order, so one walk serves them all
+        filled, avg = book.walk("BUY", self.qty, self.sanitize(ask, 2))
+        if filled < self.qty: return
+        val = self.qty * self.sanitize(avg, 4)
+        buy = sig & (self.cash >= val)
+        self.cash[buy] -= val
+        self.round_cost[buy] += val
+        pos[buy] += self.qty
+        cost[buy] += val
+        self.fills[buy] += 1
+        self.cooldown_until[buy] = now + self.cooldown[buy]
+
+    def close_round(self):
+        """Hands this round's positions to its settlement and starts the next round flat."""
+        held = {"pos_up": self.pos_up, "pos_dn": self.pos_dn, "cost": self.cost_up + self.cost_dn}
+        self._new_round()
+        return held
+
+    def settle(self, held, winner):
+        """Pays out a closed round; winner is "up", "down" or None (nothing paid until resolution)."""
+        payout = self._payout(held, winner)
+        self.cash += payout
+        round_pnl = payout - held["cost"]
+        self.pnl += round_pnl
+        held["winner"] = winner
+        return round_pnl
+
+    def reconcile(self, held, winner):
+        """Moves a settled round's payout to the official winner."""
+        delta = self._payout(held, winner) - self._payout(held, held["winner"])
+        self.cash += delta
+        self.pnl += delta
+        held["winner"] = winner
+
+    def _payout(self, held, winner):
+        if winner == "up": return held["pos_up"]
+        if winner == "down": return held["pos_dn"]
+        return np.zeros(len(self.variants))
+
+    def ranking(self):
+        """Variant indexes, best PnL first."""
+        return np.argsort(-self.pnl, kind="stable")
+
+    def _describe(self, i):
+        v = self.variants[i]
+        return (f"K {v['volatility_k']:g} floor {v['min_diff_limit']:g} chase {v['max_chase_price']:g} "
+                f"cd {v['cooldown_seconds']:g}s risk {v['max_risk_per_round']:g}")
+
+    def log_summary(self, top=3):
+        order = self.ranking()
+        live_rank = int(np.flatnonzero(order == 0)[0]) + 1
+        logger.info(f"🧪 Shadow ({len(self.variants)} variants) | live params: PnL ${self.pnl[0]:+.2f} "
+                    f"rank {live_rank} | fills {self.fills.sum()}")
+        for rank, i in enumerate(order[:top], 1):
+            logger.info(f"🧪   #{rank}: ${self.pnl[i]:+.2f} ({self.fills[i]} fills) | {self._describe(i)}")
+
+    def write_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["rank", *PARAMS, "pnl", "fills", "live"])
+            writer.writeheader()
+            for rank, i in enumerate(self.ranking(), 1):
+                writer.writerow({"rank": rank, **{p: self.variants[i][p] for p in PARAMS},
+                                 "pnl": round(float(self.pnl[i]), 4), "fills": int(self.fills[i]), "live": int(i == 0)})
@@ -0,0 +1,204 @@
+"""
+Runs many markets across several processes around one shared-memory market data bus.
+
+A single event loop tops out at one core. In this mode the parent is the
+feed process: it owns the Binance and Polymarket connections, decodes every
+message once and publishes ticks and book updates into a shared-memory ring
+(volbot.bus). The markets are split round-robin over WORKERS strategy
+processes. Each one runs the VolatilityBots for its share (as volbot.multi
+does in one process) and reads the ring directly. Workers subscribe through
+a control pipe, so a round change in one worker moves only its own assets.
+
+The feed process supervises the workers. One that crashes or is killed is
+restarted with backoff: it re-subscribes, and its bots recover from their
+journals if JOURNAL_DIR is set. One that finishes cleanly (every market
+stopped) is left stopped. Ctrl-C or SIGTERM stops everything.
+
+Same config as volbot.multi, plus (in "defaults" or the environment):
+
+    WORKERS        strategy processes (default: one per core but one, at most one per market)
+    BUS_SLOTS      ring capacity in 64-byte records (65536)
+    BUS_SPIN       idle polls that yield to the loop before a reader sleeps 1ms (1000; 0 on busy hosts)
+
+With METRICS_PORT set, the feed process serves that port and worker i serves port + 1 + i.
+
+    python -m volbot.shard markets.json
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import logging
+import multiprocessing as mp
+
+from volbot.bus import Ring, Publisher, BusFeeds
+from volbot.clock import clock_from_env
+from volbot.feeds import MarketFeeds, BINANCE_WS_HOST, POLY_WS_HOST
+from volbot.liveness import Backoff
+from volbot.metrics import metrics_from_env
+from volbot.multi import load_config, run_markets
+
+logger = logging.getLogger("VolatilityHunterSim")
+
+STABLE_SECONDS = 60  # a worker that ran this long restarts without backoff
+
+
+def split_markets(config, workers):
+    """Round-robin shards of the config, one per worker (empty shards dropped)."""
+    markets = config.get("markets", [])
+    defaults = config.get("defaults", {})
+    shards = [markets[i::workers] for i in range(workers)]
+    return [{"defaults": defaults, "markets": shard} for shard in shards if shard]
+
+
+def _worker_main(index, config, ring_name, conn):
+    """Strategy process: the shard's bots on BusFeeds until the feed process says stop (or goes away)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the feed process decides when workers stop
+    try: asyncio.run(_run_worker(index, config, ring_name, conn))
+    except KeyboardInterrupt: pass
+
+
+async def _run_worker(index, config, ring_name, conn):
+    defaults = config.get("defaults", {})
+    env = lambda name: str(defaults[name]) if name in defaults else os.getenv(name)
+    ring = Ring.attach(ring_name)
+    feeds = BusFeeds(ring, conn, spin=int(env("BUS_SPIN") or "1000"))
+    logger.info(f"🧵 Worker {index} (pid {os.getpid()}): {', '.join(m.get('MARKET_SLUG', '?') for m in config['markets'])}")
+    loop = asyncio.get_running_loop()
+
+    def on_control():
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            msg = "stop"  # feed process gone
+        if msg == "stop":
+            loop.remove_reader(conn.fileno())
+            # Unwind like Ctrl-C on a single bot: asyncio.run cancels every task and the bots shut down
+            raise KeyboardInterrupt
+
+    loop.add_reader(conn.fileno(), on_control)
+    try:
+        await run_markets(config, feeds=feeds)
+    finally:
+        ring.close()
+
+
+class Supervisor:
+    """The feed process: shared feeds, the bus publisher and the worker processes it keeps alive."""
+
+    def __init__(self, config):
+        self.config = config
+        defaults = config.get("defaults", {})
+        env = lambda name: str(defaults[name]) if name in defaults else os.getenv(name)
+        self.clock = clock_from_env(env)
+        self.metrics = metrics_from_env(env)
+        self.feeds = MarketFeeds(clock=self.clock, metrics=self.metrics,
+                                 binance_host=env("BINANCE_WS_HOST") or BINANCE_WS_HOST,
+                                 poly_host=env("POLY_WS_HOST") or POLY_WS_HOST)
+        self.ring = Ring.create(int(env("BUS_SLOTS") or "65536"))
+        self.publisher = Publisher(self.ring, self.feeds, self.clock)
+        workers = int(env("WORKERS") or "0") or max((os.cpu_count() or 2) - 1, 1)
+        self.shards = split_markets(config, workers)
+        port = int(env("METRICS_PORT") or "0")
+        if port:
+            for i, shard in enumerate(self.shards):
+                shard["defaults"] = dict(shard["defaults"], METRICS_PORT=port + 1 + i)
+        self.ctx = mp.get_context("spawn")  # never fork a process with a running loop and threads
+        self.procs = {}      # {index: Process}
+        self.conns = {}      # {index: our end of the control pipe}
+        self.started = {}    # {index: time.monotonic() of the last start}
+        self.backoff = {i: Backoff(base=1.0) for i in range(len(self.shards))}
+        self.restarts = {i: 0 for i in range(len(self.shards))}
+        self.restarting = set()
+        self.stopping = False
+        self.done = asyncio.Event()
+
+    def start_worker(self, index):
+        self.restarting.discard(index)
+        if self.stopping: return
+        loop = asyncio.get_running_loop()
+        ours, theirs = self.ctx.Pipe()
+        proc = self.ctx.Process(target=_worker_main, args=(index, self.shards[index], self.ring.name, theirs),
+                                name=f"volbot-worker-{index}", daemon=True)
+        proc.start()
+        theirs.close()
+        self.procs[index], self.conns[index], self.started[index] = proc, ours, time.monotonic()
+        loop.add_reader(ours.fileno(), self._on_control, index)
+        loop.add_reader(proc.sentinel, self._on_exit, index)
+
+    def _on_control(self, index):
+        conn = self.conns.get(index)
+        if conn is None: return
+        try:
+            while conn.poll():
+                self.publisher.handle(index, conn.recv())
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+
+    def _on_exit(self, index):
+        loop = asyncio.get_running_loop()
+        proc = self.procs.pop(index)
+        loop.remove_reader(proc.sentinel)
+        proc.join()
+        conn = self.conns.pop(index)
+        try: loop.remove_reader(conn.fileno())
+        except (OSError, ValueError): pass
+        conn.close()
+        self.publisher.drop(index)
+        if self.stopping or proc.exitcode == 0:
+            if not self.stopping: logger.info(f"🏁 Worker {index} finished")
+            if not self.procs and not self.restarting: self.done.set()
+            return
+        backoff = self.backoff[index]
+        if time.monotonic() - self.started[index] > STABLE_SECONDS: backoff.reset()
+        delay = backoff.next()
+        self.restarts[index] += 1
+        if self.metrics: self.metrics.counter("worker_restarts_total", worker=str(index)).value += 1
+        logger.error(f"💥 Worker {index} died (exit code {proc.exitcode}); restart #{self.restarts[index]} in {delay:.1f}s")
+        self.restarting.add(index)
+        loop.call_later(delay, self.start_worker, index)
+
+    async def run(self):
+        markets = sum(len(s["markets"]) for s in self.shards)
+        logger.info(f"🛰️ Feed process {os.getpid()}: {markets} markets over {len(self.shards)} workers, "
+                    f"bus {self.ring.capacity} slots ({self.ring.name})")
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.done.set)
+        if self.metrics: await self.metrics.start()
+        self.feeds.start()
+        self.publisher.start()
+        try:
+            for i in range(len(self.shards)): self.start_worker(i)
+            await self.done.wait()
+        finally:
+            await self.stop()
+
+    async def stop(self, timeout=10.0):
+        self.stopping = True
+        for conn in self.conns.values():
+            try: conn.send("stop")
+            except (OSError, ValueError): pass
+        deadline = time.monotonic() + timeout
+        while self.procs and time.monotonic() < deadline: await asyncio.sleep(0.1)
+        for proc in list(self.procs.values()):
+            logger.warning(f"⚠️ Worker {proc.name} did not stop in {timeout:g}s; terminating")
+            proc.terminate()
+            proc.join(1)
+        await self.publisher.close()
+        await self.feeds.close()
+        if self.metrics:
+            logger.info(f"⏱️ {self.metrics.summary()}")
+            await self.metrics.close()
+        self.ring.close(unlink=True)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    config = load_config(argv[0] if argv else None)
+    try: asyncio.run(Supervisor(config).run())
+    except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__":
+    main()
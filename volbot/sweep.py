@@ -0,0 +1,303 @@
+"""
+Parallel parameter sweep over recorded ticks (see volbot.recorder).
+
+Rebuilds the bot's range x K threshold, entry and settlement rules in
+vectorized NumPy over each round's tick arrays, then fans parameter sets out
+over a process pool and prints a table ranked by PnL.
+
+Per round, with the previous 15m range R and strike S:
+    threshold = max(R * volatility_k, min_diff_limit)
+    signal    = |price - S| > threshold and 0 < ask < max_chase_price
+    fill      = FOK at the touch for base_qty (limit is the ask sanitized to the cent)
+    cooldown  = cooldown_seconds after each fill, circuit breaker at max_risk_per_round
+
+Signals are evaluated on Binance ticks against the last book state received
+before them, as execute_strategy sees them. Rounds without a contiguous
+previous round (no range) are skipped. The wallet balance check is not
+modelled: capital is assumed to cover max_risk_per_round.
+
+    python -m volbot.sweep --data ./ticks --grid volatility_k=0.4,0.6,0.8 min_diff_limit=1,2,4
+    python -m volbot.sweep --data ./ticks --random 5000 volatility_k=0.2:1.5 max_chase_price=0.6:0.98
+"""
+
+import os
+import sys
+import csv
+import time
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from volbot.tickstore import TickStore
+
+# Mirrors the VolatilityBot env defaults
+DEFAULTS = {
+    "volatility_k": 0.6,
+    "min_diff_limit": 2.0,
+    "max_chase_price": 0.95,
+    "base_qty": 10,
+    "max_risk_per_round": 50.0,
+    "cooldown_seconds": 2.0,
+}
+INT_PARAMS = {"base_qty"}
+
+
+# --- Data preparation (parent process) ---
+
+def _bull_bear(meta):
+    bull = bear = None
+    for asset_id, name in (meta.get("outcomes") or {}).items():
+        n = name.lower()
+        if bull is None and n in ("yes", "up"): bull = asset_id
+        elif bear is None and n in ("no", "down"): bear = asset_id
+    return bull, bear
+
+
+def _touch(books, asset_idx, trade_ts):
+    """Best ask and its size at each trade, from the last book state received before it."""
+    mask = np.asarray(books["asset"]) == asset_idx
+    b_ts = np.asarray(books["recv_ts"])[mask]
+    if len(b_ts) == 0: return np.zeros_like(trade_ts), np.zeros_like(trade_ts)
+    # Snap to the 0.001 tick grid the way OrderBook does (recorded prices are float32)
+    ask = np.floor(np.asarray(books["ask_px"])[mask, 0].astype(np.float64) * 1000 + 0.5) / 1000
+    size = np.asarray(books["ask_sz"])[mask, 0].astype(np.float64)
+    # Replay order puts trades before book updates with the same timestamp
+    idx = np.searchsorted(b_ts, trade_ts, side="left") - 1
+    has = idx >= 0
+    idx = np.where(has, idx, 0)
+    return np.where(has, ask[idx], 0.0), np.where(has, size[idx], 0.0)
+
+
+def prepare_rounds(store, slugs, k_min=0.0, floor_min=0.0):
+    """
+    Reduces each recorded round to the arrays the rules need. Ticks no
+    parameter set in the space could act on (|diff| <= the smallest possible
+    threshold) are dropped up front.
+    """
+    rounds = []
+    prev = None  # (market_end, exch_ts, price) of the previous round
+    for slug in slugs:
+        meta = store.meta(slug)
+        trades = store.trades(slug)
+        books = store.books(slug)
+        start, end = meta["market_start"], meta["market_end"]
+
+        recv = np.asarray(trades["recv_ts"])
+        keep = recv < end
+        recv = recv[keep]
+        exch = np.asarray(trades["exch_ts"])[keep]
+        price = np.asarray(trades["price"])[keep]
+        contiguous = prev is not None and prev[0] == start
+        prev_exch, prev_price = (prev[1], prev[2]) if contiguous else (None, None)
+        prev = (end, exch, price)
+        if not contiguous or len(price) == 0: continue
+
+        # Previous 15m range and strike (15m OPEN = first trade of the round)
+        in_prev = (prev_exch >= start - 900) & (prev_exch < start)
+        started = np.flatnonzero(exch >= start)
+        if not in_prev.any() or len(started) == 0: continue
+        prev_range = float(prev_price[in_prev].max() - prev_price[in_prev].min())
+        strike = float(price[started[0]])
+
+        bull, bear = _bull_bear(meta)
+        assets = meta.get("assets", [])
+        if bull not in assets or bear not in assets: continue
+
+        # Winner: official resolution if recorded, else final price vs strike
+        up_wins = float(price[-1]) > strike
+        outcome_prices = meta.get("outcome_prices")
+        if outcome_prices:
+            ids = list(meta["outcomes"])
+            for i, p in enumerate(outcome_prices):
+                if float(p) > 0.95 and i < len(ids): up_wins = ids[i] == bull; break
+
+        diff = price - strike
+        keep = np.abs(diff) > max(prev_range * k_min, floor_min)
+        ask_up, size_up = _touch(books, assets.index(bull), recv[keep])
+        ask_dn, size_dn = _touch(books, assets.index(bear), recv[keep])
+        rounds.append({
+            "slug": slug,
+            "range": prev_range,
+            "up_wins": up_wins,
+            "ts": recv[keep],
+            "diff": diff[keep],
+            "ask_up": ask_up, "size_up": size_up,
+            "ask_dn": ask_dn, "size_dn": size_dn,
+        })
+    return rounds
+
+
+# --- Evaluation (worker processes) ---
+
+_ROUNDS = None
+
+
+def _init_worker(rounds):
+    global _ROUNDS
+    _ROUNDS = rounds
+
+
+def _sanitize(x):
+    # Same float arithmetic as VolatilityBot._sanitize(x, 2)
+    return np.floor(x * 100 + 1e-9) / 100
+
+
+def _fillable(ask, size, qty, chase):
+    limit = _sanitize(ask)
+    return (ask > 0) & (ask < chase) & (size >= qty) & (
+        (limit * 1000 + 0.5).astype(np.int64) >= (ask * 1000 + 0.5).astype(np.int64))
+
+
+def evaluate(rounds, p):
+    k = p["volatility_k"]; floor = p["min_diff_limit"]; chase = p["max_chase_price"]
+    qty = float(p["base_qty"]); risk = p["max_risk_per_round"]; cooldown = p["cooldown_seconds"]
+
+    round_pnl = np.zeros(len(rounds))
+    fills = wins = traded = 0
+    for n, r in enumerate(rounds):
+        thr = max(r["range"] * k, floor)
+        diff = r["diff"]
+        # execute_strategy: bullish branch first; a non-fillable bullish tick never falls through to bearish
+        up_sig = diff > thr
+        dn_sig = diff < -thr
+        buy_up = up_sig & _fillable(r["ask_up"], r["size_up"], qty, chase)
+        buy_dn = dn_sig & _fillable(r["ask_dn"], r["size_dn"], qty, chase)
+        sig = np.flatnonzero(buy_up | buy_dn)
+        if len(sig) == 0: continue
+
+        ts = r["ts"][sig]
+        is_up = buy_up[sig]
+        cost = qty * np.where(is_up, r["ask_up"][sig], r["ask_dn"][sig])
+
+        # Cooldown + circuit breaker: walk fill to fill, jumping over cooled-down ticks
+        pnl = cum = 0.0
+        i, m = 0, len(sig)
+        while i < m and cum < risk:
+            c = cost[i]
+            cum += c
+            pnl += (qty if bool(is_up[i]) == r["up_wins"] else 0.0) - c
+            fills += 1
+            i = int(np.searchsorted(ts, ts[i] + cooldown, side="left"))
+        round_pnl[n] = pnl
+        traded += 1
+        if pnl > 0: wins += 1
+
+    equity = np.cumsum(round_pnl)
+    drawdown = float((np.maximum.accumulate(np.concatenate([[0.0], equity])) - np.concatenate([[0.0], equity])).max())
+    return {
+        **p,
+        "pnl": float(equity[-1]) if len(equity) else 0.0,
+        "max_drawdown": drawdown,
+        "fills": fills,
+        "rounds_traded": traded,
+        "round_win_rate": wins / traded if traded else 0.0,
+    }
+
+
+def _evaluate_chunk(params):
+    return [evaluate(_ROUNDS, p) for p in params]
+
+
+# --- Search space ---
+
+def _parse_value(name, text):
+    return int(float(text)) if name in INT_PARAMS else float(text)
+
+
+def grid_space(specs):
+    """specs: ["volatility_k=0.4,0.6", ...] -> list of full parameter dicts."""
+    axes = {}
+    for spec in specs:
+        name, values = spec.split("=", 1)
+        _check_name(name)
+        axes[name] = [_parse_value(name, v) for v in values.split(",")]
+    names = list(axes)
+    return [dict(DEFAULTS, **dict(zip(names, combo))) for combo in itertools.product(*axes.values())]
+
+
+def random_space(specs, n, seed=0):
+    """specs: ["volatility_k=0.2:1.5", ...] sampled uniformly, n parameter dicts."""
+    rng = random.Random(seed)
+    ranges = {}
+    for spec in specs:
+        name, bounds = spec.split("=", 1)
+        _check_name(name)
+        lo, hi = (float(b) for b in bounds.split(":"))
+        ranges[name] = (lo, hi)
+    space = []
+    for _ in range(n):
+        p = dict(DEFAULTS)
+        for name, (lo, hi) in ranges.items():
+            v = rng.uniform(lo, hi)
+            p[name] = int(round(v)) if name in INT_PARAMS else round(v, 4)
+        space.append(p)
+    return space
+
+
+def _check_name(name):
+    if name not in DEFAULTS: raise ValueError(f"Unknown parameter {name} (choose from {', '.join(DEFAULTS)})")
+
+
+def sweep(rounds, space, workers=None, chunk_size=32):
+    chunks = [space[i:i + chunk_size] for i in range(0, len(space), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rounds,)) as pool:
+        results = [r for chunk in pool.map(_evaluate_chunk, chunks) for r in chunk]
+    results.sort(key=lambda r: (-r["pnl"], r["max_drawdown"]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep over recorded ticks")
+    parser.add_argument("--data", required=True, help="RECORD_DIR used while recording")
+    parser.add_argument("--from", dest="start", help="First slug (inclusive)")
+    parser.add_argument("--to", dest="end", help="Last slug (inclusive)")
+    parser.add_argument("--grid", nargs="*", default=[], help="name=v1,v2,... axes")
+    parser.add_argument("--random", type=int, default=0, help="Sample N sets from name=lo:hi ranges")
+    parser.add_argument("--ranges", nargs="*", default=[], help="name=lo:hi ranges for --random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--csv", help="Write the full ranked table here")
+    args = parser.parse_args(argv)
+
+    space = random_space(args.ranges, args.random, args.seed) if args.random else grid_space(args.grid)
+    store = TickStore(args.data)
+    slugs = store.segments()
+    if args.start: slugs = slugs[slugs.index(args.start):]
+    if args.end: slugs = slugs[: slugs.index(args.end) + 1]
+
+    started = time.perf_counter()
+    k_min = min(p["volatility_k"] for p in space)
+    floor_min = min(p["min_diff_limit"] for p in space)
+    rounds = prepare_rounds(store, slugs, k_min, floor_min)
+    if not rounds:
+        print("No usable rounds (need contiguous recorded segments)", file=sys.stderr)
+        return 1
+    prepared = time.perf_counter()
+    results = sweep(rounds, space, args.workers)
+    done = time.perf_counter()
+
+    print(f"Rounds: {len(rounds)} | Parameter sets: {len(space)} | "
+          f"prepare {prepared - started:.2f}s | sweep {done - prepared:.2f}s")
+    cols = list(DEFAULTS) + ["pnl", "max_drawdown", "fills", "rounds_traded", "round_win_rate"]
+    print("rank  " + "  ".join(f"{c:>14}" for c in cols))
+    for i, r in enumerate(results[: args.top], 1):
+        print(f"{i:>4}  " + "  ".join(f"{_fmt(r[c]):>14}" for c in cols))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["rank"] + cols)
+            writer.writeheader()
+            for i, r in enumerate(results, 1): writer.writerow({"rank": i, **{c: r[c] for c in cols}})
+    return 0
+
+
+def _fmt(v):
+    return f"{v:.4g}" if isinstance(v, float) else str(v)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
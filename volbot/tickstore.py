@@ -0,0 +1,84 @@
+"""
+Zero-copy reader for files written by volbot.recorder.
+
+Every column is opened as a read-only np.memmap, so scanning hours of ticks
+never parses JSON or copies data until the caller asks for it.
+
+    store = TickStore("./ticks")
+    for slug in store.segments():
+        trades = store.trades(slug)              # {"recv_ts": memmap, "price": memmap, ...}
+        books = store.books(slug, t0, t1)        # views sliced by receive time
+"""
+
+import os
+import json
+import numpy as np
+
+from volbot.recorder import TRADE_COLUMNS, BOOK_COLUMNS, EXT
+
+LEVEL_COLUMNS = {"bid_px", "bid_sz", "ask_px", "ask_sz"}
+
+
+class TickStore:
+    def __init__(self, root):
+        self.root = root
+
+    def segments(self):
+        """Recorded market slugs, oldest first."""
+        if not os.path.isdir(self.root): return []
+        slugs = [s for s in os.listdir(self.root) if os.path.exists(os.path.join(self.root, s, "meta.json"))]
+        return sorted(slugs, key=lambda s: (self._start_ts(s), s))
+
+    def meta(self, slug):
+        with open(os.path.join(self.root, slug, "meta.json")) as f: return json.load(f)
+
+    def trades(self, slug, t0=None, t1=None):
+        return self._load(slug, "trades", TRADE_COLUMNS, 1, t0, t1)
+
+    def books(self, slug, t0=None, t1=None):
+        depth = self.meta(slug).get("depth", 5)
+        return self._load(slug, "books", BOOK_COLUMNS, depth, t0, t1)
+
+    def _start_ts(self, slug):
+        tail = slug.rsplit("-", 1)[-1]
+        return int(tail) if tail.isdigit() else 0
+
+    def _load(self, slug, stream, columns, depth, t0, t1):
+        path = os.path.join(self.root, slug, stream)
+        cols = {}
+        for name, code in columns:
+            fname = os.path.join(path, f"{name}.{EXT[code]}")
+            dtype = np.dtype("<" + EXT[code])
+            if not os.path.exists(fname) or os.path.getsize(fname) < dtype.itemsize:
+                cols[name] = np.zeros((0, depth) if name in LEVEL_COLUMNS else 0, dtype=dtype)
+                continue
+            arr = np.memmap(fname, dtype=dtype, mode="r")
+            if name in LEVEL_COLUMNS:
+                arr = arr[: (len(arr) // depth) * depth].reshape(-1, depth)
+            cols[name] = arr
+        # Columns are appended independently; a crash can leave them ragged by a row
+        n = min(len(a) for a in cols.values())
+        lo, hi = self._time_slice(path, cols["recv_ts"][:n], t0, t1)
+        lo = min(lo, n); hi = min(hi, n)
+        return {name: a[lo:hi] for name, a in cols.items()}
+
+    def _time_slice(self, path, recv_ts, t0, t1):
+        n = len(recv_ts)
+        if t0 is None and t1 is None: return 0, n
+        lo, hi = 0, n
+        idx_path = os.path.join(path, "time.idx")
+        if os.path.exists(idx_path) and os.path.getsize(idx_path) >= 16:
+            # Narrow with the per-second index, then refine inside the window
+            idx = np.memmap(idx_path, dtype="<i8", mode="r")
+            idx = idx[: len(idx) // 2 * 2].reshape(-1, 2)
+            secs, rows = idx[:, 0], idx[:, 1]
+            if t0 is not None:
+                i = np.searchsorted(secs, int(t0), side="right") - 1
+                if i >= 0: lo = int(rows[i])
+            if t1 is not None:
+                i = np.searchsorted(secs, int(t1), side="right")
+                if i < len(rows): hi = int(rows[i])
+        window = recv_ts[lo:hi]
+        if t0 is not None: lo += int(np.searchsorted(window, t0, side="left"))
+        if t1 is not None: hi = lo + int(np.searchsorted(recv_ts[lo:hi], t1, side="left"))
+        return lo, hi
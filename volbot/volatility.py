@@ -0,0 +1,100 @@
+"""
+Incremental volatility estimators, updated once per closed bar in O(1).
+
+Each estimator exposes `value`: a dollar move comparable to the previous
+bar's high-low range. The bot's threshold is max(value * K, MIN_DIFF_LIMIT).
+
+- range:     previous bar high - low (the original rule)
+- parkinson: rolling Parkinson sigma over N bars, in dollars at the last close
+- ewma:      RiskMetrics-style EWMA of squared log returns, in dollars
+- atr:       Wilder-smoothed average true range over N bars
+"""
+
+import math
+
+LN2_4 = 4.0 * math.log(2.0)
+
+
+class RangeVol:
+    name = "range"
+
+    def __init__(self, **_):
+        self.value = 0.0
+        self.ready = False
+
+    def update(self, o, h, l, c):
+        self.value = h - l
+        self.ready = True
+
+
+class ParkinsonVol:
+    name = "parkinson"
+
+    def __init__(self, window=14, **_):
+        self.window = window
+        self.terms = [0.0] * window
+        self.idx = 0
+        self.n = 0
+        self.total = 0.0
+        self.value = 0.0
+        self.ready = False
+
+    def update(self, o, h, l, c):
+        if l <= 0 or h <= 0: return
+        term = math.log(h / l) ** 2
+        self.total += term - self.terms[self.idx]
+        self.terms[self.idx] = term
+        self.idx = (self.idx + 1) % self.window
+        if self.n < self.window: self.n += 1
+        sigma = math.sqrt(max(self.total, 0.0) / (self.n * LN2_4))
+        self.value = sigma * c
+        self.ready = True
+
+
+class EwmaVol:
+    name = "ewma"
+
+    def __init__(self, ewma_lambda=0.94, **_):
+        self.lam = ewma_lambda
+        self.prev_close = 0.0
+        self.var = None
+        self.value = 0.0
+        self.ready = False
+
+    def update(self, o, h, l, c):
+        prev = self.prev_close or o
+        self.prev_close = c
+        if prev <= 0 or c <= 0: return
+        r2 = math.log(c / prev) ** 2
+        self.var = r2 if self.var is None else self.lam * self.var + (1.0 - self.lam) * r2
+        self.value = math.sqrt(self.var) * c
+        self.ready = True
+
+
+class AtrVol:
+    name = "atr"
+
+    def __init__(self, window=14, **_):
+        self.window = window
+        self.prev_close = 0.0
+        self.atr = None
+        self.value = 0.0
+        self.ready = False
+
+    def update(self, o, h, l, c):
+        tr = h - l
+        if self.prev_close:
+            tr = max(tr, abs(h - self.prev_close), abs(l - self.prev_close))
+        self.prev_close = c
+        self.atr = tr if self.atr is None else self.atr + (tr - self.atr) / self.window
+        self.value = self.atr
+        self.ready = True
+
+
+ESTIMATORS = {cls.name: cls for cls in (RangeVol, ParkinsonVol, EwmaVol, AtrVol)}
+
+
+def make_estimator(name, **params):
+    cls = ESTIMATORS.get(name)
+    if cls is None: raise ValueError(f"Unknown volatility model: {name} (choose from {', '.join(ESTIMATORS)})")
+    return cls(**params)